@@ -53,6 +53,7 @@ from urllib.parse import urlparse
 load_dotenv()
 
 import google.generativeai as genai
+from app.services.gemini_service import generate_with_model
 from neo4j import GraphDatabase
 
 # 환경 변수 로드
@@ -143,7 +144,7 @@ class KnowledgeAgent:
         """
 
         try:
-            response = self.model.generate_content(prompt)
+            response = await generate_with_model(self.model, prompt)
             cleaned_text = response.text.replace("```json", "").replace("```", "").strip()
             topic_data = json.loads(cleaned_text)
             
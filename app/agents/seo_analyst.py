@@ -4,6 +4,7 @@ import asyncio
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 import google.generativeai as genai
+from app.services.gemini_service import generate_with_model
 
 # .env 로드
 load_dotenv()
@@ -71,7 +72,7 @@ class SEOAgent:
         """
 
         try:
-            response = self.model.generate_content(prompt)
+            response = await generate_with_model(self.model, prompt)
             cleaned_text = response.text.replace("```json", "").replace("```", "").strip()
             result = json.loads(cleaned_text)
             
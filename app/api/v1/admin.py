@@ -1,16 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.database import get_async_db
+from app.core.deps import get_current_user_async
 from app.models.sql_models import User, CreditLog, SystemPolicy, Post, Blog, PaymentRequest, RechargePlan, SystemConfig
 
 router = APIRouter()
 
+
+async def _first(db: AsyncSession, stmt):
+    return (await db.execute(stmt.limit(1))).scalars().first()
+
+
+async def _count(db: AsyncSession, model, *criteria) -> int:
+    return (await db.execute(select(func.count()).select_from(model).where(*criteria))).scalar_one()
+
 class ConfigUpdateRequest(BaseModel):
     bank_name: Optional[str] = None
     account_number: Optional[str] = None
@@ -57,8 +65,8 @@ class PolicyUpdateRequest(BaseModel):
 @router.post("/credits/manual-grant")
 async def manual_credit_grant(
     payload: ManualCreditGrantRequest,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     관리자 수동 크레딧 지급
@@ -69,7 +77,7 @@ async def manual_credit_grant(
     # if admin_user.email not in ["admin@example.com"]:
     #     raise HTTPException(403, "관리자 권한이 없습니다")
     
-    user = db.query(User).filter(User.email == payload.user_email).first()
+    user = await _first(db, select(User).where(User.email == payload.user_email))
     if not user:
         raise HTTPException(404, "사용자를 찾을 수 없습니다")
     
@@ -81,7 +89,7 @@ async def manual_credit_grant(
         details={"reason": payload.reason, "admin": admin_user.email}
     )
     db.add(log)
-    db.commit()
+    await db.commit()
     
     return {
         "status": "ok",
@@ -94,13 +102,13 @@ async def manual_credit_grant(
 @router.post("/credits/confirm-payment")
 async def confirm_payment(
     payload: PaymentConfirmRequest,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     관리자 입금 확인 및 크레딧 지급 승인
     """
-    req = db.query(PaymentRequest).filter(PaymentRequest.id == payload.request_id).first()
+    req = await _first(db, select(PaymentRequest).where(PaymentRequest.id == payload.request_id))
     if not req:
         raise HTTPException(404, "요청을 찾을 수 없습니다")
     
@@ -108,7 +116,7 @@ async def confirm_payment(
         raise HTTPException(400, "이미 처리된 요청입니다")
 
     if payload.approve:
-        user = db.query(User).filter(User.id == req.user_id).first()
+        user = await _first(db, select(User).where(User.id == req.user_id))
         if user:
             user.current_credit += req.requested_credits
             req.status = "COMPLETED"
@@ -124,31 +132,34 @@ async def confirm_payment(
     else:
         req.status = "CANCELLED"
 
-    db.commit()
+    await db.commit()
     return {"status": "ok", "request_status": req.status}
 
 
 @router.get("/credits/pending-payments")
 async def get_pending_payments(
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     대기 중인 입금 확인 요청 목록
     """
-    pending = db.query(PaymentRequest).filter(PaymentRequest.status == "PENDING").order_by(PaymentRequest.created_at.asc()).all()
+    result = await db.execute(
+        select(PaymentRequest).where(PaymentRequest.status == "PENDING").order_by(PaymentRequest.created_at.asc())
+    )
+    pending = result.scalars().all()
     return pending
 
 
 @router.get("/policy")
 async def get_policy(
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     시스템 정책 조회
     """
-    policy = db.query(SystemPolicy).first()
+    policy = await _first(db, select(SystemPolicy))
     if not policy:
         # 기본 정책 생성
         policy = SystemPolicy(
@@ -160,8 +171,8 @@ async def get_policy(
             cost_image=5
         )
         db.add(policy)
-        db.commit()
-        db.refresh(policy)
+        await db.commit()
+        await db.refresh(policy)
     
     return {
         "signup_bonus": policy.signup_bonus,
@@ -177,13 +188,13 @@ async def get_policy(
 @router.put("/policy")
 async def update_policy(
     payload: PolicyUpdateRequest,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     시스템 정책 업데이트
     """
-    policy = db.query(SystemPolicy).first()
+    policy = await _first(db, select(SystemPolicy))
     if not policy:
         policy = SystemPolicy()
         db.add(policy)
@@ -202,8 +213,8 @@ async def update_policy(
     if payload.cost_image is not None:
         policy.cost_image = payload.cost_image
     
-    db.commit()
-    db.refresh(policy)
+    await db.commit()
+    await db.refresh(policy)
     
     return {
         "status": "ok",
@@ -221,31 +232,31 @@ async def update_policy(
 
 @router.get("/config")
 async def get_system_config(
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     시스템 설정 조회 (입금 계좌 등)
     """
-    config = db.query(SystemConfig).first()
+    config = await _first(db, select(SystemConfig))
     if not config:
         config = SystemConfig()
         db.add(config)
-        db.commit()
-        db.refresh(config)
+        await db.commit()
+        await db.refresh(config)
     return config
 
 
 @router.put("/config")
 async def update_system_config(
     payload: ConfigUpdateRequest,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     시스템 설정 업데이트
     """
-    config = db.query(SystemConfig).first()
+    config = await _first(db, select(SystemConfig))
     if not config:
         config = SystemConfig()
         db.add(config)
@@ -254,35 +265,35 @@ async def update_system_config(
     for k, v in update_data.items():
         setattr(config, k, v)
     
-    db.commit()
-    db.refresh(config)
+    await db.commit()
+    await db.refresh(config)
     return config
 
 
 @router.get("/plans")
 async def get_all_plans(
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     모든 요금제 플랜 조회 (관리자용)
     """
-    return db.query(RechargePlan).order_by(RechargePlan.amount.asc()).all()
+    return (await db.execute(select(RechargePlan).order_by(RechargePlan.amount.asc()))).scalars().all()
 
 
 @router.post("/plans")
 async def create_plan(
     payload: RechargePlanCreate,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     신규 요금제 플랜 생성
     """
     plan = RechargePlan(**payload.model_dump())
     db.add(plan)
-    db.commit()
-    db.refresh(plan)
+    await db.commit()
+    await db.refresh(plan)
     return plan
 
 
@@ -290,13 +301,13 @@ async def create_plan(
 async def update_plan(
     plan_id: int,
     payload: RechargePlanUpdate,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     기존 요금제 플랜 수정
     """
-    plan = db.query(RechargePlan).filter(RechargePlan.id == plan_id).first()
+    plan = await _first(db, select(RechargePlan).where(RechargePlan.id == plan_id))
     if not plan:
         raise HTTPException(404, "플랜을 찾을 수 없습니다")
     
@@ -304,54 +315,56 @@ async def update_plan(
     for k, v in update_data.items():
         setattr(plan, k, v)
     
-    db.commit()
-    db.refresh(plan)
+    await db.commit()
+    await db.refresh(plan)
     return plan
 
 
 @router.delete("/plans/{plan_id}")
 async def delete_plan(
     plan_id: int,
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     요금제 플랜 삭제
     """
-    plan = db.query(RechargePlan).filter(RechargePlan.id == plan_id).first()
+    plan = await _first(db, select(RechargePlan).where(RechargePlan.id == plan_id))
     if not plan:
         raise HTTPException(404, "플랜을 찾을 수 없습니다")
     
-    db.delete(plan)
-    db.commit()
+    await db.delete(plan)
+    await db.commit()
     return {"status": "ok"}
 
 
 @router.get("/stats")
 async def get_admin_stats(
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    admin_user: User = Depends(get_current_user_async)
 ):
     """
     관리자 대시보드 통계
     """
     # 전체 사용자 수
-    total_users = db.query(User).count()
+    total_users = await _count(db, User)
     
     # 전체 블로그 수
-    total_blogs = db.query(Blog).count()
+    total_blogs = await _count(db, Blog)
     
     # 전체 포스트 수
-    total_posts = db.query(Post).count()
+    total_posts = await _count(db, Post)
     
     # 발행된 포스트 수
-    published_posts = db.query(Post).filter(Post.status == "PUBLISHED").count()
+    published_posts = await _count(db, Post, Post.status == "PUBLISHED")
     
     # 전체 크레딧 사용량 (수량 합계)
-    total_credits_used = db.query(func.abs(func.sum(CreditLog.amount))).filter(CreditLog.amount < 0).scalar() or 0
+    total_credits_used = (
+        await db.execute(select(func.abs(func.sum(CreditLog.amount))).where(CreditLog.amount < 0))
+    ).scalar() or 0
     
     # 입금 대기 목록 (PaymentRequest 테이블 기준)
-    pending_deposits = db.query(PaymentRequest).filter(PaymentRequest.status == "PENDING").count()
+    pending_deposits = await _count(db, PaymentRequest, PaymentRequest.status == "PENDING")
     
     return {
         "total_users": total_users,
@@ -361,3 +374,43 @@ async def get_admin_stats(
         "total_credits_used": int(total_credits_used),
         "pending_deposits": pending_deposits
     }
+
+
+@router.get("/gemini/metrics")
+async def get_gemini_metrics(
+    admin_user: User = Depends(get_current_user_async)
+):
+    """
+    Gemini 호출/재시도/리미터 상태 (프로세스 단위)
+    """
+    from app.services.gemini_service import gemini_metrics
+    return gemini_metrics.snapshot()
+
+
+@router.get("/pipeline/metrics")
+async def get_pipeline_metrics(
+    admin_user: User = Depends(get_current_user_async)
+):
+    """
+    자동 포스팅 파이프라인 단계별 대기/처리 현황 (프로세스 단위)
+    """
+    from app.services.post_pipeline import post_pipeline
+    return post_pipeline.snapshot()
+
+
+@router.get("/tracking/metrics")
+async def get_tracking_metrics(
+    admin_user: User = Depends(get_current_user_async)
+):
+    """
+    순위 트래킹 최근 실행 결과 + SERP 캐시 적중 현황 (프로세스 단위)
+    """
+    from dataclasses import asdict
+    from app.services.serp_cache import serp_cache
+    from app.services.tracking_engine import tracking_engine
+    report = tracking_engine.last_report
+    return {
+        "running": tracking_engine.running,
+        "last_report": asdict(report) if report is not None else None,
+        "serp_cache": serp_cache.snapshot(),
+    }
@@ -5,6 +5,7 @@ from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.models import sql_models as models
 from app.schemas import BlogConfigUpdate, ScheduleConfigUpdate, SystemPolicyUpdate
+from app.services.schedule_runner import schedule_runner
 
 router = APIRouter()
 
@@ -63,6 +64,7 @@ def update_schedule(
     schedule.target_times = config.target_times
 
     db.commit()
+    schedule_runner.notify_changed(schedule.id)
     return {"msg": "Schedule updated"}
 
 
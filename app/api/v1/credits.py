@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.database import get_async_db
+from app.core.deps import get_current_user_async
 from app.models.sql_models import User, PaymentRequest, CreditLog, RechargePlan, SystemConfig
 
 router = APIRouter()
@@ -29,8 +30,8 @@ class PaymentRequestResponse(BaseModel):
 @router.post("/recharge/request", response_model=PaymentRequestResponse)
 async def create_recharge_request(
     payload: PaymentRequestCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     사용자가 송금 후 입금 확인 요청을 보냄
@@ -53,34 +54,39 @@ async def create_recharge_request(
     )
     db.add(log)
     
-    db.commit()
-    db.refresh(new_request)
+    await db.commit()
+    await db.refresh(new_request)
     return new_request
 
 @router.get("/recharge/history", response_model=List[PaymentRequestResponse])
 async def get_recharge_history(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     내 충전 요청 내역 조회
     """
-    return db.query(PaymentRequest).filter(PaymentRequest.user_id == current_user.id).order_by(PaymentRequest.created_at.desc()).all()
+    result = await db.execute(
+        select(PaymentRequest).where(PaymentRequest.user_id == current_user.id).order_by(PaymentRequest.created_at.desc())
+    )
+    return result.scalars().all()
 
 @router.get("/logs")
 async def get_credit_logs(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     내 모든 크레딧 사용/충전 로그 조회
     """
-    logs = db.query(CreditLog).filter(CreditLog.user_id == current_user.id).order_by(CreditLog.created_at.desc()).limit(50).all()
-    return logs
+    result = await db.execute(
+        select(CreditLog).where(CreditLog.user_id == current_user.id).order_by(CreditLog.created_at.desc()).limit(50)
+    )
+    return result.scalars().all()
 
 @router.get("/status")
 async def get_credit_status(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     현재 크레딧 잔액 조회 (SQL 기반)
@@ -93,22 +99,25 @@ async def get_credit_status(
 
 @router.get("/plans")
 async def get_active_plans(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용자에게 보여줄 활성화된 요금제 플랜 목록 조회
     """
-    return db.query(RechargePlan).filter(RechargePlan.is_active == True).order_by(RechargePlan.amount.asc()).all()
+    result = await db.execute(
+        select(RechargePlan).where(RechargePlan.is_active == True).order_by(RechargePlan.amount.asc())
+    )
+    return result.scalars().all()
 
 
 @router.get("/config")
 async def get_public_config(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     공개 시스템 설정 조회 (입금 계좌 정보 등)
     """
-    config = db.query(SystemConfig).first()
+    config = (await db.execute(select(SystemConfig).limit(1))).scalars().first()
     if not config:
         config = SystemConfig()
     return {
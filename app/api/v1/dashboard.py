@@ -1,11 +1,13 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.database import get_async_db
+from app.core.deps import get_current_user_async
 from app.models.sql_models import User, ScheduleConfig, Frequency
+from app.services.schedule_runner import schedule_runner
 
 router = APIRouter()
 
@@ -20,13 +22,15 @@ class SchedulePayload(BaseModel):
 
 @router.get("/schedule")
 async def get_schedule(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     SQL DB에서 사용자의 스케줄 설정을 조회합니다.
     """
-    config = db.query(ScheduleConfig).filter(ScheduleConfig.user_id == current_user.id).first()
+    config = (
+        await db.execute(select(ScheduleConfig).where(ScheduleConfig.user_id == current_user.id))
+    ).scalars().first()
     if not config:
         return None
 
@@ -42,13 +46,15 @@ async def get_schedule(
 @router.post("/schedule")
 async def save_schedule(
     payload: SchedulePayload,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     사용자의 스케줄 설정을 SQL DB에 저장하거나 업데이트합니다.
     """
-    config = db.query(ScheduleConfig).filter(ScheduleConfig.user_id == current_user.id).first()
+    config = (
+        await db.execute(select(ScheduleConfig).where(ScheduleConfig.user_id == current_user.id))
+    ).scalars().first()
     
     # Enum 변환
     freq_map = {
@@ -73,11 +79,12 @@ async def save_schedule(
         config.active_days = payload.days
         config.posts_per_day = payload.posts_per_day
         config.target_times = payload.target_times
-        config.last_run_at = None # 설정 변경 시 초기화(선택)
+        # last_run_at은 유지: 초기화하면 grace 안의 이미 실행한 슬롯이 다시 실행될 수 있음
 
     try:
-        db.commit()
+        await db.commit()
+        schedule_runner.notify_changed(config.id)
         return {"message": "스케줄이 성공적으로 저장되었습니다."}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"스케줄 저장 실패: {str(e)}")
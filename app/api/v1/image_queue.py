@@ -42,16 +42,18 @@ async def get_image_queue_status(
 @router.post("/queue/process")
 async def trigger_queue_processing(
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     이미지 생성 Queue 처리 트리거 (백그라운드)
     
+    AS-IS: 요청 세션(db)을 백그라운드 태스크에 넘김 → 응답 후 닫힌 세션을 여러 코루틴이 공유
+    TO-BE: 처리기가 작업마다 자체 세션을 사용하며, 동시성은 IMAGE_QUEUE_CONCURRENCY를 따름
+    
     Returns:
         dict: 처리 시작 메시지
     """
-    background_tasks.add_task(process_all_pending_queues, db, max_concurrent=3)
+    background_tasks.add_task(process_all_pending_queues)
     
     return {
         "status": "ok",
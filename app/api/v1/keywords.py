@@ -8,12 +8,13 @@ TO-BE 요구사항:
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from pydantic import BaseModel
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.database import get_async_db
+from app.core.deps import get_current_user_async
 from app.models.sql_models import User, KeywordQueue
 from app.services.keyword_service import (
     fetch_related_keywords,
@@ -38,7 +39,7 @@ class KeywordBulkRegisterRequest(BaseModel):
 @router.get("/search", response_model=List[KeywordSearchResponse])
 async def search_keywords(
     seed: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     키워드 리서치 API
@@ -59,8 +60,8 @@ async def search_keywords(
 @router.post("/bulk-register")
 async def bulk_register(
     payload: KeywordBulkRegisterRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     키워드 벌크 등록
@@ -74,7 +75,8 @@ async def bulk_register(
     if not payload.keywords or len(payload.keywords) == 0:
         raise HTTPException(status_code=400, detail="등록할 키워드가 없습니다")
     
-    count = bulk_register_keywords(db, current_user.id, payload.keywords)
+    user_id = current_user.id
+    count = await db.run_sync(lambda session: bulk_register_keywords(session, user_id, payload.keywords))
     return {
         "status": "ok",
         "registered_count": count,
@@ -84,8 +86,8 @@ async def bulk_register(
 
 @router.get("/queue")
 async def get_keyword_queue(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     내 키워드 큐 조회
@@ -93,9 +95,12 @@ async def get_keyword_queue(
     Returns:
         List[Dict]: 키워드 큐 목록
     """
-    queue = db.query(KeywordQueue).filter(
-        KeywordQueue.user_id == current_user.id
-    ).order_by(KeywordQueue.priority.desc()).all()
+    result = await db.execute(
+        select(KeywordQueue).where(
+            KeywordQueue.user_id == current_user.id
+        ).order_by(KeywordQueue.priority.desc())
+    )
+    queue = result.scalars().all()
     
     return [
         {
@@ -111,8 +116,8 @@ async def get_keyword_queue(
 
 @router.get("/next")
 async def get_next_keyword_api(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     다음 사용할 키워드 가져오기
@@ -120,7 +125,8 @@ async def get_next_keyword_api(
     Returns:
         Dict: 다음 키워드
     """
-    keyword = get_next_keyword(db, current_user.id)
+    user_id = current_user.id
+    keyword = await db.run_sync(lambda session: get_next_keyword(session, user_id))
     
     if not keyword:
         raise HTTPException(status_code=404, detail="사용 가능한 키워드가 없습니다")
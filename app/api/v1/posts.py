@@ -1,21 +1,28 @@
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from typing import List, Tuple
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
+from app.core.security import STREAM_TOKEN_EXPIRE_SECONDS, create_stream_token
 from app.models import sql_models as models
 from app.models.sql_models import Post, Blog, User
-from app.schemas import PostStatusResponse
-from app.core.deps import get_current_user
+from app.schemas import PostListItem, PostPageItem, PostStatusPage, PostStatusResponse
+from app.core.deps import get_current_user, get_current_user_for_stream, get_current_user_sse
 from pydantic import BaseModel
 
 from app.services.credit_service import calculate_required_credits
-from app.services.gemini_service import generate_html
-from app.services.image_service import WORKFLOW_PATH, generate_image_sync, save_image_bytes
-from app.services.tracking_service import tracking_service
+from app.services.gemini_service import generate_html, generate_html_stream
+from app.services.image_queue_service import _TERMINAL_IMG_STATUSES, enqueue_image_generation, get_queue_status
+from app.services.post_events import post_event_bus
+from app.services.keyword_rank_service import list_keyword_ranks, list_rank_changes, rank_history
+from app.services.tracking_engine import claim_posts, tracking_engine
 from app.services.publisher_api import publish_post
 from app.agents.reviewer import sanitize_final_html, validate_and_fix_image_prompts
+import asyncio
+import base64
+import binascii
+import json
 import logging
 import os
 from pathlib import Path
@@ -23,29 +30,9 @@ from pathlib import Path
 LOGGER = logging.getLogger("posts")
 
 
-def _workflow_path_for_runtime() -> str:
-    """
-    AS-IS: 상대경로 workflows/ai_marketing.json → 실행 위치에 따라 FileNotFound.
-    TO-BE: image_service에서 resolve된 WORKFLOW_PATH를 우선 사용하되,
-          사용자 요구사항(~/autoblog/backend/workflows/ai_marketing.json)도 존재하면 그쪽을 우선합니다.
-    """
-    try:
-        p = Path(WORKFLOW_PATH)
-        if p.exists():
-            return str(p)
-    except Exception:
-        pass
-
-    project_root = Path(__file__).resolve().parents[3]  # .../autoblog
-    backend_candidate = project_root / "backend" / "workflows" / "ai_marketing.json"
-    if backend_candidate.exists():
-        return str(backend_candidate)
-
-    return WORKFLOW_PATH
-
 router = APIRouter()
 
-from sqlalchemy import and_, or_
+from sqlalchemy import String, and_, or_, type_coerce, update
 from datetime import timedelta
 
 # ... existing imports ...
@@ -100,43 +87,16 @@ class PostPreviewPayload(BaseModel):
     keywords: list[str] | None = None # TO-BE: 키워드 리스트 추가
 
 
-async def process_image_generation(post_id: int, index: int, prompt: str, filename: str):
-    from app.core.database import SessionLocal
-    db = SessionLocal()
-    try:
-        wf = _workflow_path_for_runtime()
-        # SDXL 프롬프트에 텍스트 배제 지시어 추가
-        final_prompt = f"{prompt}, no text, no letters, high quality photography"
-        image_bytes = await generate_image_sync(wf, final_prompt)
-        url = save_image_bytes(filename, image_bytes)
-
-        # [SEO 로그] 저장된 파일명과 주제 연동 확인
-        LOGGER.info(f"SEO Image Saved: {filename} for post {post_id}")
-
-        post = db.query(Post).filter(Post.id == post_id).first()
-        if post:
-            paths = post.image_paths or []
-            if url not in paths:
-                paths.append(url)
-                post.image_paths = paths
-                # 모든 이미지가 생성되었는지 확인
-                if len(paths) >= post.expected_image_count:
-                    post.img_gen_status = "COMPLETED"
-                else:
-                    post.img_gen_status = "PROCESSING"
-                db.commit()
-    except Exception as exc:
-        LOGGER.exception("Image generation failed (post=%s idx=%s): %s", post_id, index, exc)
-        post = db.query(Post).filter(Post.id == post_id).first()
-        if post:
-            if "timeout" in str(exc).lower():
-                post.img_gen_status = "TIMEOUT"
-            else:
-                post.img_gen_status = "FAILED"
-            db.commit()
-    finally:
-        db.close()
-
+def build_image_prompts(topic: str, img_prompts: list[str], image_count: int) -> list[str]:
+    """이미지 인덱스별 프롬프트 (마지막 이미지는 썸네일)."""
+    prompts = []
+    for i in range(image_count):
+        if i == image_count - 1:
+            base_prompt = img_prompts[i] if i < len(img_prompts) else f"{topic} blog thumbnail design"
+            prompts.append(f"{base_prompt}, blog thumbnail, high resolution")
+        else:
+            prompts.append(img_prompts[i] if i < len(img_prompts) else f"{topic} photography")
+    return prompts
 
 
 from fastapi.responses import FileResponse, StreamingResponse
@@ -190,38 +150,148 @@ async def download_post_images(
     )
 
 
+POST_STATUS_PAGE_SIZE = int(os.getenv("POST_STATUS_PAGE_SIZE", "50"))
+POST_STATUS_PAGE_MAX = int(os.getenv("POST_STATUS_PAGE_MAX", "200"))
+
+# 목록 프로젝션 컬럼 (content 제외). SELECT 절에 본문 TEXT가 아예 포함되지 않음
+_POST_LIST_COLUMNS = (
+    Post.id,
+    Post.blog_id,
+    Post.title,
+    Post.status,
+    Post.published_url,
+    Post.view_count,
+    Post.keyword_ranks,
+    Post.image_paths,
+    Post.expected_image_count,
+    Post.img_gen_status,
+    Post.tracking_status,
+    Post.last_tracked_at,
+    Post.created_at,
+)
+
+
 @router.get("/status", response_model=List[BlogStatsResponse])
 def get_posting_status(
+    include_content: bool = True,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # 내 모든 블로그와 그 안의 포스트들을 한 번에 가져옴 (Eager Loading)
-    my_blogs = db.query(Blog).options(joinedload(Blog.posts))\
-        .filter(Blog.owner_id == current_user.id).all()
-    
-    result = []
-    for blog in my_blogs:
-        # Pydantic 모델로 변환
-        post_list = [PostStatusResponse.model_validate(p) for p in blog.posts]
-        # 최신순 정렬
-        post_list.sort(key=lambda x: x.created_at, reverse=True)
-        
-        result.append({
+    """
+    블로그별 전체 포스트 현황 (기존 응답 형태 유지).
+
+    AS-IS: joinedload(Blog.posts)로 모든 포스트의 모든 컬럼(HTML content 포함)을 읽고 파이썬에서 정렬.
+    TO-BE: 블로그 목록 1회 + 포스트 1회 쿼리, 정렬은 DB(created_at DESC)에서 처리.
+           include_content=false면 content 컬럼을 SELECT하지 않음 (본문은 GET /posts/{id}).
+           포스트가 많은 계정은 GET /posts/status/page(커서 페이지네이션)를 사용하세요.
+    """
+    my_blogs = db.query(Blog).filter(Blog.owner_id == current_user.id).order_by(Blog.id).all()
+    if not my_blogs:
+        return []
+
+    columns = _POST_LIST_COLUMNS + ((Post.content,) if include_content else ())
+    rows = (
+        db.query(*columns)
+        .filter(Post.blog_id.in_([blog.id for blog in my_blogs]))
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .all()
+    )
+    posts_by_blog: dict[int, list[PostStatusResponse]] = {blog.id: [] for blog in my_blogs}
+    for row in rows:
+        data = PostListItem.model_validate(row).model_dump()
+        posts_by_blog[row.blog_id].append(
+            PostStatusResponse(**data, content=row.content if include_content else None)
+        )
+
+    return [
+        {
             "blog_alias": blog.alias or blog.blog_url,
             "platform": blog.platform_type,
-            "posts": post_list
-        })
-        
-    return result
+            "posts": posts_by_blog[blog.id],
+        }
+        for blog in my_blogs
+    ]
 
 
-@router.post("/preview")
-async def generate_post_with_images(
-    payload: PostPreviewPayload,
-    background_tasks: BackgroundTasks,
+# created_at을 DB에 저장된 값 그대로 다룸: SQLite는 DATETIME을 텍스트로 저장하고 func.now()는 마이크로초 없이
+# 'YYYY-MM-DD HH:MM:SS'를 쓰는데, datetime 파라미터는 '.000000'을 붙여 바인딩되므로 같은 초의 포스트 비교가 어긋남
+_POST_CREATED_KEY = type_coerce(Post.created_at, String)
+
+
+def _encode_post_cursor(created_key, post_id: int) -> str:
+    created = created_key.isoformat(sep=" ") if isinstance(created_key, datetime) else str(created_key)
+    raw = json.dumps([created, post_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_post_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        created, post_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(created, str) or not isinstance(post_id, int):
+            raise ValueError(cursor)
+        return created, post_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
+
+@router.get("/status/page", response_model=PostStatusPage)
+def get_posting_status_page(
+    cursor: str | None = None,
+    limit: int = POST_STATUS_PAGE_SIZE,
+    blog_id: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user)
 ):
+    """
+    내 포스트 목록 (최신순, 커서 페이지네이션, content 제외).
+
+    - cursor: 이전 응답의 next_cursor (불투명 문자열, 해석하지 말고 그대로 전달). 없으면 첫 페이지
+    - 키셋 조건 (created_at, id) < (마지막 항목의 created_at, id)이므로 OFFSET처럼 앞 페이지를 다시 읽지 않고,
+      새 포스트가 추가돼도 페이지가 밀리지 않음
+
+    AS-IS: cursor가 post id뿐이라 created_at을 서브쿼리로 다시 찾음 → 그 포스트가 삭제되면(cleanup 등)
+           서브쿼리가 NULL이 되어 목록이 조용히 끝남.
+    TO-BE: (created_at, id)를 base64 커서에 담아 그 값과 직접 비교합니다.
+    """
+    limit = max(1, min(limit, POST_STATUS_PAGE_MAX))
+    query = (
+        db.query(*_POST_LIST_COLUMNS, _POST_CREATED_KEY.label("created_key"), Blog.alias, Blog.blog_url, Blog.platform_type)
+        .join(Blog, Post.blog_id == Blog.id)
+        .filter(Blog.owner_id == current_user.id)
+    )
+    if blog_id is not None:
+        query = query.filter(Post.blog_id == blog_id)
+    if cursor:
+        cursor_created, cursor_id = _decode_post_cursor(cursor)
+        query = query.filter(
+            or_(
+                _POST_CREATED_KEY < cursor_created,
+                and_(_POST_CREATED_KEY == cursor_created, Post.id < cursor_id),
+            )
+        )
+
+    # limit + 1개를 읽어 다음 페이지 존재 여부 판단
+    rows = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [
+        PostPageItem(
+            **PostListItem.model_validate(row).model_dump(),
+            blog_id=row.blog_id,
+            blog_alias=row.alias or row.blog_url,
+            platform=row.platform_type,
+        )
+        for row in rows
+    ]
+    next_cursor = _encode_post_cursor(rows[-1].created_key, rows[-1].id) if has_more else None
+    return PostStatusPage(items=items, next_cursor=next_cursor)
+
+
+def _create_preview_post(payload: PostPreviewPayload, db: Session, current_user: User) -> tuple[Post, int]:
+    """
+    미리보기용 DRAFT 포스트 생성 + 잔액 사전 확인 (/preview, /preview/stream 공통).
+    실제 차감은 본문 생성 성공 후 _charge_preview_credits에서 조건부 UPDATE로 수행합니다.
+    """
     if payload.image_count < 1:
         raise HTTPException(status_code=400, detail="이미지 개수는 최소 1개 이상이어야 합니다.")
 
@@ -245,32 +315,58 @@ async def generate_post_with_images(
     if not payload.free_trial:
         if current_user.current_credit < credits_needed:
             raise HTTPException(status_code=402, detail="크레딧이 부족합니다.")
-        current_user.current_credit -= credits_needed
-        credit_entry = models.CreditLog(
-            user_id=current_user.id,
-            amount=-credits_needed,
-            action_type="PREVIEW_GEN",
-            details={"topic": payload.topic, "images": payload.image_count},
-        )
-        db.add(credit_entry)
+    return new_post, credits_needed
 
-    final_prompt = payload.custom_prompt or f"Generate SEO-friendly HTML for {payload.topic} with persona {payload.persona}."
-    html_result = await generate_html(
-        payload.topic, 
-        payload.persona, 
-        final_prompt, 
-        payload.word_count_range, 
-        payload.image_count,
-        keywords=payload.keywords
+
+def _charge_preview_credits(db: Session, user_id: int, payload: PostPreviewPayload, credits_needed: int) -> bool:
+    """
+    본문 생성 성공 시점에 크레딧 차감 (본문 저장과 같은 커밋으로 반영).
+    AS-IS: 사전 확인 후 ORM 객체에서 current_credit -= n → 동시 요청이 같은 잔액을 읽고 둘 다 차감(음수 잔액/중복 사용).
+    TO-BE: 잔액 조건을 건 UPDATE 한 문장으로 차감. 반영된 행이 없으면(잔액 부족) False.
+    """
+    if payload.free_trial:
+        return True
+    result = db.execute(
+        update(User)
+        .where(User.id == user_id, User.current_credit >= credits_needed)
+        .values(current_credit=User.current_credit - credits_needed)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        return False
+    credit_entry = models.CreditLog(
+        user_id=user_id,
+        amount=-credits_needed,
+        action_type="PREVIEW_GEN",
+        details={"topic": payload.topic, "images": payload.image_count},
     )
+    db.add(credit_entry)
+    return True
+
+
+def _fail_preview_post(db: Session, post: Post) -> None:
+    # 차감 실패 시 본문/이미지를 저장하지 않고 초안만 실패로 남김
+    post.img_gen_status = "FAILED"
+    db.commit()
+
+
+def _preview_prompt(payload: PostPreviewPayload) -> str:
+    return payload.custom_prompt or f"Generate SEO-friendly HTML for {payload.topic} with persona {payload.persona}."
+
+
+def _save_preview_html(db: Session, post: Post, html_result: dict) -> None:
     # Reviewer 최종 정제 (금칙 문구/스크립트 제거 등)
     cleaned_html, _issues = sanitize_final_html(html_result["html"])
     html_result["html"] = cleaned_html
-    new_post.content = cleaned_html
+    post.content = cleaned_html
     if html_result.get("title"):
-        new_post.title = str(html_result["title"])
+        post.title = str(html_result["title"])
     db.commit()
 
+
+def _enqueue_preview_images(db: Session, post: Post, payload: PostPreviewPayload, html_result: dict) -> list[str]:
+    """이미지 프롬프트/SEO 파일명을 정하고 이미지 큐에 등록합니다. 반환값: 이미지 URL 목록 (인덱스 순)."""
     # TO-BE: 이미지 생성은 백그라운드로 돌리고, HTML은 즉시 반환해 Nginx 504를 방지합니다.
     # 이미지 프롬프트 우선순위:
     # 1) 요청 payload.img_prompts (직접 지정)
@@ -299,25 +395,38 @@ async def generate_post_with_images(
         filenames.append(fname)
         image_urls.append(f"/generated_images/{fname}")
 
-    new_post.image_paths = [] 
-    new_post.expected_image_count = payload.image_count # 예상 이미지 수 저장
+    post.image_paths = [] 
+    post.expected_image_count = payload.image_count # 예상 이미지 수 저장
     db.commit()
 
-    for i in range(payload.image_count):
-        # 썸네일(마지막) 이미지인 경우 별도 처리
-        if i == payload.image_count - 1:
-            base_prompt = img_prompts[i] if i < len(img_prompts) else f"{payload.topic} blog thumbnail design"
-            prompt = f"{base_prompt}, blog thumbnail, high resolution"
-        else:
-            prompt = img_prompts[i] if i < len(img_prompts) else f"{payload.topic} photography"
-            
-        background_tasks.add_task(
-            process_image_generation, 
-            post_id=new_post.id, 
-            index=i + 1, 
-            prompt=prompt, 
-            filename=filenames[i]
-        )
+    prompts = build_image_prompts(payload.topic, img_prompts, payload.image_count)
+    # TO-BE: BackgroundTasks 대신 내구성 큐(ImageQueue)에 등록 → 서버 재시작에도 작업 유실 없음
+    enqueue_image_generation(db, post.id, prompts, filenames)
+    return image_urls
+
+
+@router.post("/preview")
+async def generate_post_with_images(
+    payload: PostPreviewPayload,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    new_post, credits_needed = _create_preview_post(payload, db, current_user)
+
+    html_result = await generate_html(
+        payload.topic, 
+        payload.persona, 
+        _preview_prompt(payload), 
+        payload.word_count_range, 
+        payload.image_count,
+        keywords=payload.keywords
+    )
+    if not _charge_preview_credits(db, current_user.id, payload, credits_needed):
+        _fail_preview_post(db, new_post)
+        raise HTTPException(status_code=402, detail="크레딧이 부족합니다.")
+    _save_preview_html(db, new_post, html_result)
+    image_urls = _enqueue_preview_images(db, new_post, payload, html_result)
 
     return {
         "status": "processing",
@@ -331,6 +440,251 @@ async def generate_post_with_images(
     }
 
 
+# 이벤트 버스로 전달되지 않는 변경(별도 워커 프로세스)을 보완하기 위한 Queue 상태 확인 주기
+IMAGE_EVENTS_RECONCILE_SECONDS = float(os.getenv("IMAGE_EVENTS_RECONCILE_SECONDS", "5"))
+PREVIEW_STREAM_IMAGE_TIMEOUT_SECONDS = float(os.getenv("PREVIEW_STREAM_IMAGE_TIMEOUT_SECONDS", "900"))
+SSE_KEEPALIVE_SECONDS = 15.0
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _image_event_from_queue(image: dict) -> dict:
+    status = image["status"]
+    if status == "PENDING" and (image.get("attempts") or 0) > 0:
+        status = "RETRYING"
+    failed = status in ("FAILED", "RETRYING")
+    return {
+        "index": image["index"],
+        "status": status,
+        "url": image["url"],
+        "error": image["error"] if failed else None,
+        "timeout": failed and "timeout" in (image["error"] or "").lower(),
+    }
+
+
+def _load_queue_status(post_id: int) -> dict:
+    # 보완 조회마다 짧은 세션을 열고 바로 닫음 (스트림 동안 DB 커넥션을 잡지 않음, asyncio.to_thread에서 실행)
+    db = SessionLocal()
+    try:
+        return get_queue_status(db, post_id)
+    finally:
+        db.close()
+
+
+def _load_post_images(post_id: int) -> tuple[str | None, list]:
+    db = SessionLocal()
+    try:
+        post = db.query(Post.img_gen_status, Post.image_paths).filter(Post.id == post_id).first()
+        return (post.img_gen_status, list(post.image_paths or [])) if post else (None, [])
+    finally:
+        db.close()
+
+
+async def _image_progress_sse(post_id: int, timeout_s: float = PREVIEW_STREAM_IMAGE_TIMEOUT_SECONDS):
+    """
+    포스트의 이미지별 상태 변경을 SSE 문자열로 yield합니다 (모든 이미지가 끝나거나 timeout_s가 지나면 종료).
+    이벤트 버스 구독으로 즉시 전달하고, IMAGE_EVENTS_RECONCILE_SECONDS마다 해당 포스트의 Queue만 조회해
+    다른 프로세스에서 처리된 변경을 보완합니다 (전체 /status 조회 없음, 조회는 스레드에서 짧은 세션으로).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s
+    last_sent = loop.time()
+    seen: dict[int | None, tuple] = {}
+
+    def changed(event: dict) -> bool:
+        state = (event["status"], event["url"])
+        if seen.get(event["index"]) == state:
+            return False
+        seen[event["index"]] = state
+        return True
+
+    with post_event_bus.subscribe(post_id=post_id) as subscription:
+        next_reconcile = loop.time()
+        while loop.time() < deadline:
+            if loop.time() >= next_reconcile:
+                queue_status = await asyncio.to_thread(_load_queue_status, post_id)
+                for image in queue_status["images"]:
+                    event = _image_event_from_queue(image)
+                    if changed(event):
+                        last_sent = loop.time()
+                        yield _sse("image", event)
+                if queue_status["pending"] + queue_status["processing"] == 0:
+                    return
+                next_reconcile = loop.time() + IMAGE_EVENTS_RECONCILE_SECONDS
+
+            wait = min(next_reconcile, deadline, last_sent + SSE_KEEPALIVE_SECONDS) - loop.time()
+            message = await subscription.get(timeout=max(wait, 0.0))
+            if message is None:
+                if loop.time() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                    last_sent = loop.time()
+                    yield ": keep-alive\n\n"
+                continue
+            if message["event"] == "image":
+                event = {k: message.get(k) for k in ("index", "status", "url", "error", "timeout")}
+                if changed(event):
+                    last_sent = loop.time()
+                    yield _sse("image", event)
+            elif message["event"] == "post_status" and message.get("img_gen_status") in _TERMINAL_IMG_STATUSES:
+                return
+
+
+async def _done_event(post_id: int) -> str:
+    img_gen_status, images = await asyncio.to_thread(_load_post_images, post_id)
+    return _sse("done", {"post_id": post_id, "img_gen_status": img_gen_status, "images": images})
+
+
+def _finish_preview(
+    post_id: int, user_id: int, payload: PostPreviewPayload, credits_needed: int, html_result: dict
+) -> list[str] | None:
+    """본문 생성 이후 단계 (차감 → 저장 → 이미지 큐 등록). 차감 실패 시 None. 짧은 세션으로 스레드에서 실행."""
+    db = SessionLocal()
+    try:
+        post = db.query(Post).filter(Post.id == post_id).first()
+        if not _charge_preview_credits(db, user_id, payload, credits_needed):
+            _fail_preview_post(db, post)
+            return None
+        _save_preview_html(db, post, html_result)
+        return _enqueue_preview_images(db, post, payload, html_result)
+    finally:
+        db.close()
+
+
+@router.post("/preview/stream")
+async def stream_post_with_images(
+    payload: PostPreviewPayload,
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user_for_stream),
+):
+    """
+    /preview의 스트리밍(SSE) 버전.
+
+    AS-IS: generate_html 전체 응답을 기다린 뒤 한 번에 반환 → Gemini 지연 동안 스피너 + Nginx 타임아웃 위험.
+    TO-BE: text/event-stream으로 단계별 이벤트를 보냅니다.
+    - post: {post_id, image_total, credits_required} (즉시)
+    - html_delta: {text} 본문 HTML 조각 (Gemini 스트리밍)
+    - meta: /preview 응답과 같은 필드 (정제된 html, title, summary, images...)
+    - image: {index, status, url, error} 이미지별 상태 변경 시
+    - done: {img_gen_status, images} / error: {detail}
+    """
+    new_post, credits_needed = _create_preview_post(payload, db, current_user)
+    post_id = new_post.id
+    user_id = current_user.id
+
+    async def event_stream():
+        yield _sse("post", {"post_id": post_id, "image_total": payload.image_count, "credits_required": credits_needed})
+
+        # 요청 세션(scope="function")은 응답 반환 전에 닫히므로, 본문에서는 DB 작업마다 짧은 세션을 스레드에서 사용
+        html_result = None
+        try:
+            async for kind, data in generate_html_stream(
+                payload.topic,
+                payload.persona,
+                _preview_prompt(payload),
+                payload.word_count_range,
+                payload.image_count,
+                keywords=payload.keywords,
+            ):
+                if kind == "delta":
+                    yield _sse("html_delta", {"text": data})
+                else:
+                    html_result = data
+        except Exception as exc:
+            LOGGER.exception("Preview stream generation failed (post=%s): %s", post_id, exc)
+            yield _sse("error", {"detail": "본문 생성 중 오류가 발생했습니다."})
+            return
+
+        image_urls = await asyncio.to_thread(_finish_preview, post_id, user_id, payload, credits_needed, html_result)
+        if image_urls is None:
+            yield _sse("error", {"detail": "크레딧이 부족합니다."})
+            return
+        yield _sse("meta", {
+            "status": "processing",
+            "post_id": post_id,
+            "title": html_result.get("title"),
+            "html": html_result["html"],
+            "summary": html_result.get("summary", ""),
+            "image_prompts": html_result.get("image_prompts", []),
+            "images": image_urls,
+        })
+
+        # 이미지 진행 상황: 이미지별 상태가 바뀔 때만 전송
+        async for chunk in _image_progress_sse(post_id):
+            yield chunk
+        yield await _done_event(post_id)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.post("/stream-token")
+def issue_stream_token(
+    post_id: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    SSE 연결용 단기 토큰 발급 (EventSource는 헤더를 보낼 수 없어 `?token=`으로 전달).
+    post_id를 주면 /posts/{post_id}/events 전용, 없으면 /posts/events 전용. 만료: STREAM_TOKEN_EXPIRE_SECONDS.
+    """
+    if post_id is not None:
+        post = db.query(Post.id).join(Blog).filter(Post.id == post_id, Blog.owner_id == current_user.id).first()
+        if not post:
+            raise HTTPException(status_code=404, detail="포스트를 찾을 수 없습니다.")
+    return {
+        "token": create_stream_token(current_user.email, post_id),
+        "expires_in": STREAM_TOKEN_EXPIRE_SECONDS,
+    }
+
+
+@router.get("/events")
+async def stream_user_post_events(current_user: User = Depends(get_current_user_sse)):
+    """
+    로그인 사용자의 모든 포스트 이미지 이벤트 (SSE, 연결 유지).
+    인증: `?token=<POST /posts/stream-token으로 받은 토큰>` (post_id 없이 발급한 것).
+    - image: {post_id, index, status, url, error, timeout}
+    - post_status: {post_id, img_gen_status}
+    """
+    user_id = current_user.id
+
+    async def event_stream():
+        with post_event_bus.subscribe(user_id=user_id) as subscription:
+            yield _sse("ready", {"user_id": user_id})
+            while True:
+                message = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = {k: v for k, v in message.items() if k not in ("event", "user_id")}
+                yield _sse(message["event"], data)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.get("/{post_id}/events")
+async def stream_post_events(
+    post_id: int,
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user_sse),
+):
+    """
+    포스트 1건의 이미지 진행 이벤트 (SSE). /status 폴링 대체용.
+    인증: `?token=<POST /posts/stream-token?post_id=...로 받은 토큰>`.
+    연결 직후 현재 상태를 image 이벤트로 보내고, 이후 변경분만 보낸 뒤 모든 이미지가 끝나면 done으로 종료합니다.
+    """
+    post = db.query(Post.id).join(Blog).filter(Post.id == post_id, Blog.owner_id == current_user.id).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="포스트를 찾을 수 없습니다.")
+
+    async def event_stream():
+        async for chunk in _image_progress_sse(post_id):
+            yield chunk
+        yield await _done_event(post_id)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
 @router.post("/{post_id}/publish")
 async def publish_manual_post(
     post_id: int,
@@ -364,19 +718,12 @@ async def publish_manual_post(
             post.published_url = result.get("url")
             post.published_at = datetime.now()
             
-            # 발행 성공 시 즉시 트래킹 시작
-            post.tracking_status = "TRACKING"
+            # 발행 성공 시 즉시 트래킹 시작 (백그라운드, 발행 응답을 기다리게 하지 않음)
+            claimed_at = datetime.now()
+            claimed = claim_posts(db, [post_id], claimed_at)
             db.commit()
-            
-            try:
-                await tracking_service.update_post_tracking(db, post_id)
-                post.tracking_status = "COMPLETED"
-                post.last_tracked_at = datetime.now()
-                db.commit()
-            except Exception as track_err:
-                LOGGER.error(f"Auto-tracking failed after manual publish for post {post_id}: {track_err}")
-                post.tracking_status = "PENDING"
-                db.commit()
+            if claimed:
+                tracking_engine.submit(claimed, claimed_at=claimed_at)
 
             return {"status": "success", "url": post.published_url}
         else:
@@ -395,6 +742,8 @@ async def trigger_post_tracking(
 ):
     """
     특정 포스트의 순위 트래킹을 수동으로 트리거합니다.
+    AS-IS: 요청 안에서 키워드별 검색을 순서대로 실행 (키워드당 1초 이상 대기).
+    TO-BE: tracking_engine에 넘기고 즉시 응답. 결과는 /posts/status 또는 /posts/keywords에서 확인.
     """
     post = db.query(Post).join(Blog).filter(Post.id == post_id, Blog.owner_id == current_user.id).first()
     if not post:
@@ -403,41 +752,85 @@ async def trigger_post_tracking(
     if not post.published_url:
         raise HTTPException(status_code=400, detail="발행된 URL이 없어 트래킹할 수 없습니다.")
 
-    post.tracking_status = "TRACKING"
-    db.commit()
-    
-    # 실제 트래킹 시작
-    await tracking_service.update_post_tracking(db, post_id)
-    
-    post.tracking_status = "COMPLETED"
-    post.last_tracked_at = datetime.now()
+    # 다른 요청/프로세스가 이미 트래킹 중이면 중복 실행하지 않음 (tracking_status CAS)
+    claimed_at = datetime.now()
+    claimed = claim_posts(db, [post_id], claimed_at)
     db.commit()
-    
-    return {"status": "ok", "keyword_ranks": post.keyword_ranks}
+    db.refresh(post)
+    if not claimed:
+        return {"status": "already_tracking", "tracking_status": post.tracking_status, "keyword_ranks": post.keyword_ranks}
+    tracking_engine.submit(claimed, claimed_at=claimed_at)
+
+    return {"status": "queued", "tracking_status": post.tracking_status, "keyword_ranks": post.keyword_ranks}
+
+
+KEYWORD_TRACKING_PAGE_SIZE = int(os.getenv("KEYWORD_TRACKING_PAGE_SIZE", "100"))
+KEYWORD_TRACKING_PAGE_MAX = int(os.getenv("KEYWORD_TRACKING_PAGE_MAX", "500"))
+
+
+def _page_bounds(limit: int, offset: int) -> tuple[int, int]:
+    return max(1, min(limit, KEYWORD_TRACKING_PAGE_MAX)), max(0, offset)
 
 
 @router.get("/keywords")
 def get_keyword_tracking(
+    keyword: str | None = None,
+    platform: str | None = None,
+    post_id: int | None = None,
+    limit: int = KEYWORD_TRACKING_PAGE_SIZE,
+    offset: int = 0,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    키워드 트래킹 테이블용 최소 엔드포인트.
+    키워드 트래킹 테이블: (포스트, 키워드)별 최신 순위.
+
+    AS-IS: 모든 포스트의 keyword_ranks JSON을 파이썬에서 순회.
+    TO-BE: keyword_ranks 테이블 단일 쿼리 (keyword 부분 일치 / platform / post_id 필터, limit/offset).
+           순위를 한 번도 얻지 못한 키워드(차단 -1, 첫 실행)는 Post.keyword_ranks 스냅샷에서 이어 붙입니다.
+
+    응답: {"items": [...], "total": 전체 건수, "next_offset": 다음 페이지 offset 또는 null}
     """
-    blogs = db.query(Blog).options(joinedload(Blog.posts)).filter(Blog.owner_id == current_user.id).all()
-    rows: list[dict] = []
-    for blog in blogs:
-        for post in blog.posts:
-            ranks = post.keyword_ranks or {}
-            for keyword, meta in ranks.items():
-                if isinstance(meta, dict):
-                    rows.append(
-                        {
-                            "keyword": keyword,
-                            "platform": blog.platform_type,
-                            "rank": meta.get("rank", 0),
-                            "change": meta.get("change", 0),
-                            "updated_at": meta.get("updated_at", ""),
-                        }
-                    )
-    return rows
+    limit, offset = _page_bounds(limit, offset)
+    return list_keyword_ranks(
+        db, current_user.id, keyword=keyword, platform=platform, post_id=post_id, limit=limit, offset=offset
+    )
+
+
+@router.get("/keywords/changes")
+def get_keyword_rank_changes(
+    days: int = 7,
+    keyword: str | None = None,
+    limit: int = KEYWORD_TRACKING_PAGE_SIZE,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """최근 days일 동안의 키워드 순위 변동 (변동 폭 큰 순)."""
+    limit, offset = _page_bounds(limit, offset)
+    return list_rank_changes(db, current_user.id, days=max(1, days), keyword=keyword, limit=limit, offset=offset)
+
+
+@router.get("/{post_id}/keywords/history")
+def get_post_keyword_history(
+    post_id: int,
+    days: int = 30,
+    keyword: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """포스트의 키워드별 순위 이력 (차트용, 시간순)."""
+    return rank_history(db, current_user.id, post_id, days=max(1, days), keyword=keyword)
+
+
+@router.get("/{post_id}", response_model=PostStatusResponse)
+def get_post(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """포스트 단건 조회 (본문 content 포함). 목록 엔드포인트는 본문을 내려주지 않습니다."""
+    post = db.query(Post).join(Blog).filter(Post.id == post_id, Blog.owner_id == current_user.id).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="포스트를 찾을 수 없습니다.")
+    return post
@@ -1,17 +1,61 @@
 import os
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 Base = declarative_base()
 
-# 프로젝트 루트 기준 절대 경로로 SQLite DB 설정
+# AS-IS: sqlite:///{PROJECT_ROOT}/sql_app.db 고정 → 이미지 워커/스케줄러/API 요청이 SQLite 단일 writer 락을 두고 경합.
+# TO-BE: DATABASE_URL(예: postgresql+psycopg2://user:pw@host/db)로 엔진을 만들고 커넥션 풀 설정을 env로 조정.
+#        DATABASE_URL이 없으면 개발용으로 기존 SQLite 파일을 사용하되 WAL + busy_timeout을 켭니다.
+#        (Settings.DATABASE_URL의 Postgres 기본값은 로컬 개발에서 접속 실패를 부르므로 여기서는 쓰지 않음)
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{PROJECT_ROOT}/sql_app.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL") or f"sqlite:///{PROJECT_ROOT}/sql_app.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+IS_SQLITE = make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "sqlite"
+
+
+def _build_engine():
+    if IS_SQLITE:
+        # SQLite는 파일 락 기반이라 풀 크기 옵션 대신 연결마다 PRAGMA로 동시성 설정
+        sqlite_engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            echo=DB_ECHO,
+        )
+
+        @event.listens_for(sqlite_engine, "connect")
+        def _sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            # WAL: 읽기가 쓰기를 막지 않음 / busy_timeout: 락 충돌 시 즉시 "database is locked" 대신 대기
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+        return sqlite_engine
+
+    return create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        echo=DB_ECHO,
+    )
+
+
+engine = _build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # DB 세션 가져오기 (의존성 주입용)
@@ -22,7 +66,86 @@ def get_db():
     finally:
         db.close()
 
-# 테이블 자동 생성 (서버 켜질 때 실행)
+
+# --- 비동기 세션 (async def 라우트용) ---
+# AS-IS: async def 라우트가 동기 SessionLocal(get_db)을 그대로 사용 → 쿼리 동안 이벤트 루프가 멈춰
+#        같은 워커의 Gemini/ComfyUI await가 모두 지연.
+# TO-BE: 같은 DATABASE_URL을 비동기 드라이버(asyncpg / aiosqlite)로 바꾼 AsyncEngine을 사용합니다.
+#        드라이버는 첫 사용 시 로드하므로, 설치되지 않은 환경에서도 동기 경로는 그대로 동작합니다.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or ""
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def _async_url() -> str:
+    if ASYNC_DATABASE_URL:
+        return ASYNC_DATABASE_URL
+    url = make_url(SQLALCHEMY_DATABASE_URL)
+    drivername = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        raise RuntimeError(f"No async driver mapping for {url.get_backend_name()}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        if IS_SQLITE:
+            _async_engine = create_async_engine(
+                _async_url(), connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}, echo=DB_ECHO
+            )
+
+            @event.listens_for(_async_engine.sync_engine, "connect")
+            def _sqlite_async_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+        else:
+            _async_engine = create_async_engine(
+                _async_url(),
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_pre_ping=DB_POOL_PRE_PING,
+                echo=DB_ECHO,
+            )
+        # expire_on_commit=False: 커밋 후 속성 접근이 암묵적 I/O(동기 lazy load)를 일으키지 않도록
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _async_sessionmaker()
+
+
+# 비동기 DB 세션 (의존성 주입용)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+
+
+# 테이블 자동 생성 + 버전 마이그레이션 (서버 켜질 때 실행)
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    from app.core.migrations import create_tables, run_migrations
 
+    create_tables(engine)
+    run_migrations(engine)
@@ -1,9 +1,11 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import SECRET_KEY, ALGORITHM
+from app.core.database import get_async_db, get_db
+from app.core.security import SECRET_KEY, ALGORITHM, STREAM_TOKEN_SCOPE
 from app.models.sql_models import User
 
 # 프론트엔드에서 보낸 토큰을 추출하는 도구
@@ -11,11 +13,65 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 # [핵심] 토큰을 까서 '누구인지' 찾아내는 함수
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+    return _user_from_token(token, db)
+
+
+# StreamingResponse 라우트용: 인증 세션을 scope="function"으로 받아 엔드포인트가 응답을 반환하기 전에 닫음
+# (request 스코프면 스트림이 끝날 때까지 DB 커넥션을 잡고 있음). 스트림 본문은 필요할 때마다 짧은 세션을 직접 엶.
+def get_current_user_for_stream(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db, scope="function"),
+):
+    return _user_from_token(token, db)
+
+
+# SSE(EventSource)는 Authorization 헤더를 보낼 수 없으므로 ?token=<스트림 토큰>으로 인증
+# AS-IS: 로그인 JWT(장기)를 URL에 그대로 실어 보냄 → 액세스 로그/프록시/브라우저 기록에 남으면 API 전체 권한 노출.
+# TO-BE: POST /posts/stream-token으로 받은 단기(scope=sse) 토큰만 허용. 포스트 전용 토큰은 그 포스트 스트림에만 사용 가능.
+def get_current_user_sse(
+    request: Request,
+    db: Session = Depends(get_db, scope="function"),
+):
+    path_post_id = request.path_params.get("post_id")
+    return _user_from_token(
+        request.query_params.get("token") or "",
+        db,
+        scope=STREAM_TOKEN_SCOPE,
+        post_id=int(path_post_id) if path_post_id is not None else None,
+    )
+
+
+def _user_from_token(token: str, db: Session, scope: str | None = None, post_id: int | None = None):
+    email = _email_from_token(token, scope, post_id)
+    user = db.query(User).filter(User.email == email).first()
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+# async def 라우트용: 동기 세션을 따로 열지 않고 라우트와 같은 AsyncSession으로 사용자 조회
+# (get_current_user를 쓰면 인증 쿼리만 동기 드라이버로 이벤트 루프 위에서 실행됨)
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    email = _email_from_token(token)
+    user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="자격 증명이 유효하지 않습니다.",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _email_from_token(token: str, scope: str | None = None, post_id: int | None = None) -> str:
+    credentials_exception = _credentials_exception()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -23,9 +79,9 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-        
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    # 용도가 다른 토큰은 거부 (스트림 토큰으로 일반 API 호출 불가, 로그인 토큰으로 ?token= 불가)
+    if payload.get("scope") != scope:
         raise credentials_exception
-    return user
-
+    if scope == STREAM_TOKEN_SCOPE and payload.get("post_id") != post_id:
+        raise credentials_exception
+    return email
@@ -0,0 +1,103 @@
+"""
+앱 수명주기 동안 공유하는 httpx.AsyncClient 레지스트리.
+
+AS-IS: ComfyUI/발행/키워드/순위 추적 호출마다 `async with httpx.AsyncClient()`를 새로 열어
+       매 요청마다 TCP/TLS 핸드셰이크 비용을 지불.
+TO-BE: 용도(comfyui/publisher/naver_api/naver_search)별로 커넥션 풀을 가진 클라이언트를 FastAPI startup에서 만들고
+       shutdown에서 닫습니다.
+       - 커넥션 한도는 용도별 클라이언트 단위 (한 용도가 다른 용도의 커넥션을 잠식하지 않음).
+         한 클라이언트가 여러 호스트를 호출하면(리다이렉트, ComfyUI 백엔드 풀 등) 그 호스트들이 한도를 나눠 씀
+       - keep-alive 재사용, `h2` 패키지가 설치되어 있으면 HTTP/2 사용
+       - startup 전(스크립트/cron)에 호출되어도 지연 생성되므로 서비스 코드는 항상 get_client()만 사용
+
+환경변수:
+- HTTP_MAX_CONNECTIONS_PER_CLIENT (기본 20), HTTP_MAX_KEEPALIVE_PER_CLIENT (기본 10)
+- HTTP_KEEPALIVE_EXPIRY_SECONDS (기본 30), HTTP2_ENABLED (기본 true, h2 설치 시에만 적용)
+"""
+
+import asyncio
+import logging
+import os
+
+import httpx
+
+LOGGER = logging.getLogger("http_client")
+
+HTTP_MAX_CONNECTIONS_PER_CLIENT = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_CLIENT", "20"))
+HTTP_MAX_KEEPALIVE_PER_CLIENT = int(os.getenv("HTTP_MAX_KEEPALIVE_PER_CLIENT", "10"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+
+try:
+    import h2  # type: ignore  # noqa: F401
+
+    _H2_AVAILABLE = True
+except Exception:  # pragma: no cover - 선택 의존성
+    _H2_AVAILABLE = False
+
+# 용도별 기본 설정. 요청별로 다른 timeout이 필요하면 client.get(..., timeout=...)으로 덮어씁니다.
+CLIENT_PROFILES: dict[str, dict] = {
+    # ComfyUI는 내부망 HTTP/1.1 서버이며 대기열 때문에 응답이 길 수 있음
+    "comfyui": {"timeout": httpx.Timeout(300.0, connect=5.0), "http2": False},
+    "publisher": {"timeout": httpx.Timeout(30.0)},
+    "naver_api": {"timeout": httpx.Timeout(10.0)},
+    "naver_search": {"timeout": httpx.Timeout(10.0), "follow_redirects": True},
+}
+
+
+class HttpClientRegistry:
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        profile = dict(CLIENT_PROFILES.get(name, {}))
+        http2 = profile.pop("http2", True) and HTTP2_ENABLED and _H2_AVAILABLE
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS_PER_CLIENT,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_PER_CLIENT,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        profile.setdefault("timeout", httpx.Timeout(30.0))
+        return httpx.AsyncClient(limits=limits, http2=http2, **profile)
+
+    def _check_loop(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is not loop:
+            # asyncio.run()이 다시 호출된 경우 이전 루프의 커넥션은 재사용할 수 없음
+            if self._clients:
+                LOGGER.info("Event loop changed; discarding %s pooled HTTP clients", len(self._clients))
+            self._clients = {}
+            self._loop = loop
+
+    def get_client(self, name: str) -> httpx.AsyncClient:
+        self._check_loop()
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build(name)
+            self._clients[name] = client
+        return client
+
+    async def startup(self) -> None:
+        self._check_loop()
+        for name in CLIENT_PROFILES:
+            self.get_client(name)
+        LOGGER.info("HTTP client pool ready (http2=%s)", HTTP2_ENABLED and _H2_AVAILABLE)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as exc:
+                LOGGER.warning("HTTP client close failed: %s", exc)
+
+
+http_clients = HttpClientRegistry()
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    return http_clients.get_client(name)
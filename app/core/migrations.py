@@ -0,0 +1,250 @@
+"""
+버전 기반 스키마 마이그레이션 (앱 내장).
+
+AS-IS: init_db()가 create_all만 호출 → 새 테이블은 생기지만, 기존 테이블에 나중에 추가된 컬럼/인덱스는
+       운영 DB에 반영되지 않아 배포 후 "no such column" 오류나 풀 스캔이 발생.
+TO-BE: schema_migrations 테이블에 적용된 버전을 기록하고, 아직 적용되지 않은 마이그레이션을 순서대로 실행합니다.
+- 서버 startup(init_db) 또는 scripts/migrate.py로 실행
+- 여러 인스턴스가 동시에 떠도 한 번만 적용:
+  - PostgreSQL: 마이그레이션마다 advisory lock(트랜잭션 단위)을 잡고, 잠금 안에서 적용 여부를 다시 확인
+  - SQLite 등 잠금이 없는 DB: 각 DDL이 "이미 존재" 오류로 실패하면 다시 조회해 실제로 생겼으면 통과,
+    버전 기록은 schema_migrations PK 충돌(IntegrityError)로 한 번만 남음
+- Alembic은 의존성에 없어서 쓰지 않고, 같은 개념(순서 있는 버전 + upgrade 함수)만 가볍게 구현
+
+새 마이그레이션 추가 방법: 모델을 수정한 뒤 MIGRATIONS 끝에 Migration("000N", 설명, upgrade 함수)를 추가.
+    예) Migration("0003", "posts.foo 추가", lambda conn: add_columns(conn, "posts", ["foo"]))
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from contextlib import nullcontext
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, literal, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+
+from app.core.database import Base
+import app.models.sql_models  # noqa: F401  (모델 메타데이터 등록, Base.metadata.tables 조회용)
+
+LOGGER = logging.getLogger("migrations")
+
+# pg_advisory_xact_lock 키 (이 앱의 마이그레이션 전용 임의 상수)
+MIGRATION_LOCK_KEY = 7_310_420_001
+
+_migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _migration_metadata,
+    Column("version", String(32), primary_key=True),
+    Column("description", String(255), nullable=False, default=""),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def _column_ddl(conn: Connection, column) -> str:
+    preparer = conn.dialect.identifier_preparer
+    ddl = f"{preparer.quote(column.name)} {column.type.compile(dialect=conn.dialect)}"
+    default = column.default
+    if default is not None and default.is_scalar:
+        value = default.arg.value if hasattr(default.arg, "value") else default.arg
+        rendered = literal(value).compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+        ddl += f" DEFAULT {rendered}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    elif not column.nullable:
+        # 기존 행에 채울 값이 없으므로 NULL 허용으로 추가 (애플리케이션 기본값으로 채워짐)
+        LOGGER.warning("Adding %s.%s as nullable (no scalar default)", column.table.name, column.name)
+    return ddl
+
+
+def _run_ddl(conn: Connection, execute: Callable[[], None], exists: Callable[[], bool]) -> bool:
+    """
+    DDL 1건 실행. 다른 인스턴스가 먼저 만들어 실패한 경우(exists()가 True)는 무시합니다.
+    반환값: 이번에 실행했으면 True.
+    """
+    # PostgreSQL은 오류가 난 트랜잭션을 계속 쓸 수 없으므로 savepoint 안에서 실행
+    scope = conn.begin_nested() if conn.dialect.name != "sqlite" else nullcontext()
+    try:
+        with scope:
+            execute()
+        return True
+    except (OperationalError, ProgrammingError):
+        if exists():
+            return False
+        raise
+
+
+def add_columns(conn: Connection, table_name: str, column_names: list[str] | None = None) -> list[str]:
+    """
+    모델에 정의된 컬럼 중 DB 테이블에 없는 것을 ALTER TABLE ADD COLUMN으로 추가합니다.
+    column_names가 None이면 모델의 모든 컬럼을 대상으로 합니다. 반환값: 추가한 컬럼명.
+    """
+    inspector = inspect(conn)
+    if table_name not in inspector.get_table_names():
+        return []  # 테이블 자체가 없으면 create_all이 만듦
+    table = Base.metadata.tables[table_name]
+    existing = {col["name"] for col in inspector.get_columns(table_name)}
+    added = []
+    for column in table.columns:
+        if column.name in existing or (column_names is not None and column.name not in column_names):
+            continue
+        quoted = conn.dialect.identifier_preparer.quote(table_name)
+        ddl = text(f"ALTER TABLE {quoted} ADD COLUMN {_column_ddl(conn, column)}")
+        if _run_ddl(
+            conn,
+            lambda: conn.execute(ddl),
+            lambda: column.name in {col["name"] for col in inspect(conn).get_columns(table_name)},
+        ):
+            added.append(column.name)
+    if added:
+        LOGGER.info("Added columns to %s: %s", table_name, ", ".join(added))
+    return added
+
+
+def create_indexes(conn: Connection, table_names: list[str] | None = None) -> None:
+    """모델에 선언된 인덱스 중 없는 것을 생성합니다."""
+    for table in Base.metadata.sorted_tables:
+        if table_names is not None and table.name not in table_names:
+            continue
+        for index in table.indexes:
+            _run_ddl(
+                conn,
+                lambda: index.create(conn, checkfirst=True),
+                lambda: index.name in {ix["name"] for ix in inspect(conn).get_indexes(table.name)},
+            )
+
+
+def create_tables(engine: Engine, metadata: MetaData = Base.metadata) -> None:
+    """create_all과 같지만, 동시에 뜬 다른 인스턴스가 먼저 만든 테이블/인덱스는 오류 없이 건너뜁니다."""
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            _run_ddl(conn, lambda: table.create(conn, checkfirst=True), lambda: inspect(conn).has_table(table.name))
+
+
+def _baseline_columns(conn: Connection) -> None:
+    # 이전 버전에서 create_all로 만들어진 테이블에 이후 추가된 컬럼
+    # (이미지 큐 내구성 컬럼, 포스트 SEO/트래킹/이미지 상태 컬럼 등)을 한 번에 보충
+    for table in Base.metadata.sorted_tables:
+        add_columns(conn, table.name)
+
+
+def _parse_observed_at(value) -> datetime | None:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+        except ValueError:
+            return None
+    return None
+
+
+def _keyword_rank_history(conn: Connection) -> None:
+    # keyword_ranks 테이블/인덱스 생성 후, 기존 Post.keyword_ranks JSON의 최신 값을 첫 관측으로 옮김
+    table = Base.metadata.tables["keyword_ranks"]
+    _run_ddl(conn, lambda: table.create(conn, checkfirst=True), lambda: inspect(conn).has_table(table.name))
+    create_indexes(conn, ["keyword_ranks"])
+    if conn.execute(select(table.c.id).limit(1)).first() is not None:
+        return
+
+    posts = Base.metadata.tables["posts"]
+    result = conn.execute(
+        select(posts.c.id, posts.c.keyword_ranks, posts.c.last_tracked_at, posts.c.created_at).where(
+            posts.c.keyword_ranks.is_not(None)
+        )
+    )
+    rows = []
+    for post in result:
+        ranks = post.keyword_ranks
+        if not isinstance(ranks, dict):
+            continue
+        for keyword, meta in ranks.items():
+            if not isinstance(meta, dict) or not isinstance(meta.get("rank"), int) or meta["rank"] < 1:
+                continue
+            observed_at = (
+                _parse_observed_at(meta.get("updated_at"))
+                or _parse_observed_at(post.last_tracked_at)
+                or _parse_observed_at(post.created_at)
+                or datetime.now()
+            )
+            rows.append(
+                {
+                    "post_id": post.id,
+                    "keyword": keyword,
+                    "rank": meta["rank"],
+                    "change": meta.get("change") if isinstance(meta.get("change"), int) else 0,
+                    "observed_at": observed_at,
+                }
+            )
+    if rows:
+        conn.execute(table.insert(), rows)
+        LOGGER.info("Backfilled %d keyword rank observation(s) from posts.keyword_ranks", len(rows))
+
+
+MIGRATIONS: list[Migration] = [
+    Migration("0001", "기존 테이블에 누락된 모델 컬럼 보충", _baseline_columns),
+    Migration(
+        "0002",
+        "조회 경로용 인덱스 (posts, image_queue, keyword_queue, credit_logs, payment_requests)",
+        lambda conn: create_indexes(
+            conn, ["posts", "image_queue", "keyword_queue", "credit_logs", "payment_requests"]
+        ),
+    ),
+    Migration("0003", "keyword_ranks 순위 이력 테이블 + 기존 JSON 순위 이관", _keyword_rank_history),
+    Migration(
+        "0004", "posts.tracking_claimed_at 추가 (트래킹 점유 CAS)", lambda conn: add_columns(conn, "posts", ["tracking_claimed_at"])
+    ),
+    Migration(
+        "0005", "keyword_queue.reserved_at 추가 (키워드 선택 시 점유)", lambda conn: add_columns(conn, "keyword_queue", ["reserved_at"])
+    ),
+]
+
+
+def applied_versions(engine: Engine) -> set[str]:
+    create_tables(engine, _migration_metadata)
+    with engine.connect() as conn:
+        return {row.version for row in conn.execute(select(schema_migrations.c.version))}
+
+
+def run_migrations(engine: Engine) -> list[str]:
+    """적용되지 않은 마이그레이션을 버전 순으로 실행합니다. 반환값: 이번에 적용한 버전 목록."""
+    done = applied_versions(engine)
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        try:
+            with engine.begin() as conn:
+                if conn.dialect.name == "postgresql":
+                    # 다른 인스턴스가 같은 마이그레이션을 실행 중이면 끝날 때까지 대기 (커밋/롤백 시 자동 해제)
+                    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                    applied_meanwhile = conn.execute(
+                        select(schema_migrations.c.version).where(schema_migrations.c.version == migration.version)
+                    ).first()
+                    if applied_meanwhile is not None:
+                        LOGGER.info("Migration %s already applied by another process", migration.version)
+                        continue
+                migration.upgrade(conn)
+                conn.execute(
+                    schema_migrations.insert().values(
+                        version=migration.version,
+                        description=migration.description,
+                        applied_at=datetime.now(),
+                    )
+                )
+        except IntegrityError:
+            # 다른 인스턴스가 같은 버전을 먼저 기록함
+            LOGGER.info("Migration %s already applied by another process", migration.version)
+            continue
+        LOGGER.info("Applied migration %s: %s", migration.version, migration.description)
+        applied.append(migration.version)
+    return applied
@@ -14,6 +14,9 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.getenv("SECRET_KEY", "super_secret_key_change_me_please")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24시간
+# SSE(EventSource) 연결용 토큰: URL 쿼리로 전달되어 로그/프록시에 남을 수 있으므로 짧은 만료 + 용도 한정
+STREAM_TOKEN_SCOPE = "sse"
+STREAM_TOKEN_EXPIRE_SECONDS = int(os.getenv("STREAM_TOKEN_EXPIRE_SECONDS", "60"))
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -31,3 +34,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+def create_stream_token(email: str, post_id: Optional[int] = None):
+    """SSE 연결 1회용 단기 토큰 (scope=sse). post_id를 주면 해당 포스트 스트림에만 사용 가능."""
+    return create_access_token(
+        {"sub": email, "scope": STREAM_TOKEN_SCOPE, "post_id": post_id},
+        expires_delta=timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS),
+    )
@@ -7,9 +7,10 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import asyncio
 
-from app.core.database import init_db
+from app.core.database import dispose_async_engine, init_db
+from app.core.http_client import http_clients
 # TO-BE: keywords 라우터 추가
-from app.api.v1 import auth, blogs, posts, config, dashboard, keywords, admin, credits
+from app.api.v1 import auth, blogs, posts, config, dashboard, keywords, admin, credits, image_queue
 
 # 우리가 만든 에이전트들 임포트
 from app.agents.knowledge import KnowledgeAgent
@@ -57,6 +58,66 @@ async def start_periodic_cleanup():
     
     asyncio.create_task(cleanup_loop())
 
+
+@app.on_event("startup")
+async def start_http_clients():
+    # 공유 커넥션 풀 (ComfyUI/발행/키워드/순위 추적)
+    await http_clients.startup()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await http_clients.aclose()
+
+
+@app.on_event("shutdown")
+async def close_async_db():
+    await dispose_async_engine()
+
+
+@app.on_event("startup")
+async def start_image_queue_worker():
+    # DB 기반 이미지 생성 큐 워커 (여러 서버에서 띄워도 점유는 한 곳만 성공)
+    from app.services.image_queue_service import IMAGE_QUEUE_WORKER_ENABLED, image_queue_worker
+    if IMAGE_QUEUE_WORKER_ENABLED:
+        image_queue_worker.start()
+
+
+@app.on_event("shutdown")
+async def stop_image_queue_worker():
+    from app.services.image_queue_service import image_queue_worker
+    await image_queue_worker.stop()
+
+
+@app.on_event("startup")
+async def start_schedule_runner():
+    # 상주 스케줄러 (cron의 scripts/run_batch.py와 함께 돌아도 슬롯 점유는 한 곳만 성공)
+    from app.services.schedule_runner import SCHEDULER_ENABLED, schedule_runner
+    if SCHEDULER_ENABLED:
+        schedule_runner.start()
+
+
+@app.on_event("shutdown")
+async def stop_schedule_runner():
+    from app.services.schedule_runner import schedule_runner
+    from app.services.post_pipeline import post_pipeline
+    await schedule_runner.stop()
+    await post_pipeline.stop()
+
+
+@app.on_event("startup")
+async def start_tracking_engine():
+    # 발행 포스트 순위 주기 갱신 (수동 트래킹 요청은 TRACKING_ENABLED와 무관하게 백그라운드로 처리)
+    from app.services.tracking_engine import TRACKING_ENABLED, tracking_engine
+    if TRACKING_ENABLED:
+        tracking_engine.start()
+
+
+@app.on_event("shutdown")
+async def stop_tracking_engine():
+    from app.services.tracking_engine import tracking_engine
+    await tracking_engine.stop()
+
 # 라우터 등록
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(blogs.router, prefix="/api/v1/blogs", tags=["blogs"])
@@ -66,6 +127,7 @@ app.include_router(dashboard.router, prefix="/api/v1", tags=["dashboard"])
 app.include_router(keywords.router, prefix="/api/v1/keywords", tags=["keywords"])  # TO-BE
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])  # TO-BE
 app.include_router(credits.router, prefix="/api/v1/credits", tags=["credits"])
+app.include_router(image_queue.router, prefix="/api/v1/images", tags=["images"])
 
 # 요청 받을 데이터 모델
 class TopicRequest(BaseModel):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, JSON, Enum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, JSON, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -94,6 +94,9 @@ class CreditLog(Base):
 
     user = relationship("User", back_populates="credit_logs")
 
+    # 내 크레딧 로그 (user_id = ? ORDER BY created_at DESC LIMIT 50)
+    __table_args__ = (Index("ix_credit_logs_user_id_created_at", "user_id", "created_at"),)
+
 
 # 6. 기존 Blog/Post 유지 (필요 시 필드 확장)
 class Blog(Base):
@@ -150,9 +153,18 @@ class Post(Base):
     # [추가] 트래킹 관련
     tracking_status = Column(String, nullable=True, default="PENDING")
     last_tracked_at = Column(DateTime(timezone=True), nullable=True)
+    tracking_claimed_at = Column(DateTime(timezone=True), nullable=True)  # TRACKING 점유 시각 (만료되면 다른 프로세스가 재점유)
 
     created_at = Column(DateTime(timezone=True), default=func.now())
 
+    __table_args__ = (
+        # 블로그별 최신순 목록 (blog_id = ? ORDER BY created_at DESC)
+        Index("ix_posts_blog_id_created_at", "blog_id", "created_at"),
+        Index("ix_posts_status", "status"),
+        # 오래된 포스트 정리 (created_at < ?)
+        Index("ix_posts_created_at", "created_at"),
+    )
+
 
 # 7. [신규] 온톨로지/지식 저장소
 class Knowledge(Base):
@@ -174,10 +186,14 @@ class KeywordQueue(Base):
     keyword = Column(String, nullable=False)
     priority = Column(Integer, default=0)
     used_at = Column(DateTime(timezone=True), nullable=True)
+    reserved_at = Column(DateTime(timezone=True), nullable=True)  # 실행 중인 파이프라인이 점유한 시각 (발행/실패 시 해제)
     created_at = Column(DateTime(timezone=True), default=func.now())
 
     user = relationship("User")
 
+    # 다음 키워드 (user_id = ? AND used_at IS NULL ORDER BY priority DESC)
+    __table_args__ = (Index("ix_keyword_queue_user_id_used_at_priority", "user_id", "used_at", "priority"),)
+
 
 # 9. [TO-BE] 이미지 생성 큐
 class ImageQueue(Base):
@@ -192,8 +208,27 @@ class ImageQueue(Base):
     created_at = Column(DateTime(timezone=True), default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
+    # [TO-BE] 내구성 큐: 포스트 내 이미지 순서/파일명, 재시도, 리스(lease) 기반 점유
+    image_index = Column(Integer, nullable=True)       # 1부터 시작 (마지막 = 썸네일)
+    filename = Column(String, nullable=True)           # SEO 파일명 (없으면 queue_<id>_<ts>.png)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)  # 재시도 백오프
+    locked_by = Column(String, nullable=True)          # 점유 중인 워커 id
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)  # 하트비트가 끊기면 재점유 가능
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
     post = relationship("Post")
 
+    __table_args__ = (
+        # 워커 점유 후보 (status = PENDING AND next_attempt_at <= now / PROCESSING AND lease 만료)
+        Index("ix_image_queue_status_next_attempt_at", "status", "next_attempt_at"),
+        # 포스트별 이미지 상태 (post_id = ? ORDER BY image_index)
+        Index("ix_image_queue_post_id_image_index", "post_id", "image_index"),
+        # 점유 토큰으로 재조회/하트비트 (locked_by = ?)
+        Index("ix_image_queue_locked_by", "locked_by"),
+    )
+
 
 # 10. [신규] 결제/충전 요청 (수동 확인용)
 class PaymentRequest(Base) :
@@ -210,6 +245,9 @@ class PaymentRequest(Base) :
 
     user = relationship("User")
 
+    # 입금 대기 목록 (status = PENDING ORDER BY created_at)
+    __table_args__ = (Index("ix_payment_requests_status_created_at", "status", "created_at"),)
+
 
 # 11. [신규] 충전 요금제 플랜 (관리자 관리용)
 class RechargePlan(Base):
@@ -236,3 +274,25 @@ class SystemConfig(Base):
     toss_link = Column(String, nullable=True)
     kakao_link = Column(String, nullable=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), default=func.now())
+
+
+# 13. [신규] 키워드 순위 관측 이력 (시계열)
+# AS-IS: Post.keyword_ranks JSON에 최신 값만 덮어써서, 키워드 테이블/변동 조회가 모든 포스트 JSON을 파이썬에서 순회.
+# TO-BE: 관측마다 한 행을 추가하고 (post_id, keyword, observed_at) 인덱스로 최신값/기간 변동을 SQL에서 조회.
+#        Post.keyword_ranks는 기존 화면 호환용 최신 스냅샷으로 계속 갱신.
+class KeywordRank(Base):
+    __tablename__ = "keyword_ranks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    keyword = Column(String, nullable=False)
+    rank = Column(Integer, nullable=False)  # 1~: 순위, 100: 상위 100위 밖
+    change = Column(Integer, nullable=False, default=0)  # 직전 관측 대비 변동 (양수 = 순위 상승)
+    observed_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+    __table_args__ = (
+        # 포스트별 키워드 최신값/이력 (post_id = ? AND keyword = ? ORDER BY observed_at)
+        Index("ix_keyword_ranks_post_id_keyword_observed_at", "post_id", "keyword", "observed_at"),
+        # 키워드 기준 조회 (같은 키워드를 노리는 포스트 비교)
+        Index("ix_keyword_ranks_keyword_observed_at", "keyword", "observed_at"),
+    )
@@ -54,10 +54,10 @@ class BlogResponse(BaseModel):
         from_attributes = True
 
 # 6. 포스팅 성과 조회 데이터
-class PostStatusResponse(BaseModel):
+# 목록용 프로젝션: 본문(content)은 제외하고 GET /posts/{id}로 따로 조회
+class PostListItem(BaseModel):
     id: int
     title: str
-    content: str | None # [추가] 다운로드용
     status: str
     published_url: str | None
     view_count: int
@@ -73,6 +73,21 @@ class PostStatusResponse(BaseModel):
         from_attributes = True
 
 
+class PostStatusResponse(PostListItem):
+    content: str | None # [추가] 다운로드용
+
+
+class PostPageItem(PostListItem):
+    blog_id: int
+    blog_alias: str
+    platform: str
+
+
+class PostStatusPage(BaseModel):
+    items: List[PostPageItem]
+    next_cursor: str | None = None  # None이면 마지막 페이지
+
+
 # Policy / settings updates
 class PostLengthEnum(str, Enum):
     SHORT = "SHORT"
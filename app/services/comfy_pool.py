@@ -0,0 +1,194 @@
+"""
+ComfyUI 백엔드 풀.
+
+AS-IS: image_service가 단일 COMFYUI_API_URL + 전역 Semaphore(1)로 모든 이미지를 직렬 처리
+       → 3장짜리 포스트 + 예약 배치가 몰리면 수 분씩 대기.
+TO-BE: 여러 ComfyUI 엔드포인트(GPU 박스)를 등록하고, 각 백엔드별 동시 처리 한도/헬스 상태/진행 중 작업 수를
+       관리하여 가장 한가한 정상 백엔드로 작업을 분배합니다.
+
+환경변수:
+- COMFYUI_API_URLS: 콤마 구분 엔드포인트 목록. `http://gpu1:8188|2` 처럼 `|동시처리수`를 붙일 수 있음.
+                    미설정 시 기존 COMFYUI_API_URL 하나만 사용 (기존 동작과 동일).
+- COMFYUI_BACKEND_CONCURRENCY: `|` 지정이 없는 백엔드의 기본 동시 처리 수 (기본 1)
+- COMFYUI_UNHEALTHY_COOLDOWN_SECONDS: 연결 실패한 백엔드를 제외하는 시간 (기본 30초)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from app.services.comfy_ws import ComfyProgressListener
+
+LOGGER = logging.getLogger("comfy_pool")
+
+COMFYUI_API_URL = os.getenv("COMFYUI_API_URL", "http://127.0.0.1:8188")
+COMFYUI_API_URLS = os.getenv("COMFYUI_API_URLS", "")
+COMFYUI_BACKEND_CONCURRENCY = int(os.getenv("COMFYUI_BACKEND_CONCURRENCY", "1"))
+COMFYUI_UNHEALTHY_COOLDOWN_SECONDS = float(os.getenv("COMFYUI_UNHEALTHY_COOLDOWN_SECONDS", "30"))
+
+
+class NoHealthyBackendError(RuntimeError):
+    """등록된 ComfyUI 백엔드가 모두 비정상 상태일 때 발생합니다."""
+
+
+@dataclass
+class ComfyBackend:
+    url: str
+    max_concurrency: int = 1
+    in_flight: int = 0
+    healthy: bool = True
+    unhealthy_until: float = 0.0
+    consecutive_failures: int = 0
+    total_jobs: int = field(default=0, repr=False)
+    _listener: ComfyProgressListener | None = field(default=None, repr=False)
+
+    @property
+    def listener(self) -> ComfyProgressListener:
+        """백엔드당 하나의 공유 진행 스트림 리스너 (모든 대기 중 prompt가 공유)."""
+        if self._listener is None:
+            self._listener = ComfyProgressListener(self.url)
+        return self._listener
+
+    def is_available(self, now: float) -> bool:
+        if not self.healthy and now >= self.unhealthy_until:
+            # 쿨다운이 지나면 다시 시도해 본다 (half-open)
+            self.healthy = True
+        return self.healthy
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.in_flight < self.max_concurrency
+
+    @property
+    def load(self) -> float:
+        return self.in_flight / max(self.max_concurrency, 1)
+
+
+def parse_backend_urls(raw: str, default_url: str, default_concurrency: int) -> list[ComfyBackend]:
+    """`url|concurrency` 콤마 목록을 ComfyBackend 리스트로 변환합니다."""
+    backends: list[ComfyBackend] = []
+    seen: set[str] = set()
+    for item in (raw or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        url, _, limit = item.partition("|")
+        url = url.strip().rstrip("/")
+        if not url or url in seen:
+            continue
+        try:
+            concurrency = int(limit) if limit.strip() else default_concurrency
+        except ValueError:
+            LOGGER.warning("Invalid concurrency for ComfyUI backend %s: %r", url, limit)
+            concurrency = default_concurrency
+        seen.add(url)
+        backends.append(ComfyBackend(url=url, max_concurrency=max(concurrency, 1)))
+
+    if not backends:
+        backends.append(ComfyBackend(url=default_url.rstrip("/"), max_concurrency=max(default_concurrency, 1)))
+    return backends
+
+
+class ComfyBackendPool:
+    """
+    최소 부하(least-loaded) 방식으로 ComfyUI 백엔드를 배정하는 풀.
+    - acquire(): 여유 슬롯이 있는 정상 백엔드 중 in_flight/max_concurrency가 가장 낮은 곳을 배정
+    - 모든 슬롯이 사용 중이면 슬롯이 반납될 때까지 대기 (기존 세마포어 대기열과 동일한 의미)
+    - mark_failure()/mark_success()로 헬스 상태 갱신
+    """
+
+    def __init__(self, backends: list[ComfyBackend]):
+        if not backends:
+            raise ValueError("ComfyBackendPool requires at least one backend")
+        self.backends = backends
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def total_capacity(self) -> int:
+        return sum(b.max_concurrency for b in self.backends)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # scripts/run_batch.py 처럼 asyncio.run()이 여러 번 호출되는 환경을 위해 루프별로 재생성
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    def _pick(self, exclude: set[str]) -> ComfyBackend | None:
+        now = time.monotonic()
+        candidates = [
+            b for b in self.backends
+            if b.url not in exclude and b.is_available(now) and b.has_capacity
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda b: (b.load, b.in_flight, b.total_jobs))
+
+    def _any_available(self, exclude: set[str]) -> bool:
+        now = time.monotonic()
+        return any(b.url not in exclude and b.is_available(now) for b in self.backends)
+
+    @asynccontextmanager
+    async def acquire(self, exclude: set[str] | None = None) -> AsyncIterator[ComfyBackend]:
+        exclude = exclude or set()
+        condition = self._get_condition()
+        async with condition:
+            while True:
+                backend = self._pick(exclude)
+                if backend is not None:
+                    break
+                if not self._any_available(exclude):
+                    raise NoHealthyBackendError("사용 가능한 ComfyUI 백엔드가 없습니다.")
+                # 다른 작업이 슬롯을 반납하거나, 쿨다운이 끝날 때까지 대기
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=COMFYUI_UNHEALTHY_COOLDOWN_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            backend.in_flight += 1
+            backend.total_jobs += 1
+
+        try:
+            yield backend
+        finally:
+            async with condition:
+                backend.in_flight -= 1
+                condition.notify_all()
+
+    def mark_success(self, backend: ComfyBackend) -> None:
+        backend.healthy = True
+        backend.consecutive_failures = 0
+
+    def mark_failure(self, backend: ComfyBackend) -> None:
+        backend.consecutive_failures += 1
+        backend.healthy = False
+        backend.unhealthy_until = time.monotonic() + COMFYUI_UNHEALTHY_COOLDOWN_SECONDS
+        LOGGER.warning(
+            "ComfyUI backend %s marked unhealthy for %.0fs (failures=%s)",
+            backend.url,
+            COMFYUI_UNHEALTHY_COOLDOWN_SECONDS,
+            backend.consecutive_failures,
+        )
+
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": b.url,
+                "healthy": b.is_available(now),
+                "in_flight": b.in_flight,
+                "max_concurrency": b.max_concurrency,
+                "total_jobs": b.total_jobs,
+            }
+            for b in self.backends
+        ]
+
+
+comfy_pool = ComfyBackendPool(
+    parse_backend_urls(COMFYUI_API_URLS, COMFYUI_API_URL, COMFYUI_BACKEND_CONCURRENCY)
+)
@@ -0,0 +1,243 @@
+"""
+ComfyUI 워크플로우 템플릿 캐시.
+
+AS-IS: 이미지 한 장마다 load_workflow(디스크 읽기 + json.load) → _inject_prompt(json.dumps/loads 딥카피 +
+       CLIPTextEncode 선형 탐색)를 반복.
+TO-BE: 워크플로우 파일을 (경로, mtime) 기준으로 한 번만 파싱해 캐시하고,
+       프롬프트/네거티브/시드/크기/배치 입력 노드 id를 파싱 시점에 미리 찾아 둡니다.
+       요청마다 수정할 노드만 복사하는 얕은 구조 복사(copy-on-write)로 페이로드를 만듭니다.
+
+워크플로우 파일을 수정하면 mtime이 바뀌므로 다음 요청에서 자동으로 다시 로드됩니다.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+
+LOGGER = logging.getLogger("comfy_workflow")
+
+_SAMPLER_TYPES = ("KSampler", "KSamplerAdvanced")
+_SEED_KEYS = ("seed", "noise_seed")
+_OUTPUT_TYPES = ("SaveImage", "PreviewImage")
+
+
+@dataclass(frozen=True)
+class WorkflowSlots:
+    """템플릿에서 요청마다 값을 바꿔 넣는 입력 위치."""
+
+    positive: str
+    negative: str | None = None
+    sampler: str | None = None
+    seed_key: str | None = None
+    latent: str | None = None
+
+
+@dataclass
+class WorkflowTemplate:
+    path: str
+    mtime_ns: int
+    nodes: dict
+    slots: WorkflowSlots
+    _branch: list[str] | None = field(default=None, repr=False)
+
+    @staticmethod
+    def _writable_node(wf: dict, node_id: str) -> dict:
+        """wf[node_id]와 그 inputs만 복사해 교체합니다 (나머지 노드는 템플릿과 공유)."""
+        node = dict(wf[node_id])
+        node["inputs"] = dict(node.get("inputs") or {})
+        wf[node_id] = node
+        return node["inputs"]
+
+    def render(
+        self,
+        prompt: str,
+        negative_prompt: str | None = None,
+        seed: int | None = None,
+        width: int | None = None,
+        height: int | None = None,
+        batch_size: int | None = None,
+    ) -> dict:
+        """
+        요청별 워크플로우 페이로드를 만듭니다.
+        None으로 넘긴 값은 워크플로우 파일에 저장된 값을 그대로 사용합니다.
+        반환값의 수정되지 않은 노드는 템플릿과 공유되므로 호출자는 결과를 변경하면 안 됩니다.
+        """
+        wf = dict(self.nodes)
+        self._writable_node(wf, self.slots.positive)["text"] = prompt
+
+        if negative_prompt is not None and self.slots.negative:
+            self._writable_node(wf, self.slots.negative)["text"] = negative_prompt
+
+        if seed is not None and self.slots.sampler and self.slots.seed_key:
+            self._writable_node(wf, self.slots.sampler)[self.slots.seed_key] = int(seed)
+
+        if self.slots.latent and any(v is not None for v in (width, height, batch_size)):
+            latent_inputs = self._writable_node(wf, self.slots.latent)
+            if width is not None:
+                latent_inputs["width"] = int(width)
+            if height is not None:
+                latent_inputs["height"] = int(height)
+            if batch_size is not None:
+                latent_inputs["batch_size"] = int(batch_size)
+
+        return wf
+
+    def branch_nodes(self) -> list[str]:
+        """
+        positive 프롬프트에 의존하는 노드(프롬프트 → 샘플러 → 디코드 → 저장) 목록.
+        배치 렌더링 시 이 노드들만 프롬프트 수만큼 복제하고, 체크포인트/네거티브/latent는 공유합니다.
+        """
+        if self._branch is None:
+            dependents: dict[str, set[str]] = {}
+            for nid, node in self.nodes.items():
+                for value in ((node or {}).get("inputs") or {}).values():
+                    if isinstance(value, list) and value:
+                        dependents.setdefault(str(value[0]), set()).add(nid)
+            seen: set[str] = set()
+            stack = [self.slots.positive]
+            while stack:
+                nid = stack.pop()
+                if nid in seen:
+                    continue
+                seen.add(nid)
+                stack.extend(dependents.get(nid, ()))
+            self._branch = [nid for nid in self.nodes if nid in seen]
+        return self._branch
+
+    def render_batch(
+        self,
+        prompts: list[str],
+        negative_prompt: str | None = None,
+        seed: int | None = None,
+        width: int | None = None,
+        height: int | None = None,
+    ) -> tuple[dict, list[str]]:
+        """
+        프롬프트 여러 개를 하나의 워크플로우(멀티 브랜치 그래프)로 렌더링합니다.
+        체크포인트 로더는 한 번만 실행되므로 모델이 GPU에 올라간 상태로 모든 이미지를 샘플링합니다.
+
+        Returns:
+            (workflow, output_node_ids): output_node_ids[i]는 prompts[i]의 이미지 출력 노드 id
+        """
+        if not prompts:
+            raise ValueError("render_batch requires at least one prompt")
+
+        base_seed = seed
+        if base_seed is None and self.slots.sampler and self.slots.seed_key:
+            base_seed = int((self.nodes[self.slots.sampler].get("inputs") or {}).get(self.slots.seed_key, 0))
+
+        wf = self.render(
+            prompts[0], negative_prompt=negative_prompt, seed=base_seed, width=width, height=height
+        )
+        branch = self.branch_nodes()
+        outputs = [nid for nid in branch if (wf[nid] or {}).get("class_type") in _OUTPUT_TYPES]
+        if len(outputs) != 1:
+            raise RuntimeError(f"Batch rendering needs exactly one image output per branch (found {outputs})")
+
+        numeric_ids = [int(nid) for nid in wf if nid.isdigit()]
+        next_id = (max(numeric_ids) if numeric_ids else 0) + 1
+        output_ids = [outputs[0]]
+
+        for idx, prompt in enumerate(prompts[1:], start=1):
+            id_map = {nid: str(next_id + k) for k, nid in enumerate(branch)}
+            next_id += len(branch)
+            for nid in branch:
+                node = json.loads(json.dumps(wf[nid]))  # 브랜치 노드만 복사 (소수)
+                inputs = node.get("inputs") or {}
+                for key, value in inputs.items():
+                    if isinstance(value, list) and value and str(value[0]) in id_map:
+                        inputs[key] = [id_map[str(value[0])], *value[1:]]
+                if nid == self.slots.positive:
+                    inputs["text"] = prompt
+                if nid == self.slots.sampler and self.slots.seed_key and base_seed is not None:
+                    # 같은 프롬프트라도 브랜치마다 다른 이미지가 나오도록 시드를 분리
+                    inputs[self.slots.seed_key] = base_seed + idx
+                if node.get("class_type") in _OUTPUT_TYPES and "filename_prefix" in inputs:
+                    inputs["filename_prefix"] = f"{inputs['filename_prefix']}_b{idx}"
+                wf[id_map[nid]] = node
+            output_ids.append(id_map[outputs[0]])
+
+        return wf, output_ids
+
+
+def _link_source(inputs: dict, key: str) -> str | None:
+    """ComfyUI 링크 입력(["node_id", output_index])에서 원본 노드 id를 꺼냅니다."""
+    value = inputs.get(key)
+    if isinstance(value, list) and value:
+        return str(value[0])
+    return None
+
+
+def resolve_slots(nodes: dict) -> WorkflowSlots:
+    """
+    KSampler 그래프를 따라 positive/negative/latent 노드를 찾습니다.
+    - 그래프에서 못 찾으면 기존 규칙(노드 "3" 우선 → 첫 CLIPTextEncode)으로 positive를 정합니다.
+    """
+    sampler_id = next(
+        (str(nid) for nid, node in nodes.items()
+         if isinstance(node, dict) and node.get("class_type") in _SAMPLER_TYPES),
+        None,
+    )
+    positive = negative = latent = seed_key = None
+    if sampler_id is not None:
+        inputs = nodes[sampler_id].get("inputs") or {}
+        positive = _link_source(inputs, "positive")
+        negative = _link_source(inputs, "negative")
+        latent = _link_source(inputs, "latent_image")
+        seed_key = next((k for k in _SEED_KEYS if k in inputs), None)
+
+    def is_text_node(nid: str | None) -> bool:
+        node = nodes.get(nid) if nid is not None else None
+        return isinstance(node, dict) and node.get("class_type") == "CLIPTextEncode"
+
+    if not is_text_node(positive):
+        if isinstance(nodes.get("3"), dict):
+            positive = "3"
+        else:
+            positive = next(
+                (str(nid) for nid, node in nodes.items()
+                 if isinstance(node, dict) and node.get("class_type") == "CLIPTextEncode"),
+                None,
+            )
+            if positive is not None:
+                LOGGER.warning("Injecting prompt into CLIPTextEncode node %s (fallback path)", positive)
+    if positive is None:
+        raise RuntimeError("No CLIPTextEncode node found in workflow; cannot inject prompt text.")
+
+    if not is_text_node(negative) or negative == positive:
+        negative = None
+    latent_node = nodes.get(latent) if latent is not None else None
+    if not (isinstance(latent_node, dict) and "width" in (latent_node.get("inputs") or {})):
+        latent = None
+
+    return WorkflowSlots(
+        positive=positive, negative=negative, sampler=sampler_id, seed_key=seed_key, latent=latent
+    )
+
+
+_TEMPLATE_CACHE: dict[str, WorkflowTemplate] = {}
+
+
+def get_workflow_template(workflow_path: str) -> WorkflowTemplate:
+    """(경로, mtime) 기준으로 캐시된 워크플로우 템플릿을 반환합니다."""
+    key = os.path.abspath(workflow_path)
+    mtime_ns = os.stat(key).st_mtime_ns
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached
+
+    with open(key, encoding="utf-8") as fp:
+        nodes = json.load(fp)
+    if not isinstance(nodes, dict):
+        raise RuntimeError(f"Workflow file is not a ComfyUI API graph: {workflow_path}")
+    nodes = {str(nid): node for nid, node in nodes.items()}
+
+    template = WorkflowTemplate(path=key, mtime_ns=mtime_ns, nodes=nodes, slots=resolve_slots(nodes))
+    _TEMPLATE_CACHE[key] = template
+    LOGGER.info("Workflow template loaded: %s (slots=%s)", key, template.slots)
+    return template
+
+
+def clear_workflow_cache() -> None:
+    _TEMPLATE_CACHE.clear()
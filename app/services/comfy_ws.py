@@ -0,0 +1,216 @@
+"""
+ComfyUI `/ws?clientId=` 진행 스트림 리스너.
+
+AS-IS: 이미지 한 장마다 GET /history/{prompt_id}를 0.5초 간격으로 최대 120초 폴링
+       → 불필요한 왕복 + 이미지당 최대 0.5초 지연, 부하가 늘수록 폴링 요청이 배로 증가.
+TO-BE: 백엔드당 하나의 WebSocket을 열어 두고, 모든 대기 중 prompt를 prompt_id별 Future로 관리합니다.
+       `executed` 메시지가 도착하는 즉시 Future를 완료시키며, 소켓이 끊기거나 메시지가 유실되면
+       image_service가 느린 주기의 history 폴링으로 보완합니다.
+
+`websockets` 패키지가 없으면 리스너는 비활성화되고 기존 폴링 경로만 사용합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+LOGGER = logging.getLogger("comfy_ws")
+
+COMFYUI_WS_ENABLED = os.getenv("COMFYUI_WS_ENABLED", "true").lower() in ("1", "true", "yes")
+COMFYUI_WS_CONNECT_WAIT_SECONDS = float(os.getenv("COMFYUI_WS_CONNECT_WAIT_SECONDS", "1.0"))
+COMFYUI_WS_MAX_BACKOFF_SECONDS = float(os.getenv("COMFYUI_WS_MAX_BACKOFF_SECONDS", "30"))
+
+# 리스너가 등록 전에 받은 결과를 잠시 보관 (POST /prompt 응답과 executed 메시지 간 경합 대비)
+_RECENT_RESULTS_LIMIT = 256
+
+try:
+    import websockets  # type: ignore
+except Exception:  # pragma: no cover - 선택 의존성
+    websockets = None
+
+
+def first_image(outputs: dict | None) -> dict | None:
+    """history/executed outputs({node_id: {"images": [...]}})에서 첫 이미지 메타를 꺼냅니다."""
+    for _, out in (outputs or {}).items():
+        images = out.get("images") if isinstance(out, dict) else None
+        if images and isinstance(images, list):
+            img0 = images[0]
+            if isinstance(img0, dict) and img0.get("filename"):
+                return img0
+    return None
+
+
+def _count_image_outputs(outputs: dict) -> int:
+    return sum(1 for out in outputs.values() if isinstance(out, dict) and out.get("images"))
+
+
+@dataclass
+class _PromptWaiter:
+    future: asyncio.Future
+    expected_outputs: int = 1
+    outputs: dict = field(default_factory=dict)
+
+
+class ComfyProgressListener:
+    """백엔드 하나에 대한 공유 WebSocket 리스너."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.client_id = uuid.uuid4().hex
+        self._waiters: dict[str, _PromptWaiter] = {}
+        self._partial: dict[str, dict] = {}
+        self._recent: OrderedDict[str, Any] = OrderedDict()
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._connected: asyncio.Event | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return COMFYUI_WS_ENABLED and websockets is not None
+
+    @property
+    def ws_url(self) -> str:
+        if self.base_url.startswith("https://"):
+            host = "wss://" + self.base_url[len("https://"):]
+        elif self.base_url.startswith("http://"):
+            host = "ws://" + self.base_url[len("http://"):]
+        else:
+            host = "ws://" + self.base_url
+        return f"{host}/ws?clientId={self.client_id}"
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected is not None and self._connected.is_set()
+
+    def ensure_started(self) -> bool:
+        if not self.enabled:
+            return False
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            # 이전 루프(asyncio.run 재호출)의 대기자는 더 이상 유효하지 않음
+            self._waiters.clear()
+            self._partial.clear()
+            self._loop = loop
+            self._connected = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        return True
+
+    async def wait_connected(self, timeout: float = COMFYUI_WS_CONNECT_WAIT_SECONDS) -> bool:
+        if not self.ensure_started():
+            return False
+        if self.is_connected:
+            return True
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=timeout)  # type: ignore[union-attr]
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def register(self, prompt_id: str, expected_outputs: int = 1) -> asyncio.Future:
+        """
+        prompt_id의 완료 Future를 등록합니다. Future 결과는 {node_id: output} 형태의 outputs입니다.
+        expected_outputs: 이미지 출력 노드가 이만큼 모이면 즉시 완료 (배치 워크플로우용)
+        """
+        future = asyncio.get_running_loop().create_future()
+        if prompt_id in self._recent:
+            result = self._recent.pop(prompt_id)
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+            return future
+
+        waiter = _PromptWaiter(future=future, expected_outputs=max(expected_outputs, 1))
+        waiter.outputs.update(self._partial.pop(prompt_id, {}))
+        self._waiters[prompt_id] = waiter
+        if _count_image_outputs(waiter.outputs) >= waiter.expected_outputs:
+            self._resolve(prompt_id, waiter.outputs)
+        return future
+
+    def discard(self, prompt_id: str) -> None:
+        waiter = self._waiters.pop(prompt_id, None)
+        if waiter and not waiter.future.done():
+            waiter.future.cancel()
+        self._partial.pop(prompt_id, None)
+
+    def _remember(self, prompt_id: str, result: Any) -> None:
+        self._recent[prompt_id] = result
+        while len(self._recent) > _RECENT_RESULTS_LIMIT:
+            self._recent.popitem(last=False)
+
+    def _resolve(self, prompt_id: str, outputs: dict) -> None:
+        waiter = self._waiters.pop(prompt_id, None)
+        if waiter is None:
+            self._remember(prompt_id, self._partial.pop(prompt_id, outputs))
+            return
+        if not waiter.future.done():
+            waiter.future.set_result(dict(waiter.outputs))
+
+    def _fail(self, prompt_id: str, exc: BaseException) -> None:
+        waiter = self._waiters.pop(prompt_id, None)
+        if waiter is None:
+            self._partial.pop(prompt_id, None)
+            self._remember(prompt_id, exc)
+            return
+        if not waiter.future.done():
+            waiter.future.set_exception(exc)
+
+    def handle_message(self, message: dict) -> None:
+        msg_type = message.get("type")
+        data = message.get("data") or {}
+        if not isinstance(data, dict):
+            return
+        prompt_id = str(data.get("prompt_id") or "")
+        if not prompt_id:
+            return
+
+        if msg_type == "executed":
+            node_id = str(data.get("node") or "")
+            output = data.get("output")
+            if not isinstance(output, dict):
+                return
+            waiter = self._waiters.get(prompt_id)
+            outputs = waiter.outputs if waiter else self._partial.setdefault(prompt_id, {})
+            outputs[node_id] = output
+            if waiter and _count_image_outputs(outputs) >= waiter.expected_outputs:
+                self._resolve(prompt_id, outputs)
+        elif msg_type == "executing" and data.get("node") is None:
+            # 해당 prompt 실행 종료 신호
+            self._resolve(prompt_id, self._waiters[prompt_id].outputs if prompt_id in self._waiters else {})
+        elif msg_type == "execution_success":
+            self._resolve(prompt_id, self._waiters[prompt_id].outputs if prompt_id in self._waiters else {})
+        elif msg_type in ("execution_error", "execution_interrupted"):
+            detail = data.get("exception_message") or msg_type
+            self._fail(prompt_id, RuntimeError(f"ComfyUI {msg_type}: {detail}"))
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, max_size=None) as ws:  # type: ignore[union-attr]
+                    self._connected.set()  # type: ignore[union-attr]
+                    backoff = 1.0
+                    LOGGER.info("ComfyUI progress socket connected (%s)", self.base_url)
+                    async for raw in ws:
+                        if isinstance(raw, bytes):
+                            continue  # 미리보기 바이너리 프레임은 무시
+                        try:
+                            message = json.loads(raw)
+                        except ValueError:
+                            continue
+                        if isinstance(message, dict):
+                            self.handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                LOGGER.warning("ComfyUI progress socket error (%s): %s", self.base_url, exc)
+            finally:
+                if self._connected is not None:
+                    self._connected.clear()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, COMFYUI_WS_MAX_BACKOFF_SECONDS)
@@ -5,6 +5,19 @@ Gemini integration helpers.
 사용법은 `from google import genai; client = genai.Client(api_key=...)` 입니다.
 기존 `google.generativeai`는 deprecated 되었고, `google.genai.configure(...)`는 존재하지 않아
 백엔드가 import 단계에서 크래시가 나므로 절대 호출하면 안 됩니다.
+
+AS-IS: 블로킹 SDK 호출을 asyncio.to_thread로 감싸 기본 스레드풀 크기가 곧 동시성 한도였고,
+       쿼터 제어가 없어 배치 스케줄링 시 스레드풀이 고갈되거나 429가 발생.
+TO-BE: SDK의 async 표면(google-genai `client.aio`, 레거시 `generate_content_async`)을 우선 사용하고,
+       모든 Gemini 호출(에이전트 포함)이 GeminiRateLimiter를 거칩니다.
+- GEMINI_MAX_IN_FLIGHT: 동시 요청 수 (기본 4)
+- GEMINI_RPM / GEMINI_TPM: 분당 요청/토큰 예산 (0이면 해당 제한 없음)
+- 대기는 도착 순서(FIFO)로 처리되어 특정 호출자가 굶지 않음
+
+재시도: 일시적 오류(429/5xx/타임아웃/네트워크)는 지터가 있는 지수 백오프로 재시도하며,
+서버가 retry-after/retryDelay 힌트를 주면 그 시간 이상 기다립니다. 400/401/403/404 등은 즉시 실패.
+- GEMINI_MAX_RETRIES (기본 4), GEMINI_RETRY_BASE_SECONDS (기본 1), GEMINI_RETRY_MAX_SECONDS (기본 60)
+- 재시도/실패 통계는 gemini_metrics.snapshot() (관리자 API /admin/gemini/metrics)
 """
 
 from __future__ import annotations
@@ -13,13 +26,30 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any
+import random
+import re
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from app.services.llm_cache import llm_cache, make_cache_key
+from app.services.rate_limiter import AsyncTokenBucket, ConcurrencyLimiter
 
 LOGGER = logging.getLogger("gemini_service")
 
 GENAI_API_KEY = os.getenv("GENAI_API_KEY")
 GENAI_MODEL = os.getenv("GENAI_MODEL_NAME", "gemini-2.5-flash")
 
+GEMINI_MAX_IN_FLIGHT = int(os.getenv("GEMINI_MAX_IN_FLIGHT", "4"))
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "60"))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", "1000000"))
+# 응답 토큰 수는 호출 전에 알 수 없으므로 예상치로 예약하고, 응답의 usage_metadata로 사후 정산
+GEMINI_EXPECTED_OUTPUT_TOKENS = int(os.getenv("GEMINI_EXPECTED_OUTPUT_TOKENS", "2048"))
+
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+GEMINI_RETRY_BASE_SECONDS = float(os.getenv("GEMINI_RETRY_BASE_SECONDS", "1"))
+GEMINI_RETRY_MAX_SECONDS = float(os.getenv("GEMINI_RETRY_MAX_SECONDS", "60"))
+
 _client: Any | None = None
 _legacy_genai: Any | None = None
 
@@ -103,20 +133,233 @@ def _try_parse_json_object(raw: str) -> dict | None:
         return None
 
 
+def _estimate_tokens(prompt: str) -> int:
+    # 한글 비중이 높아 글자당 토큰 수가 영어보다 큼 → 보수적으로 2글자당 1토큰
+    return len(prompt) // 2 + GEMINI_EXPECTED_OUTPUT_TOKENS
+
+
+def _usage_tokens(resp: Any) -> int | None:
+    usage = getattr(resp, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None) if usage is not None else None
+    return int(total) if isinstance(total, int) else None
+
+
+class GeminiRateLimiter:
+    """
+    Gemini 쿼터 보호용 리미터 (프로세스 단위).
+    요청 예산(RPM) → 토큰 예산(TPM) → 동시 실행 슬롯 순서로 대기하며, 각 단계는 FIFO입니다.
+    """
+
+    def __init__(self, max_in_flight: int, rpm: int, tpm: int):
+        self.concurrency = ConcurrencyLimiter(max_in_flight)
+        self.requests = AsyncTokenBucket.per_minute(rpm) if rpm > 0 else None
+        self.tokens = AsyncTokenBucket.per_minute(tpm) if tpm > 0 else None
+
+    @asynccontextmanager
+    async def reserve(self, estimated_tokens: int) -> AsyncIterator[dict]:
+        """
+        호출 1건의 예산을 예약합니다. 블록 안에서 reservation["actual_tokens"]를 채우면
+        예상치와의 차이를 토큰 버킷에 정산합니다.
+        """
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(estimated_tokens)
+        reservation: dict = {"estimated_tokens": estimated_tokens, "actual_tokens": None}
+        try:
+            async with self.concurrency:
+                yield reservation
+        finally:
+            actual = reservation["actual_tokens"]
+            if self.tokens is not None and actual is not None:
+                self.tokens.consume(actual - estimated_tokens)
+
+    def snapshot(self) -> dict:
+        return {
+            "max_in_flight": self.concurrency.limit,
+            "in_flight": self.concurrency.in_flight,
+            "rpm_available": round(self.requests.available, 2) if self.requests else None,
+            "tpm_available": round(self.tokens.available, 2) if self.tokens else None,
+        }
+
+
+gemini_limiter = GeminiRateLimiter(GEMINI_MAX_IN_FLIGHT, GEMINI_RPM, GEMINI_TPM)
+
+
+async def _generate_async(prompt: str) -> Any:
+    if _client is not None:
+        aio = getattr(_client, "aio", None)
+        if aio is not None:
+            return await aio.models.generate_content(model=GENAI_MODEL, contents=prompt)
+        return await asyncio.to_thread(_client.models.generate_content, model=GENAI_MODEL, contents=prompt)
+
+    # legacy fallback
+    model = _legacy_genai.GenerativeModel(GENAI_MODEL)  # type: ignore[union-attr]
+    return await _model_generate_async(model, prompt)
+
+
+async def _model_generate_async(model: Any, prompt: str) -> Any:
+    """레거시 GenerativeModel: async 메서드가 있으면 사용하고, 없으면 스레드로 실행."""
+    generate_async = getattr(model, "generate_content_async", None)
+    if generate_async is not None:
+        return await generate_async(prompt)
+    return await asyncio.to_thread(model.generate_content, prompt)
+
+
+# 오류 분류 → 재시도 여부
+RETRYABLE_ERROR_CLASSES = {"rate_limited", "server_error", "timeout", "network"}
+_RETRY_HINT_RE = re.compile(r"(?:retry[_ ]?delay|retry in|retry after)[^0-9]{0,10}([0-9]+(?:\.[0-9]+)?)\s*s", re.IGNORECASE)
+
+
+def _error_status(exc: BaseException) -> int | None:
+    """SDK 예외에서 HTTP 상태 코드를 꺼냅니다 (google-genai APIError.code, api_core 예외.code 등)."""
+    for attr in ("code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(exc: BaseException) -> str:
+    status = _error_status(exc)
+    if status == 429:
+        return "rate_limited"
+    if status is not None and status >= 500:
+        return "server_error"
+    if status is not None:
+        return "client_error"
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    name = type(exc).__name__
+    if name in ("ResourceExhausted", "TooManyRequests"):
+        return "rate_limited"
+    if name in ("DeadlineExceeded", "ReadTimeout", "ConnectTimeout", "WriteTimeout", "PoolTimeout"):
+        return "timeout"
+    if name in ("ServiceUnavailable", "InternalServerError", "BadGateway", "GatewayTimeout"):
+        return "server_error"
+    if isinstance(exc, (ConnectionError, OSError)) or name in ("ConnectError", "RemoteProtocolError", "ReadError"):
+        return "network"
+    return "other"
+
+
+def retry_after_hint(exc: BaseException) -> float | None:
+    """retry-after 헤더 또는 에러 본문의 RetryInfo.retryDelay("17s")에서 대기 시간을 꺼냅니다."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        try:
+            value = headers.get("retry-after")
+            if value is not None:
+                return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            pass
+    text = f"{getattr(exc, 'details', '')} {exc}"
+    match = _RETRY_HINT_RE.search(text)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def _backoff_delay(attempt: int, hint: float | None) -> float:
+    # full jitter: 동시에 실패한 호출들이 같은 순간에 다시 몰리지 않도록 분산
+    delay = random.uniform(0, min(GEMINI_RETRY_BASE_SECONDS * (2 ** attempt), GEMINI_RETRY_MAX_SECONDS))
+    if hint is not None:
+        delay = max(delay, min(hint, GEMINI_RETRY_MAX_SECONDS) + random.uniform(0, GEMINI_RETRY_BASE_SECONDS))
+    return delay
+
+
+class GeminiMetrics:
+    """프로세스 단위 Gemini 호출 통계."""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.retry_wait_seconds = 0.0
+        self.errors_by_class: Counter = Counter()
+        self.retries_by_class: Counter = Counter()
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "retry_wait_seconds": round(self.retry_wait_seconds, 2),
+            "errors_by_class": dict(self.errors_by_class),
+            "retries_by_class": dict(self.retries_by_class),
+            "limiter": gemini_limiter.snapshot(),
+            "cache": llm_cache.snapshot(),
+        }
+
+
+gemini_metrics = GeminiMetrics()
+
+
+async def _with_retry(prompt: str, generate: Callable[[], Awaitable[Any]]) -> Any:
+    """리미터 예약 + 재시도. 시도마다 예산을 다시 예약하므로 재시도도 쿼터 안에서 이루어집니다."""
+    gemini_metrics.calls += 1
+    attempt = 0
+    while True:
+        try:
+            async with gemini_limiter.reserve(_estimate_tokens(prompt)) as reservation:
+                resp = await generate()
+                reservation["actual_tokens"] = _usage_tokens(resp)
+            gemini_metrics.successes += 1
+            return resp
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            error_class = classify_error(exc)
+            gemini_metrics.errors_by_class[error_class] += 1
+            if error_class not in RETRYABLE_ERROR_CLASSES or attempt >= GEMINI_MAX_RETRIES:
+                gemini_metrics.failures += 1
+                raise
+            delay = _backoff_delay(attempt, retry_after_hint(exc))
+            attempt += 1
+            gemini_metrics.retries += 1
+            gemini_metrics.retries_by_class[error_class] += 1
+            gemini_metrics.retry_wait_seconds += delay
+            LOGGER.warning(
+                "Gemini %s (%s); retry %s/%s in %.1fs",
+                error_class, exc, attempt, GEMINI_MAX_RETRIES, delay,
+            )
+            await asyncio.sleep(delay)
+
+
 async def _call_prompt(prompt: str) -> str:
     _require_gemini()
 
-    def sync_call() -> str:
-        if _client is not None:
-            resp = _client.models.generate_content(model=GENAI_MODEL, contents=prompt)
-            return _extract_text(resp)
+    resp = await _with_retry(prompt, lambda: _generate_async(prompt))
+    return _extract_text(resp)
+
 
-        # legacy fallback
-        model = _legacy_genai.GenerativeModel(GENAI_MODEL)  # type: ignore[union-attr]
-        resp = model.generate_content(prompt)
-        return _extract_text(resp)
+async def _call_prompt_cached(prompt: str, is_valid: Callable[[str], bool] | None = None) -> str:
+    """
+    GEMINI_CACHE_ENABLED일 때 (모델 + 정규화 프롬프트) 키로 응답을 재사용합니다.
+    is_valid가 False인 응답(JSON 파싱 실패 등)은 캐시하지 않아 잘못된 결과가 고정되지 않도록 합니다.
+    """
+    key = make_cache_key(GENAI_MODEL, prompt)
+    cached = await llm_cache.get(key)
+    if cached is not None:
+        LOGGER.info("Gemini cache hit (%s)", key[-12:])
+        return cached
 
-    return await asyncio.to_thread(sync_call)
+    raw = await _call_prompt(prompt)
+    if is_valid is None or is_valid(raw):
+        await llm_cache.set(key, raw)
+    return raw
+
+
+async def generate_with_model(model: Any, prompt: str) -> Any:
+    """
+    에이전트가 직접 만든 레거시 GenerativeModel 호출도 같은 리미터/재시도 정책을 거치도록 하는 헬퍼.
+    반환값은 SDK 응답 객체 그대로입니다 (기존 `model.generate_content(prompt)` 대체).
+    """
+    return await _with_retry(prompt, lambda: _model_generate_async(model, prompt))
 
 
 async def analyze_blog(blog_url: str, alias: str | None, topic: str | None = None) -> dict:
@@ -137,7 +380,7 @@ async def analyze_blog(blog_url: str, alias: str | None, topic: str | None = Non
         f"URL/별칭: {description}{topic_context}"
     )
 
-    raw = await _call_prompt(prompt)
+    raw = await _call_prompt_cached(prompt, is_valid=lambda text: _try_parse_json_object(text) is not None)
 
     data = _try_parse_json_object(raw)
     if data:
@@ -161,21 +404,46 @@ async def analyze_blog(blog_url: str, alias: str | None, topic: str | None = Non
     return {"category": description, "prompt": raw.strip()}
 
 
-async def generate_html(
+def _sanitize_body(text: str) -> str:
+    banned = ["SEO를 위한 한마디", "메타 설명 아이디어"]
+    out_lines: list[str] = []
+    for line in (text or "").splitlines():
+        if any(b in line for b in banned):
+            continue
+        out_lines.append(line)
+    return "\n".join(out_lines).strip()
+
+
+def _build_html_document(title: str, meta_description: str, meta_keywords: list[str], body_html: str) -> str:
+    kw = ", ".join([k.strip() for k in (meta_keywords or []) if str(k).strip()])
+    body = _sanitize_body(body_html)
+    return (
+        "<!doctype html>\n"
+        "<html lang=\"ko\">\n"
+        "<head>\n"
+        "  <meta charset=\"utf-8\" />\n"
+        f"  <title>{title}</title>\n"
+        f"  <meta name=\"description\" content=\"{meta_description}\" />\n"
+        f"  <meta name=\"keywords\" content=\"{kw}\" />\n"
+        "  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />\n"
+        "</head>\n"
+        "<body>\n"
+        f"{body}\n"
+        "</body>\n"
+        "</html>"
+    )
+
+
+def _build_html_prompt(
     topic: str,
     persona: str,
     prompt: str | None,
     word_count_range: tuple[int, int],
     image_count: int,
-    keywords: list[str] | None = None,
-) -> dict:
-    """
-    압도적 SEO 최적화 엔진:
-    - 제목: 30자 내외, 특수문자 배제, 검색 의도 중심
-    - 키워드 분산: 메인 5-10회, 서브 3-5회 (연속 사용 금지)
-    - 구조: 소제목 3-6개(질문형 포함), 리스트/표 활용, 2줄마다 줄바꿈
-    - 이미지: 텍스트 삽입 금지, 이미지 하단 설명 문장 자동 생성
-    """
+    keywords: list[str] | None,
+    output_format: str,
+    output_name: str = "JSON",
+) -> str:
     min_words, max_words = word_count_range
     prompt_text = prompt or f"{topic} 주제로 블로그 글을 작성하세요."
     
@@ -183,9 +451,9 @@ async def generate_html(
     sub_keywords = keywords[1:] if keywords and len(keywords) > 1 else []
     sub_kw_str = ", ".join(sub_keywords) if sub_keywords else "없음"
 
-    full_prompt = (
+    return (
         "당신은 검색 엔진 상위 노출을 보장하는 15년 경력의 SEO 전문 콘텐츠 디렉터입니다.\n"
-        "다음 지침을 엄격히 준수하여 블로그 포스팅을 생성하고 JSON으로 반환하세요.\n\n"
+        f"다음 지침을 엄격히 준수하여 블로그 포스팅을 생성하고 {output_name}으로 반환하세요.\n\n"
         
         "[1. 핵심 SEO 전략 - 프롬프트 미노출 지침]\n"
         f"- 메인 키워드: '{main_keyword}' (본문 전체에 5~10회 골고루 분산, 연속 사용 절대 금지)\n"
@@ -205,104 +473,106 @@ async def generate_html(
         "- **중요**: 각 이미지 위치 바로 아래에 해당 이미지를 설명하는 자연스러운 문장(이미지 캡션)을 1줄 추가하세요.\n"
         "- 이미지 프롬프트 생성 시 이미지 내에 어떠한 텍스트도 삽입하지 않도록 지시하세요.\n\n"
         
-        "반드시 다음 JSON 형태로만 반환하세요:\n"
-        "{\n"
-        "  \"title\": \"SEO 최적화 제목\",\n"
-        "  \"meta_description\": \"메타 설명\",\n"
-        "  \"meta_keywords\": [\"키워드1\", \"키워드2\"],\n"
-        "  \"body_html\": \"상세 HTML 본문\",\n"
-        "  \"image_prompts\": [\"텍스트가 배제된 실사 스타일 프롬프트1\", ..., \"썸네일 프롬프트\"],\n"
-        "  \"summary\": \"요약\"\n"
-        "}\n\n"
+        f"{output_format}"
         f"- 주제: {topic}\n"
         f"- 페르소나: {persona}\n"
         f"- 분량: {min_words}~{max_words}자\n"
         f"- 추가 지시: {prompt_text}\n"
     )
 
-    raw = await _call_prompt(full_prompt)
-
-    def sanitize_body(text: str) -> str:
-        banned = ["SEO를 위한 한마디", "메타 설명 아이디어"]
-        out_lines: list[str] = []
-        for line in (text or "").splitlines():
-            if any(b in line for b in banned):
-                continue
-            out_lines.append(line)
-        return "\n".join(out_lines).strip()
-
-    def build_html(title: str, meta_description: str, meta_keywords: list[str], body_html: str) -> str:
-        kw = ", ".join([k.strip() for k in (meta_keywords or []) if str(k).strip()])
-        body = sanitize_body(body_html)
-        return (
-            "<!doctype html>\n"
-            "<html lang=\"ko\">\n"
-            "<head>\n"
-            "  <meta charset=\"utf-8\" />\n"
-            f"  <title>{title}</title>\n"
-            f"  <meta name=\"description\" content=\"{meta_description}\" />\n"
-            f"  <meta name=\"keywords\" content=\"{kw}\" />\n"
-            "  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />\n"
-            "</head>\n"
-            "<body>\n"
-            f"{body}\n"
-            "</body>\n"
-            "</html>"
-        )
 
-    data = _try_parse_json_object(raw)
-    if data:
-        title = str(data.get("title") or topic).strip()
-        # TO-BE: 제목 55자 제한 강제
-        if len(title) > 55:
-            # 키워드가 앞단에 배치되도록 자릅니다.
-            title = title[:52].strip() + "..."
-        
-        meta_description = str(data.get("meta_description") or "").strip()
-        # TO-BE: 메타 설명 120~160자 강제
-        if len(meta_description) < 120:
-            # 너무 짧으면 문장을 추가하거나 패딩
-            meta_description = (meta_description + " " + title + "에 대한 상세한 정보를 확인해보세요.").strip()
-            if len(meta_description) > 160:
-                meta_description = meta_description[:157] + "..."
-        elif len(meta_description) > 160:
-            meta_description = meta_description[:157].strip() + "..."
-        
-        meta_keywords = data.get("meta_keywords") or []
-        if not isinstance(meta_keywords, list):
-            meta_keywords = [str(meta_keywords)]
-        
-        summary = str(data.get("summary") or "").strip()
-        body_html = str(data.get("body_html") or "").strip()
-        cta_text = str(data.get("cta_text") or "더 알아보기").strip()
-        
-        # TO-BE: CTA 버튼 자동 삽입
-        if "<div class='cta-button'>" not in body_html and "<div class=\"cta-button\">" not in body_html:
-            cta_html = f"""\n<div class="cta-button" style="text-align: center; margin-top: 40px;">
+_JSON_OUTPUT_FORMAT = (
+    "반드시 다음 JSON 형태로만 반환하세요:\n"
+    "{\n"
+    "  \"title\": \"SEO 최적화 제목\",\n"
+    "  \"meta_description\": \"메타 설명\",\n"
+    "  \"meta_keywords\": [\"키워드1\", \"키워드2\"],\n"
+    "  \"body_html\": \"상세 HTML 본문\",\n"
+    "  \"image_prompts\": [\"텍스트가 배제된 실사 스타일 프롬프트1\", ..., \"썸네일 프롬프트\"],\n"
+    "  \"summary\": \"요약\"\n"
+    "}\n\n"
+)
+
+
+def _finalize_html_data(data: dict, topic: str) -> dict:
+    """Gemini가 반환한 필드(title/meta/body_html/image_prompts...)를 SEO 규격에 맞춰 보정하고 HTML 문서를 만듭니다."""
+    title = str(data.get("title") or topic).strip()
+    # TO-BE: 제목 55자 제한 강제
+    if len(title) > 55:
+        # 키워드가 앞단에 배치되도록 자릅니다.
+        title = title[:52].strip() + "..."
+    
+    meta_description = str(data.get("meta_description") or "").strip()
+    # TO-BE: 메타 설명 120~160자 강제
+    if len(meta_description) < 120:
+        # 너무 짧으면 문장을 추가하거나 패딩
+        meta_description = (meta_description + " " + title + "에 대한 상세한 정보를 확인해보세요.").strip()
+        if len(meta_description) > 160:
+            meta_description = meta_description[:157] + "..."
+    elif len(meta_description) > 160:
+        meta_description = meta_description[:157].strip() + "..."
+    
+    meta_keywords = data.get("meta_keywords") or []
+    if not isinstance(meta_keywords, list):
+        meta_keywords = [str(meta_keywords)]
+    
+    summary = str(data.get("summary") or "").strip()
+    body_html = str(data.get("body_html") or "").strip()
+    cta_text = str(data.get("cta_text") or "더 알아보기").strip()
+    
+    # TO-BE: CTA 버튼 자동 삽입
+    if "<div class='cta-button'>" not in body_html and "<div class=\"cta-button\">" not in body_html:
+        cta_html = f"""\n<div class="cta-button" style="text-align: center; margin-top: 40px;">
   <a href="#" style="display: inline-block; padding: 15px 30px; background-color: #007bff; color: white; text-decoration: none; border-radius: 5px; font-weight: bold;">{cta_text}</a>
 </div>"""
-            body_html = body_html + cta_html
-        
-        image_prompts = data.get("image_prompts") or []
-        if not isinstance(image_prompts, list):
-            image_prompts = []
-        
-        # TO-BE: 마지막 프롬프트를 썸네일 전용으로 강제 보정 (Reviewer 단계에서도 하지만 생성 시점 최적화)
-        if image_prompts:
-            last_idx = len(image_prompts) - 1
-            if "thumbnail" not in image_prompts[last_idx].lower() and "대표 이미지" not in image_prompts[last_idx].lower():
-                image_prompts[last_idx] = f"{topic} 주제의 블로그 썸네일용 대표 이미지, 클릭을 유도하는 매력적인 디자인, 고해상도, 리얼리스틱"
-        
-        html = build_html(title, meta_description, meta_keywords, body_html)
-        return {
-            "html": html,
-            "summary": summary,
-            "title": title,
-            "image_prompts": image_prompts,
-            "cta_text": cta_text,
-            "seo_title_length": len(title),
-            "meta_description_length": len(meta_description)
-        }
+        body_html = body_html + cta_html
+    
+    image_prompts = data.get("image_prompts") or []
+    if not isinstance(image_prompts, list):
+        image_prompts = []
+    
+    # TO-BE: 마지막 프롬프트를 썸네일 전용으로 강제 보정 (Reviewer 단계에서도 하지만 생성 시점 최적화)
+    if image_prompts:
+        last_idx = len(image_prompts) - 1
+        if "thumbnail" not in image_prompts[last_idx].lower() and "대표 이미지" not in image_prompts[last_idx].lower():
+            image_prompts[last_idx] = f"{topic} 주제의 블로그 썸네일용 대표 이미지, 클릭을 유도하는 매력적인 디자인, 고해상도, 리얼리스틱"
+    
+    html = _build_html_document(title, meta_description, meta_keywords, body_html)
+    return {
+        "html": html,
+        "summary": summary,
+        "title": title,
+        "image_prompts": image_prompts,
+        "cta_text": cta_text,
+        "seo_title_length": len(title),
+        "meta_description_length": len(meta_description)
+    }
+
+
+async def generate_html(
+    topic: str,
+    persona: str,
+    prompt: str | None,
+    word_count_range: tuple[int, int],
+    image_count: int,
+    keywords: list[str] | None = None,
+) -> dict:
+    """
+    압도적 SEO 최적화 엔진:
+    - 제목: 30자 내외, 특수문자 배제, 검색 의도 중심
+    - 키워드 분산: 메인 5-10회, 서브 3-5회 (연속 사용 금지)
+    - 구조: 소제목 3-6개(질문형 포함), 리스트/표 활용, 2줄마다 줄바꿈
+    - 이미지: 텍스트 삽입 금지, 이미지 하단 설명 문장 자동 생성
+    """
+    full_prompt = _build_html_prompt(
+        topic, persona, prompt, word_count_range, image_count, keywords, _JSON_OUTPUT_FORMAT
+    )
+
+    raw = await _call_prompt_cached(full_prompt, is_valid=lambda text: _try_parse_json_object(text) is not None)
+
+    data = _try_parse_json_object(raw)
+    if data:
+        return _finalize_html_data(data, topic)
 
     try:
         data2 = json.loads(raw.strip())
@@ -317,7 +587,7 @@ async def generate_html(
             image_prompts = data2.get("image_prompts") or []
             if not isinstance(image_prompts, list):
                 image_prompts = []
-            html = build_html(title, meta_description, meta_keywords, body_html)
+            html = _build_html_document(title, meta_description, meta_keywords, body_html)
             return {"html": html, "summary": summary, "title": title, "image_prompts": image_prompts}
     except Exception:
         pass
@@ -325,3 +595,169 @@ async def generate_html(
     LOGGER.warning("Gemini HTML response not JSON; returning raw text.")
     return {"html": raw, "summary": raw[:120], "title": topic, "image_prompts": []}
 
+
+
+# ---------------------------------------------------------------------------
+# 스트리밍 생성 (/posts/preview/stream)
+# ---------------------------------------------------------------------------
+# JSON 안의 body_html 문자열은 완성 전까지 파싱할 수 없으므로, 스트리밍용 프롬프트는
+# "본문 HTML 먼저 → 구분자 → 메타 JSON" 순서로 출력하게 하여 본문을 생성되는 즉시 전달합니다.
+STREAM_META_MARKER = "===META==="
+
+_STREAM_OUTPUT_FORMAT = (
+    "반드시 다음 순서로만 출력하세요 (코드펜스/설명 금지):\n"
+    "1) 상세 HTML 본문 (body 내부 태그만)\n"
+    f"2) 본문이 끝나면 새 줄에 {STREAM_META_MARKER}\n"
+    "3) 다음 JSON 한 개:\n"
+    "{\n"
+    "  \"title\": \"SEO 최적화 제목\",\n"
+    "  \"meta_description\": \"메타 설명\",\n"
+    "  \"meta_keywords\": [\"키워드1\", \"키워드2\"],\n"
+    "  \"image_prompts\": [\"텍스트가 배제된 실사 스타일 프롬프트1\", ..., \"썸네일 프롬프트\"],\n"
+    "  \"summary\": \"요약\",\n"
+    "  \"cta_text\": \"행동 유도 문구\"\n"
+    "}\n\n"
+)
+
+
+async def _generate_stream(prompt: str) -> AsyncIterator[Any]:
+    """SDK 스트리밍 응답 청크를 yield합니다. 스트리밍 API가 없으면 전체 응답 1개를 yield."""
+    if _client is not None:
+        aio = getattr(_client, "aio", None)
+        if aio is not None and hasattr(aio.models, "generate_content_stream"):
+            stream = await aio.models.generate_content_stream(model=GENAI_MODEL, contents=prompt)
+            async for chunk in stream:
+                yield chunk
+            return
+        yield await _generate_async(prompt)
+        return
+
+    model = _legacy_genai.GenerativeModel(GENAI_MODEL)  # type: ignore[union-attr]
+    generate_async = getattr(model, "generate_content_async", None)
+    if generate_async is not None:
+        response = await generate_async(prompt, stream=True)
+        async for chunk in response:
+            yield chunk
+        return
+    yield await asyncio.to_thread(model.generate_content, prompt)
+
+
+async def stream_prompt(prompt: str) -> AsyncIterator[str]:
+    """
+    텍스트 청크를 생성되는 대로 yield합니다 (리미터/재시도 정책 동일 적용).
+    첫 청크를 보내기 전 실패만 재시도하며, 일부를 이미 보낸 뒤의 실패는 그대로 전파합니다.
+    """
+    _require_gemini()
+    gemini_metrics.calls += 1
+    attempt = 0
+    while True:
+        emitted = False
+        try:
+            async with gemini_limiter.reserve(_estimate_tokens(prompt)) as reservation:
+                async for chunk in _generate_stream(prompt):
+                    usage = _usage_tokens(chunk)
+                    if usage is not None:
+                        reservation["actual_tokens"] = usage
+                    text = getattr(chunk, "text", None)
+                    if isinstance(text, str) and text:
+                        emitted = True
+                        yield text
+            gemini_metrics.successes += 1
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            error_class = classify_error(exc)
+            gemini_metrics.errors_by_class[error_class] += 1
+            if emitted or error_class not in RETRYABLE_ERROR_CLASSES or attempt >= GEMINI_MAX_RETRIES:
+                gemini_metrics.failures += 1
+                raise
+            delay = _backoff_delay(attempt, retry_after_hint(exc))
+            attempt += 1
+            gemini_metrics.retries += 1
+            gemini_metrics.retries_by_class[error_class] += 1
+            gemini_metrics.retry_wait_seconds += delay
+            LOGGER.warning(
+                "Gemini stream %s (%s); retry %s/%s in %.1fs",
+                error_class, exc, attempt, GEMINI_MAX_RETRIES, delay,
+            )
+            await asyncio.sleep(delay)
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+def _parse_stream_output(raw: str, topic: str) -> dict | None:
+    body, marker, meta_raw = raw.partition(STREAM_META_MARKER)
+    if not marker:
+        # 모델이 형식을 무시하고 JSON 하나로 답한 경우
+        data = _try_parse_json_object(raw)
+        return _finalize_html_data(data, topic) if data and data.get("body_html") else None
+    data = _try_parse_json_object(meta_raw) or {}
+    data["body_html"] = _strip_code_fence(body)
+    return _finalize_html_data(data, topic)
+
+
+async def generate_html_stream(
+    topic: str,
+    persona: str,
+    prompt: str | None,
+    word_count_range: tuple[int, int],
+    image_count: int,
+    keywords: list[str] | None = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    generate_html의 스트리밍 버전.
+    - ("delta", str): 본문 HTML 조각 (생성되는 즉시)
+    - ("result", dict): 마지막에 1회, generate_html과 같은 형태의 결과
+    """
+    full_prompt = _build_html_prompt(
+        topic, persona, prompt, word_count_range, image_count, keywords,
+        _STREAM_OUTPUT_FORMAT, output_name="지정된 형식",
+    )
+    key = make_cache_key(GENAI_MODEL, full_prompt)
+    cached = await llm_cache.get(key)
+
+    parts: list[str] = []
+    pending = ""
+    in_meta = False
+    hold = len(STREAM_META_MARKER) - 1  # 청크 경계에 걸친 구분자를 본문으로 내보내지 않도록 보류
+
+    async def chunks() -> AsyncIterator[str]:
+        if cached is not None:
+            yield cached
+            return
+        async for text in stream_prompt(full_prompt):
+            yield text
+
+    async for text in chunks():
+        parts.append(text)
+        if in_meta:
+            continue
+        pending += text
+        idx = pending.find(STREAM_META_MARKER)
+        if idx != -1:
+            in_meta = True
+            if pending[:idx]:
+                yield "delta", pending[:idx]
+            pending = ""
+        elif len(pending) > hold:
+            yield "delta", pending[:-hold]
+            pending = pending[-hold:]
+    if pending and not in_meta:
+        yield "delta", pending
+
+    raw = "".join(parts)
+    result = _parse_stream_output(raw, topic)
+    if result is None:
+        LOGGER.warning("Gemini streamed HTML missing meta section; returning raw text.")
+        result = {"html": raw, "summary": raw[:120], "title": topic, "image_prompts": []}
+    elif cached is None:
+        await llm_cache.set(key, raw)
+    yield "result", result
@@ -1,125 +1,551 @@
 """
 이미지 생성 Queue 처리 서비스
 
-TO-BE 요구사항:
-- 이미지 생성 요청을 Queue에 등록
-- 백그라운드 Worker가 순차적으로 처리
-- 프론트엔드에서 Queue 상태 폴링
+AS-IS: 메모리 큐(generation_queue), 수동 트리거(/queue/process) 전용 ImageQueue 테이블,
+       FastAPI BackgroundTasks 세 가지가 혼재 → 프로세스가 재시작되면 진행 중/대기 작업이 유실.
+TO-BE: ImageQueue 테이블 하나를 내구성 큐로 사용합니다.
+- 이미지 생성 요청을 Queue에 등록 (/preview, 자동 포스팅)
+- 원자적 점유(claim): 조건부 UPDATE로 한 워커만 작업을 가져가고, lease + heartbeat로 소유권 유지
+- 워커가 죽어 하트비트가 끊기면 lease 만료 후 다른 워커가 재점유 (시도 횟수에 포함, 소진되면 FAILED)
+- 실패 시 지수 백오프 + 지터로 재시도, max_attempts 초과 시 FAILED
+- 서버 startup에서 워커 루프를 띄워 큐를 계속 비움 (scripts/run_image_worker.py로 별도 실행도 가능)
+- 작업(그룹)마다 자체 세션을 사용하고, 점유/완료 상태 전이는 배치 단위 한 트랜잭션으로 기록
+- IMAGE_QUEUE_CONCURRENCY(기본: ComfyUI 백엔드 풀 총 슬롯 수)만큼 병렬 실행
+- 프론트엔드는 기존처럼 Post.img_gen_status / image_paths 또는 Queue 상태를 조회
 """
 
 import asyncio
 import logging
-from datetime import datetime
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from app.models.sql_models import ImageQueue, Post
-from app.services.image_service import generate_image_sync, save_image_bytes, WORKFLOW_PATH
+from app.core.database import SessionLocal
+from app.models.sql_models import Blog, ImageQueue, Post
+from app.services.comfy_pool import comfy_pool
+from app.services.post_events import post_event_bus
+from app.services.image_service import (
+    COMFYUI_BATCH_MODE,
+    WORKFLOW_PATH,
+    generate_image_sync,
+    generate_images_batch,
+    save_image_bytes,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+IMAGE_QUEUE_LEASE_SECONDS = float(os.getenv("IMAGE_QUEUE_LEASE_SECONDS", "300"))
+IMAGE_QUEUE_HEARTBEAT_SECONDS = float(os.getenv("IMAGE_QUEUE_HEARTBEAT_SECONDS", "30"))
+IMAGE_QUEUE_MAX_ATTEMPTS = int(os.getenv("IMAGE_QUEUE_MAX_ATTEMPTS", "3"))
+IMAGE_QUEUE_RETRY_BASE_SECONDS = float(os.getenv("IMAGE_QUEUE_RETRY_BASE_SECONDS", "10"))
+IMAGE_QUEUE_RETRY_MAX_SECONDS = float(os.getenv("IMAGE_QUEUE_RETRY_MAX_SECONDS", "600"))
+IMAGE_QUEUE_POLL_SECONDS = float(os.getenv("IMAGE_QUEUE_POLL_SECONDS", "2"))
+# 동시에 처리할 작업(배치 모드면 포스트) 수. 백엔드 슬롯보다 많으면 풀 acquire에서 대기할 뿐이므로 기본값은 총 슬롯 수
+IMAGE_QUEUE_CONCURRENCY = int(os.getenv("IMAGE_QUEUE_CONCURRENCY", "0")) or comfy_pool.total_capacity
+IMAGE_QUEUE_WORKER_ENABLED = os.getenv("IMAGE_QUEUE_WORKER_ENABLED", "true").lower() in ("1", "true", "yes")
+# 포스트 이미지 완료 대기: 이벤트가 오지 않을 때(워커가 다른 프로세스) DB를 다시 확인하는 주기
+IMAGE_COMPLETION_RECONCILE_SECONDS = float(os.getenv("IMAGE_COMPLETION_RECONCILE_SECONDS", "10"))
 
-def enqueue_image_generation(db: Session, post_id: int, prompts: list[str]) -> list[int]:
-    """
-    이미지 생성 요청을 Queue에 등록
-    
-    Args:
-        db: DB 세션
-        post_id: 포스트 ID
-        prompts: 이미지 프롬프트 리스트
-    
-    Returns:
-        list[int]: 생성된 Queue ID 리스트
-    """
+# SDXL 프롬프트에 텍스트 배제 지시어 추가
+PROMPT_SUFFIX = ", no text, no letters, high quality photography"
+
+
+def _default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _claim_token(worker_id: str) -> str:
+    """점유 배치마다 고유한 소유자 값 (locked_by). 어떤 행이 이번 UPDATE로 점유되었는지 식별합니다."""
+    return f"{worker_id}:{uuid.uuid4().hex[:8]}"
+
+
+def _add_image_jobs(db: Session, post_id: int, prompts: list[str], filenames: list[str] | None) -> list[int]:
     queue_ids = []
     for idx, prompt in enumerate(prompts):
         queue_entry = ImageQueue(
             post_id=post_id,
             prompt=prompt,
-            status="PENDING"
+            status="PENDING",
+            image_index=idx + 1,
+            filename=filenames[idx] if filenames and idx < len(filenames) else None,
+            attempts=0,
+            max_attempts=IMAGE_QUEUE_MAX_ATTEMPTS,
         )
         db.add(queue_entry)
         db.flush()
         queue_ids.append(queue_entry.id)
-    
+    return queue_ids
+
+
+def enqueue_image_generation(
+    db: Session, post_id: int, prompts: list[str], filenames: list[str] | None = None
+) -> list[int]:
+    """
+    이미지 생성 요청을 Queue에 등록
+
+    Args:
+        db: DB 세션
+        post_id: 포스트 ID
+        prompts: 이미지 프롬프트 리스트 (인덱스 순서 = 본문 이미지 순서)
+        filenames: 저장할 파일명 리스트 (SEO 파일명, 선택)
+
+    Returns:
+        list[int]: 생성된 Queue ID 리스트
+    """
+    queue_ids = _add_image_jobs(db, post_id, prompts, filenames)
     db.commit()
     LOGGER.info(f"Post {post_id}에 {len(prompts)}개 이미지 생성 요청 등록")
+    image_queue_worker.notify()
     return queue_ids
 
 
-async def process_image_queue(db: Session, queue_id: int):
+def enqueue_image_batch(
+    db: Session, items: list[tuple[int, list[str], list[str] | None]]
+) -> dict[int, list[int]]:
     """
-    Queue에서 이미지 생성 처리
-    
+    여러 포스트의 이미지 요청을 한 트랜잭션으로 등록 (스케줄러 fan-out용)
+
     Args:
-        db: DB 세션
-        queue_id: Queue ID
-    """
-    queue_entry = db.query(ImageQueue).filter(ImageQueue.id == queue_id).first()
-    if not queue_entry or queue_entry.status != "PENDING":
-        return
-    
-    # 상태 업데이트: PROCESSING
-    queue_entry.status = "PROCESSING"
+        items: (post_id, prompts, filenames) 리스트
+
+    Returns:
+        dict[int, list[int]]: post_id별 Queue ID 리스트
+    """
+    queue_ids = {post_id: _add_image_jobs(db, post_id, prompts, filenames) for post_id, prompts, filenames in items}
+    db.commit()
+    LOGGER.info(f"{len(items)}개 포스트에 {sum(len(ids) for ids in queue_ids.values())}개 이미지 생성 요청 등록")
+    image_queue_worker.notify()
+    return queue_ids
+
+
+def _lease_expired(now: datetime):
+    return and_(
+        ImageQueue.status == "PROCESSING",
+        or_(ImageQueue.lease_expires_at.is_(None), ImageQueue.lease_expires_at < now),
+    )
+
+
+def _claimable(now: datetime):
+    """
+    대기 중(백오프 경과)이거나, 처리 중이지만 lease가 만료된(워커 사망) 작업.
+    lease 만료 재점유도 시도 횟수에 포함되므로, 워커를 죽이는 작업(OOM/ComfyUI 크래시)이 무한히 재점유되지 않도록
+    max_attempts 미만인 것만 대상으로 함 (소진된 것은 fail_exhausted_jobs가 FAILED 처리).
+    """
+    return or_(
+        and_(
+            ImageQueue.status == "PENDING",
+            or_(ImageQueue.next_attempt_at.is_(None), ImageQueue.next_attempt_at <= now),
+        ),
+        and_(_lease_expired(now), ImageQueue.attempts < ImageQueue.max_attempts),
+    )
+
+
+def fail_exhausted_jobs(db: Session, worker_id: str) -> int:
+    """
+    lease가 만료됐고 재시도도 소진된 작업을 FAILED로 확정하고 포스트 상태/이벤트를 갱신합니다.
+    조건부 UPDATE + 토큰으로 여러 워커가 동시에 실행해도 한 번만 처리됩니다. 반환값: FAILED로 바꾼 작업 수.
+    """
+    now = datetime.now()
+    token = _claim_token(worker_id)
+    db.query(ImageQueue).filter(_lease_expired(now), ImageQueue.attempts >= ImageQueue.max_attempts).update(
+        {
+            ImageQueue.status: "FAILED",
+            ImageQueue.locked_by: token,
+            ImageQueue.lease_expires_at: None,
+            ImageQueue.completed_at: now,
+        },
+        synchronize_session=False,
+    )
+    entries = db.query(ImageQueue).filter(ImageQueue.locked_by == token).all()
+    if not entries:
+        db.rollback()
+        return 0
+
+    post_ids: set[int] = set()
+    events: list[dict] = []
+    for entry in entries:
+        entry.locked_by = None
+        entry.error_message = f"Lease expired: worker lost after {entry.attempts} attempt(s)"
+        LOGGER.error(f"Queue {entry.id} 이미지 생성 최종 실패 (lease 만료, {entry.attempts}/{entry.max_attempts})")
+        if entry.post_id is not None:
+            post_ids.add(entry.post_id)
+            events.append({
+                "event": "image",
+                "post_id": entry.post_id,
+                "index": entry.image_index,
+                "status": "FAILED",
+                "url": None,
+                "error": entry.error_message,
+                "timeout": False,
+            })
+    db.commit()
+    _publish_job_events(db, events, post_ids)
+    return len(entries)
+
+
+def claim_jobs(db: Session, worker_id: str, limit: int) -> list[list[dict]]:
+    """
+    점유 가능한 작업을 최대 limit 그룹만큼 한 트랜잭션으로 점유합니다.
+    - 조건부 UPDATE(... WHERE id IN (...) AND 점유 가능) 한 번으로 점유하고, 이번 점유 토큰으로 결과를 다시 읽음
+      → 여러 워커가 같은 후보를 골라도 각 행은 한 워커에게만 점유됨
+    - COMFYUI_BATCH_MODE면 같은 포스트의 점유 가능 작업을 한 그룹으로 묶어 한 번에 생성
+
+    Returns:
+        list[list[dict]]: 그룹별 작업 스냅샷 ({"id", "post_id", "prompt", "filename", "token"}), 세션과 분리됨
+    """
+    if limit <= 0:
+        return []
+    fail_exhausted_jobs(db, worker_id)
+    now = datetime.now()
+    candidates = (
+        db.query(ImageQueue.id, ImageQueue.post_id)
+        .filter(_claimable(now))
+        .order_by(ImageQueue.created_at.asc(), ImageQueue.id.asc())
+        .limit(limit * 10 if COMFYUI_BATCH_MODE else limit)
+        .all()
+    )
+    if not candidates:
+        return []
+
+    if COMFYUI_BATCH_MODE:
+        post_ids: list[int] = []
+        single_ids: list[int] = []
+        for queue_id, post_id in candidates:
+            if len(post_ids) + len(single_ids) >= limit:
+                break
+            if post_id is None:
+                single_ids.append(queue_id)
+            elif post_id not in post_ids:
+                post_ids.append(post_id)
+        target = or_(
+            ImageQueue.id.in_(single_ids),
+            ImageQueue.post_id.in_(post_ids),
+        )
+    else:
+        target = ImageQueue.id.in_([queue_id for queue_id, _ in candidates])
+
+    token = _claim_token(worker_id)
+    db.query(ImageQueue).filter(target, _claimable(now)).update(
+        {
+            ImageQueue.status: "PROCESSING",
+            ImageQueue.locked_by: token,
+            ImageQueue.lease_expires_at: now + timedelta(seconds=IMAGE_QUEUE_LEASE_SECONDS),
+            ImageQueue.heartbeat_at: now,
+            ImageQueue.attempts: ImageQueue.attempts + 1,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+    claimed = (
+        db.query(ImageQueue)
+        .filter(ImageQueue.locked_by == token)
+        .order_by(ImageQueue.post_id.asc(), ImageQueue.image_index.asc(), ImageQueue.id.asc())
+        .all()
+    )
+    groups: dict[object, list[dict]] = {}
+    for entry in claimed:
+        key = entry.post_id if COMFYUI_BATCH_MODE and entry.post_id is not None else ("job", entry.id)
+        groups.setdefault(key, []).append(
+            {
+                "id": entry.id,
+                "post_id": entry.post_id,
+                "prompt": entry.prompt,
+                "filename": entry.filename,
+                "token": token,
+            }
+        )
+    return list(groups.values())
+
+
+def heartbeat_jobs(db: Session, queue_ids: list[int], token: str) -> int:
+    """처리 중인 작업의 lease를 연장합니다. 반환값: 여전히 소유 중인 작업 수."""
+    now = datetime.now()
+    updated = db.query(ImageQueue).filter(
+        ImageQueue.id.in_(queue_ids),
+        ImageQueue.status == "PROCESSING",
+        ImageQueue.locked_by == token,
+    ).update(
+        {
+            ImageQueue.heartbeat_at: now,
+            ImageQueue.lease_expires_at: now + timedelta(seconds=IMAGE_QUEUE_LEASE_SECONDS),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return updated
+
+
+def _retry_delay(attempts: int) -> float:
+    delay = min(IMAGE_QUEUE_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), IMAGE_QUEUE_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def sync_post_image_status(db: Session, post_id: int) -> str | None:
+    """
+    Queue 상태를 Post.image_paths / img_gen_status에 반영합니다.
+    - image_paths: 완료된 이미지를 image_index 순서로
+    - 모두 완료 → COMPLETED, 재시도 소진된 실패가 있고 남은 작업이 없으면 FAILED/TIMEOUT
+
+    Returns:
+        str | None: 갱신된 img_gen_status (포스트가 없으면 None)
+    """
+    post = db.query(Post).filter(Post.id == post_id).first()
+    if not post:
+        return None
+    jobs = (
+        db.query(ImageQueue)
+        .filter(ImageQueue.post_id == post_id)
+        .order_by(ImageQueue.image_index.asc(), ImageQueue.id.asc())
+        .all()
+    )
+    paths = [j.image_url for j in jobs if j.status == "COMPLETED" and j.image_url]
+    post.image_paths = paths
+    in_flight = any(j.status in ("PENDING", "PROCESSING") for j in jobs)
+    failed = [j for j in jobs if j.status == "FAILED"]
+    if len(paths) >= post.expected_image_count and not in_flight:
+        post.img_gen_status = "COMPLETED"
+    elif failed and not in_flight:
+        timed_out = any(_is_timeout(j.error_message) for j in failed)
+        post.img_gen_status = "TIMEOUT" if timed_out else "FAILED"
+    else:
+        post.img_gen_status = "PROCESSING"
     db.commit()
-    
+    return post.img_gen_status
+
+
+def _is_timeout(error_message: str | None) -> bool:
+    return "timeout" in (error_message or "").lower()
+
+
+def finalize_jobs(
+    db: Session, token: str, results: dict[int, str], errors: dict[int, BaseException]
+) -> None:
+    """
+    그룹의 완료/실패 상태 전이를 한 트랜잭션으로 기록하고, 관련 포스트 상태를 한 번씩 갱신합니다.
+    lease가 만료되어 다른 워커가 가져간 작업(locked_by 불일치)의 결과는 덮어쓰지 않습니다.
+    """
+    queue_ids = list(results) + list(errors)
+    entries = (
+        db.query(ImageQueue)
+        .filter(ImageQueue.id.in_(queue_ids), ImageQueue.locked_by == token)
+        .all()
+    )
+    owned = {entry.id for entry in entries}
+    for queue_id in set(queue_ids) - owned:
+        LOGGER.warning(f"Queue {queue_id} 소유권 상실, 결과 무시")
+
+    now = datetime.now()
+    post_ids: set[int] = set()
+    events: list[dict] = []
+    for entry in entries:
+        entry.locked_by = None
+        entry.lease_expires_at = None
+        if entry.id in results:
+            entry.status = "COMPLETED"
+            entry.image_url = results[entry.id]
+            entry.error_message = None
+            entry.completed_at = now
+            LOGGER.info(f"Queue {entry.id} 이미지 생성 완료: {entry.image_url}")
+        else:
+            exc = errors[entry.id]
+            entry.error_message = f"{type(exc).__name__}: {exc}"
+            if entry.attempts < (entry.max_attempts or IMAGE_QUEUE_MAX_ATTEMPTS):
+                delay = _retry_delay(entry.attempts)
+                entry.status = "PENDING"
+                entry.next_attempt_at = now + timedelta(seconds=delay)
+                LOGGER.warning(
+                    f"Queue {entry.id} 이미지 생성 실패 ({entry.attempts}/{entry.max_attempts}), "
+                    f"{delay:.0f}초 후 재시도: {exc}"
+                )
+            else:
+                entry.status = "FAILED"
+                entry.completed_at = now
+                LOGGER.error(f"Queue {entry.id} 이미지 생성 최종 실패: {exc}")
+        if entry.post_id is not None:
+            post_ids.add(entry.post_id)
+            events.append({
+                "event": "image",
+                "post_id": entry.post_id,
+                "index": entry.image_index,
+                "status": "RETRYING" if entry.status == "PENDING" else entry.status,
+                "url": entry.image_url if entry.status == "COMPLETED" else None,
+                "error": entry.error_message if entry.status != "COMPLETED" else None,
+                "timeout": entry.status != "COMPLETED" and _is_timeout(entry.error_message),
+            })
+    db.commit()
+    _publish_job_events(db, events, post_ids)
+
+
+def _publish_job_events(db: Session, events: list[dict], post_ids: set[int]) -> None:
+    """작업별 image 이벤트를 보내고, 관련 포스트 상태를 한 번씩 갱신해 post_status 이벤트를 보냅니다."""
+    owners = dict(
+        db.query(Post.id, Blog.owner_id).join(Blog, Post.blog_id == Blog.id).filter(Post.id.in_(post_ids)).all()
+    ) if post_ids else {}
+    for event in events:
+        post_event_bus.publish({**event, "user_id": owners.get(event["post_id"])})
+    for post_id in post_ids:
+        img_gen_status = sync_post_image_status(db, post_id)
+        if img_gen_status is not None:
+            post_event_bus.publish({
+                "event": "post_status",
+                "post_id": post_id,
+                "user_id": owners.get(post_id),
+                "img_gen_status": img_gen_status,
+            })
+
+
+def _heartbeat_sync(queue_ids: list[int], token: str) -> None:
+    db = SessionLocal()
+    try:
+        heartbeat_jobs(db, queue_ids, token)
+    except Exception as exc:
+        LOGGER.warning(f"Queue heartbeat 실패 {queue_ids}: {exc}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _finalize_sync(token: str, results: dict[int, str], errors: dict[int, BaseException]) -> None:
+    db = SessionLocal()
+    try:
+        finalize_jobs(db, token, results, errors)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _heartbeat_loop(queue_ids: list[int], token: str) -> None:
+    while True:
+        await asyncio.sleep(IMAGE_QUEUE_HEARTBEAT_SECONDS)
+        await asyncio.to_thread(_heartbeat_sync, queue_ids, token)
+
+
+def _output_filename(job: dict) -> str:
+    return job["filename"] or f"queue_{job['id']}_{int(datetime.now().timestamp())}.png"
+
+
+async def process_claimed_jobs(jobs: list[dict]) -> None:
+    """
+    점유한 작업 그룹을 생성합니다 (jobs는 claim_jobs가 반환한 그룹 하나).
+    여러 건이면(배치 모드) 하나의 ComfyUI 작업으로 생성하고, 실패 시 각 작업을 개별 재시도 대상으로 돌립니다.
+    결과 기록은 그룹 전용 세션으로, 이벤트 루프를 막지 않도록 스레드에서 수행합니다.
+    """
+    token = jobs[0]["token"]
+    heartbeat = asyncio.create_task(_heartbeat_loop([j["id"] for j in jobs], token))
+    results: dict[int, str] = {}
+    errors: dict[int, BaseException] = {}
+    try:
+        prompts = [f"{j['prompt']}{PROMPT_SUFFIX}" for j in jobs]
+        if len(jobs) > 1:
+            try:
+                images = await generate_images_batch(WORKFLOW_PATH, prompts)
+                for job, image_bytes in zip(jobs, images):
+                    results[job["id"]] = save_image_bytes(_output_filename(job), image_bytes)
+            except Exception as exc:
+                LOGGER.exception(f"배치 이미지 생성 실패 {[j['id'] for j in jobs]}: {exc}")
+                errors.update({j["id"]: exc for j in jobs})
+        else:
+            job = jobs[0]
+            try:
+                image_bytes = await generate_image_sync(WORKFLOW_PATH, prompts[0])
+                results[job["id"]] = save_image_bytes(_output_filename(job), image_bytes)
+            except Exception as exc:
+                LOGGER.exception(f"Queue {job['id']} 이미지 생성 오류: {exc}")
+                errors[job["id"]] = exc
+    finally:
+        heartbeat.cancel()
+
+    await asyncio.to_thread(_finalize_sync, token, results, errors)
+
+
+_TERMINAL_IMG_STATUSES = ("COMPLETED", "FAILED", "TIMEOUT")
+
+
+def _read_img_gen_status(post_id: int) -> str | None:
+    db = SessionLocal()
     try:
-        # 이미지 생성
-        image_bytes = await generate_image_sync(WORKFLOW_PATH, queue_entry.prompt)
-        filename = f"queue_{queue_id}_{int(datetime.now().timestamp())}.png"
-        image_url = save_image_bytes(filename, image_bytes)
-        
-        # 상태 업데이트: COMPLETED
-        queue_entry.status = "COMPLETED"
-        queue_entry.image_url = image_url
-        queue_entry.completed_at = datetime.now()
-        
-        # Post에 이미지 URL 추가
-        post = db.query(Post).filter(Post.id == queue_entry.post_id).first()
-        if post:
-            image_paths = post.image_paths or []
-            if image_url not in image_paths:
-                image_paths.append(image_url)
-                post.image_paths = image_paths
-        
-        db.commit()
-        LOGGER.info(f"Queue {queue_id} 이미지 생성 완료: {image_url}")
-        
-    except Exception as e:
-        # 상태 업데이트: FAILED
-        queue_entry.status = "FAILED"
-        queue_entry.error_message = str(e)
-        db.commit()
-        LOGGER.error(f"Queue {queue_id} 이미지 생성 실패: {e}")
+        row = db.query(Post.img_gen_status).filter(Post.id == post_id).first()
+        return row.img_gen_status if row else None
+    finally:
+        db.close()
+
+
+async def wait_for_post_images(
+    post_id: int,
+    timeout: float,
+    reconcile_seconds: float = IMAGE_COMPLETION_RECONCILE_SECONDS,
+) -> str | None:
+    """
+    포스트의 이미지가 모두 끝날 때까지 대기합니다.
+
+    AS-IS: db.refresh(post) + asyncio.sleep(10)을 최대 30회 반복 → 마지막 이미지가 끝나고도 최대 10초 대기.
+    TO-BE: 워커가 발행하는 post_status 이벤트를 구독해 종료 상태가 되는 즉시 반환합니다.
+           다른 프로세스의 워커가 처리한 경우를 위해 reconcile_seconds마다 해당 포스트 상태만 조회합니다.
+
+    Returns:
+        str | None: COMPLETED / FAILED / TIMEOUT, 시간 초과나 포스트 없음이면 None
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    # 구독을 먼저 걸고 현재 상태를 확인해야 그 사이에 끝난 이벤트를 놓치지 않음
+    with post_event_bus.subscribe(post_id=post_id) as subscription:
+        status = await asyncio.to_thread(_read_img_gen_status, post_id)
+        while status not in _TERMINAL_IMG_STATUSES:
+            if status is None:
+                return None
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            event = await subscription.get(timeout=min(remaining, reconcile_seconds))
+            if event is None:
+                status = await asyncio.to_thread(_read_img_gen_status, post_id)
+            elif event.get("event") == "post_status":
+                status = event.get("img_gen_status")
+        return status
 
 
 def get_queue_status(db: Session, post_id: int) -> dict:
     """
     포스트의 이미지 생성 Queue 상태 조회
-    
+
     Args:
         db: DB 세션
         post_id: 포스트 ID
-    
+
     Returns:
         dict: Queue 상태 정보
     """
-    queues = db.query(ImageQueue).filter(ImageQueue.post_id == post_id).all()
-    
+    queues = (
+        db.query(ImageQueue)
+        .filter(ImageQueue.post_id == post_id)
+        .order_by(ImageQueue.image_index.asc(), ImageQueue.id.asc())
+        .all()
+    )
+
     total = len(queues)
     pending = sum(1 for q in queues if q.status == "PENDING")
     processing = sum(1 for q in queues if q.status == "PROCESSING")
     completed = sum(1 for q in queues if q.status == "COMPLETED")
     failed = sum(1 for q in queues if q.status == "FAILED")
-    
+
     images = [
         {
             "id": q.id,
+            "index": q.image_index,
             "status": q.status,
             "url": q.image_url,
-            "error": q.error_message
+            "error": q.error_message,
+            "attempts": q.attempts,
         }
         for q in queues
     ]
-    
+
     return {
         "total": total,
         "pending": pending,
@@ -130,22 +556,141 @@ def get_queue_status(db: Session, post_id: int) -> dict:
     }
 
 
-async def process_all_pending_queues(db: Session, max_concurrent: int = 3):
+async def process_all_pending_queues(max_concurrent: int | None = None):
     """
-    모든 PENDING 상태의 Queue를 처리 (백그라운드 Worker용)
-    
+    점유 가능한 Queue를 모두 처리할 때까지 실행 (수동 트리거 /queue/process, 백로그 정리용)
+
+    AS-IS: 요청 세션 하나를 여러 코루틴이 공유 (응답 후 닫힌 세션을 백그라운드 태스크가 사용)
+    TO-BE: 점유/기록마다 자체 세션을 열고, max_concurrent 그룹을 병렬로 실행
+
     Args:
-        db: DB 세션
-        max_concurrent: 동시 처리 개수
-    """
-    pending_queues = db.query(ImageQueue).filter(
-        ImageQueue.status == "PENDING"
-    ).limit(max_concurrent).all()
-    
-    if not pending_queues:
-        return
-    
-    LOGGER.info(f"{len(pending_queues)}개 이미지 생성 Queue 처리 시작")
-    
-    tasks = [process_image_queue(db, q.id) for q in pending_queues]
-    await asyncio.gather(*tasks, return_exceptions=True)
+        max_concurrent: 동시 처리 개수 (기본 IMAGE_QUEUE_CONCURRENCY)
+    """
+    worker = ImageQueueWorker(concurrency=max_concurrent)
+    processed = await worker.drain()
+    if processed:
+        LOGGER.info(f"{processed}개 이미지 생성 Queue 그룹 처리 완료")
+
+
+class ImageQueueWorker:
+    """
+    ImageQueue를 계속 비우는 장기 실행 워커.
+    - concurrency 그룹까지 병렬 실행하고, 슬롯이 비면 즉시 다음 작업을 점유
+    - 같은 프로세스에서 enqueue하면 notify()로 즉시 깨어나고, 그 외에는 IMAGE_QUEUE_POLL_SECONDS 간격으로 확인
+    - 여러 프로세스/서버에서 동시에 실행해도 조건부 UPDATE 점유로 중복 처리되지 않음
+    """
+
+    def __init__(self, worker_id: str | None = None, concurrency: int | None = None):
+        self.worker_id = worker_id or _default_worker_id()
+        self.concurrency = max(concurrency or IMAGE_QUEUE_CONCURRENCY, 1)
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._active: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def notify(self) -> None:
+        if self._wakeup is None or self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio.run()이 다시 호출된 경우 이전 루프의 태스크/이벤트는 사용할 수 없음
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._active = set()
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._bind_loop()
+        self._task = loop.create_task(self._run())
+        LOGGER.info(f"Image queue worker started ({self.worker_id}, concurrency={self.concurrency})")
+
+    def ensure_running(self) -> None:
+        """cron/스크립트처럼 startup 훅이 없는 프로세스에서 현재 루프에 워커를 띄웁니다."""
+        if IMAGE_QUEUE_WORKER_ENABLED:
+            self.start()
+
+    async def stop(self) -> None:
+        # 진행 중 작업을 취소해도 lease가 만료되면 다른 워커(또는 재시작 후)가 다시 점유
+        tasks = [t for t in (self._task, *self._active) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._active = set()
+
+    def _claim(self, limit: int) -> list[list[dict]]:
+        db = SessionLocal()
+        try:
+            return claim_jobs(db, self.worker_id, limit)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._active.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            LOGGER.error(f"Image queue job failed: {task.exception()}")
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _fill(self) -> int:
+        """빈 슬롯만큼 점유해 실행을 시작합니다. 반환값: 시작한 그룹 수."""
+        free = self.concurrency - len(self._active)
+        if free <= 0:
+            return 0
+        # 점유 쿼리(동기 세션)는 스레드에서 실행해 이벤트 루프를 막지 않음
+        groups = await asyncio.to_thread(self._claim, free)
+        for jobs in groups:
+            task = asyncio.create_task(process_claimed_jobs(jobs))
+            self._active.add(task)
+            task.add_done_callback(self._on_done)
+        return len(groups)
+
+    async def drain(self) -> int:
+        """점유 가능한 작업이 없고 실행 중인 작업도 끝날 때까지 처리합니다. 반환값: 처리한 그룹 수."""
+        self._bind_loop()
+        processed = 0
+        while True:
+            self._wakeup.clear()
+            started = await self._fill()
+            processed += started
+            if not self._active:
+                return processed
+            if not started:
+                await self._wakeup.wait()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                if await self._fill():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                LOGGER.exception(f"Image queue worker error: {exc}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=IMAGE_QUEUE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+image_queue_worker = ImageQueueWorker()
@@ -8,13 +8,25 @@ from typing import Any
 import httpx
 from fastapi import BackgroundTasks
 
+from app.core.http_client import get_client
+from app.services.comfy_pool import COMFYUI_API_URL, comfy_pool
+from app.services.comfy_workflow import get_workflow_template
+from app.services.comfy_ws import ComfyProgressListener, first_image
+
 LOGGER = logging.getLogger("image_service")
 
-COMFYUI_API_URL = os.getenv("COMFYUI_API_URL", "http://127.0.0.1:8188")
 COMFYUI_TIMEOUT_SECONDS = float(os.getenv("COMFYUI_TIMEOUT_SECONDS", "300")) # 대기열 고려 타임아웃 연장
+# WebSocket 완료 알림을 쓰는 동안 history를 확인하는 보조 주기 (메시지 유실 대비)
+COMFYUI_WS_FALLBACK_POLL_SECONDS = float(os.getenv("COMFYUI_WS_FALLBACK_POLL_SECONDS", "5"))
+# 이미지 크기 기본값 (미설정 시 워크플로우 파일의 EmptyLatentImage 값 사용)
+COMFYUI_IMAGE_WIDTH = int(os.getenv("COMFYUI_IMAGE_WIDTH", "0")) or None
+COMFYUI_IMAGE_HEIGHT = int(os.getenv("COMFYUI_IMAGE_HEIGHT", "0")) or None
+
+# 포스트의 이미지 여러 장을 하나의 멀티 브랜치 워크플로우로 제출 (체크포인트를 한 번만 로드)
+COMFYUI_BATCH_MODE = os.getenv("COMFYUI_BATCH_MODE", "false").lower() in ("1", "true", "yes")
 
-# [전역 대기열 로직] 하나의 컴퓨터에서 순차적으로 생성하도록 세마포어 설정 (1개씩)
-_GEN_SEMAPHORE = asyncio.Semaphore(1)
+# [전역 대기열 로직] AS-IS: Semaphore(1)로 프로세스 전체 직렬화
+# TO-BE: comfy_pool이 백엔드별 동시 처리 한도로 대기열 역할을 대신합니다. (COMFYUI_API_URLS 참고)
 
 
 def resolve_workflow_path() -> str:
@@ -89,114 +101,231 @@ def save_image_bytes(filename: str, image_bytes: bytes) -> str:
 
 
 def load_workflow(workflow_path: str) -> dict:
-    """JSON 워크플로우를 로드해서 필요한 prompt 설정을 업데이트합니다."""
+    """
+    JSON 워크플로우를 디스크에서 그대로 로드합니다.
+    (이미지 생성 경로는 comfy_workflow.get_workflow_template 캐시를 사용)
+    """
     with open(workflow_path, encoding="utf-8") as fp:
         workflow = json.load(fp)
     return workflow
 
 
-def _inject_prompt(workflow: dict, prompt: str) -> dict:
-    """
-    기본 워크플로우의 텍스트 입력 노드(CLIPTextEncode)에 prompt를 주입합니다.
-    - AS-IS: 노드 id "3" 고정 → 워크플로우가 바뀌면 주입이 실패하거나 무시될 수 있음
-    - TO-BE: "3"이 있으면 우선 사용, 없으면 첫 CLIPTextEncode를 찾아 주입
-    """
-    wf = json.loads(json.dumps(workflow))  # deep copy
-    def set_text(node_id: str) -> bool:
-        node = wf.get(node_id)
-        if not isinstance(node, dict):
-            return False
-        inputs = node.get("inputs") or {}
-        if not isinstance(inputs, dict):
-            return False
-        # CLIPTextEncode 기본 입력 키는 text
-        inputs["text"] = prompt
-        node["inputs"] = inputs
-        wf[node_id] = node
-        return True
+async def _poll_history_outputs(client: httpx.AsyncClient, base_url: str, prompt_id: str) -> dict:
+    resp = await client.get(f"{base_url}/history/{prompt_id}")
+    resp.raise_for_status()
+    history = resp.json() or {}
+    item = history.get(prompt_id) or {}
+    # outputs: {node_id: {"images":[{"filename":...,"subfolder":...,"type":"output"}] } }
+    return item.get("outputs") or {}
 
-    # 1) 기존 워크플로우 구조(노드 "3") 우선
-    if set_text("3"):
-        return wf
 
-    # 2) fallback: 첫 CLIPTextEncode 노드 탐색
-    for node_id, node in wf.items():
-        if isinstance(node, dict) and node.get("class_type") == "CLIPTextEncode":
-            if set_text(str(node_id)):
-                LOGGER.warning("Injected prompt into CLIPTextEncode node %s (fallback path)", node_id)
-                return wf
+def _outputs_ready(outputs: dict, expected_nodes: list[str] | None) -> bool:
+    if not expected_nodes:
+        return first_image(outputs) is not None
+    return all(first_image({nid: outputs.get(nid)}) is not None for nid in expected_nodes)
 
-    raise RuntimeError("No CLIPTextEncode node found in workflow; cannot inject prompt text.")
 
-
-async def _wait_for_image(client: httpx.AsyncClient, prompt_id: str, timeout_s: float = 120.0) -> dict:
-    start = asyncio.get_event_loop().time()
-    while True:
-        if asyncio.get_event_loop().time() - start > timeout_s:
-            raise TimeoutError("ComfyUI history polling timed out")
-
-        resp = await client.get(f"{COMFYUI_API_URL}/history/{prompt_id}")
-        resp.raise_for_status()
-        history = resp.json() or {}
-        item = history.get(prompt_id) or {}
-        outputs = item.get("outputs") or {}
-        # outputs: {node_id: {"images":[{"filename":...,"subfolder":...,"type":"output"}] } }
-        for _, out in outputs.items():
-            images = out.get("images") if isinstance(out, dict) else None
-            if images and isinstance(images, list) and images:
-                img0 = images[0]
-                if isinstance(img0, dict) and img0.get("filename"):
-                    return img0
-
-        await asyncio.sleep(0.5)
-
-
-async def _run_comfy_workflow(workflow_path: str, prompt: str) -> bytes:
+async def _wait_for_outputs(
+    client: httpx.AsyncClient,
+    prompt_id: str,
+    expected_nodes: list[str] | None = None,
+    timeout_s: float = 120.0,
+    base_url: str = COMFYUI_API_URL,
+    listener: ComfyProgressListener | None = None,
+) -> dict:
+    """
+    AS-IS: GET /history/{prompt_id}를 0.5초마다 폴링.
+    TO-BE: 리스너가 연결되어 있으면 `executed` 메시지로 완료되는 Future를 기다리고,
+          COMFYUI_WS_FALLBACK_POLL_SECONDS마다 한 번씩만 history를 확인합니다 (메시지 유실 대비).
+          리스너가 없거나 끊긴 경우에만 기존 0.5초 폴링을 사용합니다.
+    expected_nodes가 주어지면(배치 워크플로우) 해당 출력 노드가 모두 이미지를 낼 때까지 기다립니다.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s
+    future = None
+    if listener is not None and listener.is_connected:
+        future = listener.register(prompt_id, expected_outputs=len(expected_nodes or []) or 1)
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TimeoutError("ComfyUI history polling timed out")
+
+            if future is not None:
+                try:
+                    outputs = await asyncio.wait_for(
+                        asyncio.shield(future), timeout=min(COMFYUI_WS_FALLBACK_POLL_SECONDS, remaining)
+                    )
+                    if _outputs_ready(outputs, expected_nodes):
+                        return outputs
+                    # 실행은 끝났지만 소켓으로 출력이 다 오지 않음 → history 폴링으로 전환
+                    future = None
+                except asyncio.TimeoutError:
+                    pass
+
+            outputs = await _poll_history_outputs(client, base_url, prompt_id)
+            if _outputs_ready(outputs, expected_nodes):
+                return outputs
+
+            if future is None:
+                await asyncio.sleep(0.5)
+    finally:
+        if listener is not None:
+            listener.discard(prompt_id)
+
+
+async def _wait_for_image(
+    client: httpx.AsyncClient,
+    prompt_id: str,
+    timeout_s: float = 120.0,
+    base_url: str = COMFYUI_API_URL,
+    listener: ComfyProgressListener | None = None,
+) -> dict:
+    outputs = await _wait_for_outputs(
+        client, prompt_id, timeout_s=timeout_s, base_url=base_url, listener=listener
+    )
+    return first_image(outputs) or {}
+
+
+async def _submit_and_collect(
+    workflow: dict,
+    expected_nodes: list[str] | None,
+    base_url: str,
+    listener: ComfyProgressListener | None,
+    wait_timeout_s: float,
+) -> list[bytes]:
     """
     표준 ComfyUI API 기반 실행:
-    - POST /prompt  { "prompt": <workflow> }
+    - POST /prompt  { "prompt": <workflow>, "client_id": <listener client id> }
+    - WS   /ws?clientId=...  (executed 메시지로 완료 감지, 폴링은 보조)
     - GET  /history/{prompt_id}
     - GET  /view?filename=...&subfolder=...&type=...
-    """
-    workflow = load_workflow(workflow_path)
-    workflow = _inject_prompt(workflow, prompt)
 
+    expected_nodes가 없으면 첫 이미지 1장, 있으면 노드 순서대로 이미지를 반환합니다.
+    """
     timeout = httpx.Timeout(COMFYUI_TIMEOUT_SECONDS, connect=5.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        try:
-            submit = await client.post(f"{COMFYUI_API_URL}/prompt", json={"prompt": workflow})
-            submit.raise_for_status()
-            payload = submit.json() or {}
-            prompt_id = str(payload.get("prompt_id") or "")
-            if not prompt_id:
-                raise RuntimeError(f"ComfyUI returned no prompt_id: {payload}")
-
-            img_meta = await _wait_for_image(client, prompt_id)
-            filename = img_meta.get("filename")
-            subfolder = img_meta.get("subfolder", "")
-            img_type = img_meta.get("type", "output")
-
+    client = get_client("comfyui")
+    try:
+        body: dict[str, Any] = {"prompt": workflow}
+        if listener is not None and await listener.wait_connected():
+            # client_id를 붙여야 ComfyUI가 진행 메시지를 공유 소켓으로 보내줍니다.
+            body["client_id"] = listener.client_id
+        else:
+            listener = None
+        submit = await client.post(f"{base_url}/prompt", json=body, timeout=timeout)
+        submit.raise_for_status()
+        payload = submit.json() or {}
+        prompt_id = str(payload.get("prompt_id") or "")
+        if not prompt_id:
+            raise RuntimeError(f"ComfyUI returned no prompt_id: {payload}")
+
+        outputs = await _wait_for_outputs(
+            client, prompt_id, expected_nodes, timeout_s=wait_timeout_s, base_url=base_url, listener=listener
+        )
+        if expected_nodes:
+            metas = [first_image({nid: outputs.get(nid)}) or {} for nid in expected_nodes]
+        else:
+            metas = [first_image(outputs) or {}]
+
+        results: list[bytes] = []
+        for img_meta in metas:
             view = await client.get(
-                f"{COMFYUI_API_URL}/view",
-                params={"filename": filename, "subfolder": subfolder, "type": img_type},
+                f"{base_url}/view",
+                params={
+                    "filename": img_meta.get("filename"),
+                    "subfolder": img_meta.get("subfolder", ""),
+                    "type": img_meta.get("type", "output"),
+                },
+                timeout=timeout,
             )
             view.raise_for_status()
-            return view.content
-        except httpx.ConnectError as exc:
-            LOGGER.error("ComfyUI connection error (%s): %s", COMFYUI_API_URL, exc)
-            raise
-        except httpx.TimeoutException as exc:
-            LOGGER.error("ComfyUI timeout (%s): %s", COMFYUI_API_URL, exc)
-            raise
-        except httpx.HTTPStatusError as exc:
-            LOGGER.error("ComfyUI HTTP error (%s): %s", COMFYUI_API_URL, exc)
-            raise
-        except FileNotFoundError as exc:
-            LOGGER.error("Workflow file not found (%s): %s", workflow_path, exc)
-            raise
-        except Exception as exc:
-            LOGGER.error("ComfyUI workflow run failed (%s): %s", type(exc).__name__, exc)
-            raise
+            results.append(view.content)
+        return results
+    except httpx.ConnectError as exc:
+        LOGGER.error("ComfyUI connection error (%s): %s", base_url, exc)
+        raise
+    except httpx.TimeoutException as exc:
+        LOGGER.error("ComfyUI timeout (%s): %s", base_url, exc)
+        raise
+    except httpx.HTTPStatusError as exc:
+        LOGGER.error("ComfyUI HTTP error (%s): %s", base_url, exc)
+        raise
+    except Exception as exc:
+        LOGGER.error("ComfyUI workflow run failed (%s): %s", type(exc).__name__, exc)
+        raise
+
+
+async def _run_comfy_workflow(
+    workflow_path: str,
+    prompt: str,
+    base_url: str = COMFYUI_API_URL,
+    listener: ComfyProgressListener | None = None,
+    *,
+    negative_prompt: str | None = None,
+    seed: int | None = None,
+    width: int | None = None,
+    height: int | None = None,
+) -> bytes:
+    """
+    이미지 1장 생성. 워크플로우는 (경로, mtime) 캐시된 템플릿에서 프롬프트/시드/크기만 바꿔 렌더링합니다.
+    """
+    workflow = get_workflow_template(workflow_path).render(
+        prompt,
+        negative_prompt=negative_prompt,
+        seed=seed,
+        width=width if width is not None else COMFYUI_IMAGE_WIDTH,
+        height=height if height is not None else COMFYUI_IMAGE_HEIGHT,
+    )
+    results = await _submit_and_collect(workflow, None, base_url, listener, wait_timeout_s=120.0)
+    return results[0]
+
+
+async def _run_comfy_batch(
+    workflow_path: str,
+    prompts: list[str],
+    base_url: str = COMFYUI_API_URL,
+    listener: ComfyProgressListener | None = None,
+    *,
+    negative_prompt: str | None = None,
+    seed: int | None = None,
+    width: int | None = None,
+    height: int | None = None,
+) -> list[bytes]:
+    """
+    여러 프롬프트를 멀티 브랜치 워크플로우 하나로 제출합니다.
+    체크포인트 로딩/공유 노드는 한 번만 실행되고, 결과는 prompts 순서대로 반환됩니다.
+    """
+    workflow, output_nodes = get_workflow_template(workflow_path).render_batch(
+        prompts,
+        negative_prompt=negative_prompt,
+        seed=seed,
+        width=width if width is not None else COMFYUI_IMAGE_WIDTH,
+        height=height if height is not None else COMFYUI_IMAGE_HEIGHT,
+    )
+    return await _submit_and_collect(
+        workflow, output_nodes, base_url, listener, wait_timeout_s=120.0 * len(prompts)
+    )
+
+
+async def _dispatch(run) -> Any:
+    """
+    [대기열 적용] comfy_pool에서 가장 한가한 정상 백엔드를 배정받을 때까지 대기한 뒤 run(backend)을 실행합니다.
+    - 연결 실패한 백엔드는 쿨다운 동안 제외하고, 남은 백엔드로 한 번씩 재시도합니다.
+    """
+    tried: set[str] = set()
+    while True:
+        async with comfy_pool.acquire(exclude=tried) as backend:
+            LOGGER.info("이미지 생성 시작 (대기열 통과, backend=%s)", backend.url)
+            try:
+                result = await run(backend)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                comfy_pool.mark_failure(backend)
+                tried.add(backend.url)
+                if len(tried) >= len(comfy_pool.backends):
+                    raise
+                continue
+            comfy_pool.mark_success(backend)
+            return result
 
 
 async def generate_image_background(
@@ -219,12 +348,59 @@ async def generate_image_background(
     return "이미지 생성 작업이 백그라운드에서 시작되었습니다."
 
 
-async def generate_image_sync(workflow_path: str, prompt: str) -> bytes:
+async def generate_image_sync(
+    workflow_path: str,
+    prompt: str,
+    *,
+    negative_prompt: str | None = None,
+    seed: int | None = None,
+    width: int | None = None,
+    height: int | None = None,
+) -> bytes:
     """
     즉시 결과를 받고 싶은 경우 호출할 수 있는 동기 함수.
-    [대기열 적용] 세마포어를 통해 이전 이미지가 완료될 때까지 대기합니다.
+    negative_prompt/seed/width/height를 넘기면 해당 호출에만 적용됩니다 (워크플로우 파일은 그대로).
     """
-    async with _GEN_SEMAPHORE:
-        LOGGER.info("이미지 생성 시작 (대기열 통과)")
-        return await _run_comfy_workflow(workflow_path, prompt)
-
+    return await _dispatch(
+        lambda backend: _run_comfy_workflow(
+            workflow_path,
+            prompt,
+            base_url=backend.url,
+            listener=backend.listener,
+            negative_prompt=negative_prompt,
+            seed=seed,
+            width=width,
+            height=height,
+        )
+    )
+
+
+async def generate_images_batch(
+    workflow_path: str,
+    prompts: list[str],
+    *,
+    negative_prompt: str | None = None,
+    seed: int | None = None,
+    width: int | None = None,
+    height: int | None = None,
+) -> list[bytes]:
+    """
+    한 포스트의 이미지 여러 장을 하나의 ComfyUI 작업으로 생성합니다 (COMFYUI_BATCH_MODE).
+    백엔드 슬롯 하나를 점유하며, 결과는 prompts 순서대로 반환됩니다.
+    """
+    if len(prompts) == 1:
+        return [await generate_image_sync(
+            workflow_path, prompts[0], negative_prompt=negative_prompt, seed=seed, width=width, height=height
+        )]
+    return await _dispatch(
+        lambda backend: _run_comfy_batch(
+            workflow_path,
+            prompts,
+            base_url=backend.url,
+            listener=backend.listener,
+            negative_prompt=negative_prompt,
+            seed=seed,
+            width=width,
+            height=height,
+        )
+    )
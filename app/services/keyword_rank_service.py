@@ -0,0 +1,301 @@
+"""
+키워드 순위 시계열 (KeywordRank) 기록/조회.
+
+AS-IS: GET /posts/keywords가 모든 블로그의 모든 포스트를 읽어 keyword_ranks JSON을 파이썬에서 순회
+       → 트래킹하는 포스트 수에 비례해 느려지고, 과거 순위는 덮어써져 변동 이력을 볼 수 없음.
+TO-BE: 관측마다 keyword_ranks 테이블에 한 행을 추가하고, 조회는 (post_id, keyword)별 집계 서브쿼리 하나로 처리.
+- 최신값: (post_id, keyword)별 max(id) (관측은 시간순으로 추가되므로 id 순서 = 관측 순서)
+- N일 변동: 같은 집계에서 기준 시점 이전 마지막 관측 id를 함께 구함 (기준 이전 관측이 없으면 첫 관측)
+- 기록은 호출자 트랜잭션에 포함 (commit은 호출자가 담당)
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import JSON, String, and_, case, column, func, insert, literal, select, true
+from sqlalchemy.orm import Session, aliased
+
+from app.models.sql_models import Blog, KeywordRank, Post
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _previous_ranks(db: Session, pairs: set[tuple[int, str]]) -> dict[tuple[int, str], int]:
+    if not pairs:
+        return {}
+    post_ids = {post_id for post_id, _ in pairs}
+    keywords = {keyword for _, keyword in pairs}
+    latest_ids = (
+        select(func.max(KeywordRank.id))
+        .where(KeywordRank.post_id.in_(post_ids), KeywordRank.keyword.in_(keywords))
+        .group_by(KeywordRank.post_id, KeywordRank.keyword)
+    )
+    rows = db.execute(
+        select(KeywordRank.post_id, KeywordRank.keyword, KeywordRank.rank).where(KeywordRank.id.in_(latest_ids))
+    )
+    return {(row.post_id, row.keyword): row.rank for row in rows if (row.post_id, row.keyword) in pairs}
+
+
+def record_keyword_ranks(
+    db: Session,
+    observations: Iterable[tuple[int, str, int]],
+    observed_at: datetime | None = None,
+) -> dict[tuple[int, str], dict]:
+    """
+    (post_id, keyword, rank) 관측을 한 번의 INSERT로 기록합니다.
+    rank가 1 미만(차단/오류)인 관측은 순위 정보가 아니므로 기록하지 않습니다.
+    반환값: {(post_id, keyword): {"rank", "change", "updated_at"}} (Post.keyword_ranks 스냅샷용)
+    """
+    observed_at = observed_at or datetime.now()
+    valid = [(post_id, keyword, rank) for post_id, keyword, rank in observations if rank and rank > 0]
+    if not valid:
+        return {}
+
+    previous = _previous_ranks(db, {(post_id, keyword) for post_id, keyword, _ in valid})
+    rows = []
+    recorded: dict[tuple[int, str], dict] = {}
+    for post_id, keyword, rank in valid:
+        prev_rank = previous.get((post_id, keyword))
+        change = prev_rank - rank if prev_rank is not None else 0
+        rows.append(
+            {"post_id": post_id, "keyword": keyword, "rank": rank, "change": change, "observed_at": observed_at}
+        )
+        recorded[(post_id, keyword)] = {"rank": rank, "change": change, "updated_at": observed_at.isoformat()}
+    db.execute(insert(KeywordRank), rows)
+    return recorded
+
+
+def _owned_post_ids(user_id: int):
+    return select(Post.id).join(Blog, Post.blog_id == Blog.id).where(Blog.owner_id == user_id)
+
+
+def _pair_stats(user_id: int, keyword: str | None = None, post_id: int | None = None, since: datetime | None = None):
+    """(post_id, keyword)별 최신 관측 id와 since 시점 기준 관측 id를 구하는 집계 서브쿼리."""
+    conditions = [KeywordRank.post_id.in_(_owned_post_ids(user_id))]
+    if keyword:
+        conditions.append(KeywordRank.keyword.contains(keyword))
+    if post_id is not None:
+        conditions.append(KeywordRank.post_id == post_id)
+    columns = [
+        KeywordRank.post_id,
+        KeywordRank.keyword,
+        func.max(KeywordRank.id).label("latest_id"),
+    ]
+    if since is not None:
+        columns.append(
+            func.coalesce(
+                func.max(case((KeywordRank.observed_at <= since, KeywordRank.id))),
+                func.min(KeywordRank.id),
+            ).label("base_id")
+        )
+    return select(*columns).where(*conditions).group_by(KeywordRank.post_id, KeywordRank.keyword).subquery()
+
+
+def _ranked_pairs_query(user_id: int, keyword: str | None, platform: str | None, post_id: int | None):
+    """순위가 한 번이라도 기록된 (포스트, 키워드)별 최신 관측."""
+    stats = _pair_stats(user_id, keyword=keyword, post_id=post_id)
+    latest = aliased(KeywordRank)
+    query = (
+        select(
+            latest.post_id,
+            latest.keyword,
+            latest.rank,
+            latest.change,
+            latest.observed_at,
+            Post.title,
+            Post.published_url,
+            Blog.platform_type,
+        )
+        .join(stats, latest.id == stats.c.latest_id)
+        .join(Post, Post.id == latest.post_id)
+        .join(Blog, Blog.id == Post.blog_id)
+    )
+    if platform:
+        query = query.where(Blog.platform_type == platform)
+    return query, (latest.keyword, latest.post_id)
+
+
+def _unranked_pairs_query(
+    dialect: str, user_id: int, keyword: str | None, platform: str | None, post_id: int | None
+):
+    """
+    유효한 순위가 한 번도 없는 (포스트, 키워드): 차단/오류(-1)나 첫 실행 결과는 keyword_ranks 테이블에 기록되지 않으므로
+    Post.keyword_ranks 스냅샷에서 가져옵니다 (객체가 아닌 자유 형식 값은 빈 객체로 취급).
+    """
+    json_type = func.json_typeof if dialect == "postgresql" else func.json_type
+    snapshot = case((json_type(Post.keyword_ranks) == "object", Post.keyword_ranks), else_=literal({}, JSON))
+    entry = func.json_each(snapshot).table_valued(column("key", String), column("value", JSON)).alias("entry")
+    has_rank = (
+        select(KeywordRank.id).where(KeywordRank.post_id == Post.id, KeywordRank.keyword == entry.c.key).exists()
+    )
+    query = (
+        select(
+            Post.id.label("post_id"),
+            entry.c.key.label("keyword"),
+            func.coalesce(entry.c.value["rank"].as_integer(), 0).label("rank"),
+            func.coalesce(entry.c.value["change"].as_integer(), 0).label("change"),
+            func.coalesce(entry.c.value["updated_at"].as_string(), "").label("updated_at"),
+            Post.title,
+            Post.published_url,
+            Blog.platform_type,
+        )
+        .select_from(Post)
+        .join(Blog, Blog.id == Post.blog_id)
+        .join(entry, true())
+        .where(Blog.owner_id == user_id, ~has_rank)
+    )
+    if keyword:
+        query = query.where(entry.c.key.contains(keyword))
+    if post_id is not None:
+        query = query.where(Post.id == post_id)
+    if platform:
+        query = query.where(Blog.platform_type == platform)
+    return query, (entry.c.key, Post.id)
+
+
+def _count(db: Session, query) -> int:
+    return db.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+
+
+def list_keyword_ranks(
+    db: Session,
+    user_id: int,
+    keyword: str | None = None,
+    platform: str | None = None,
+    post_id: int | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> dict:
+    """
+    키워드 트래킹 테이블: (포스트, 키워드)별 최신 순위 + 페이지 정보.
+    순위가 기록된 항목(키워드, 포스트 순) 뒤에 순위를 한 번도 얻지 못한 항목(rank -1 등)을 이어 붙입니다.
+
+    Returns:
+        {"items": [...], "total": 전체 건수, "next_offset": 다음 페이지 offset (마지막 페이지면 None)}
+    """
+    ranked, ranked_order = _ranked_pairs_query(user_id, keyword, platform, post_id)
+    unranked, unranked_order = _unranked_pairs_query(db.get_bind().dialect.name, user_id, keyword, platform, post_id)
+    ranked_total = _count(db, ranked)
+    total = ranked_total + _count(db, unranked)
+
+    items = []
+    if offset < ranked_total:
+        rows = db.execute(ranked.order_by(*ranked_order).limit(limit).offset(offset))
+        items += [
+            {
+                "post_id": row.post_id,
+                "post_title": row.title,
+                "published_url": row.published_url,
+                "keyword": row.keyword,
+                "platform": row.platform_type,
+                "rank": row.rank,
+                "change": row.change,
+                "updated_at": row.observed_at.isoformat() if row.observed_at else "",
+            }
+            for row in rows
+        ]
+    if len(items) < limit and offset + len(items) < total:
+        rows = db.execute(
+            unranked.order_by(*unranked_order).limit(limit - len(items)).offset(max(0, offset - ranked_total))
+        )
+        items += [
+            {
+                "post_id": row.post_id,
+                "post_title": row.title,
+                "published_url": row.published_url,
+                "keyword": row.keyword,
+                "platform": row.platform_type,
+                "rank": row.rank,
+                "change": row.change,
+                "updated_at": row.updated_at,
+            }
+            for row in rows
+        ]
+    next_offset = offset + len(items)
+    return {"items": items, "total": total, "next_offset": next_offset if next_offset < total else None}
+
+
+def list_rank_changes(
+    db: Session,
+    user_id: int,
+    days: int = 7,
+    keyword: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> list[dict]:
+    """
+    최근 days일 동안의 순위 변동: 최신 순위 vs 기준 시점(now - days) 이전 마지막 순위.
+    change 양수 = 순위 상승. 변동 폭이 큰 순으로 정렬.
+    """
+    since = datetime.now() - timedelta(days=days)
+    stats = _pair_stats(user_id, keyword=keyword, since=since)
+    latest = aliased(KeywordRank)
+    base = aliased(KeywordRank)
+    change = (base.rank - latest.rank).label("change")
+    query = (
+        select(
+            latest.post_id,
+            latest.keyword,
+            latest.rank,
+            latest.observed_at,
+            base.rank.label("rank_before"),
+            base.observed_at.label("observed_before"),
+            change,
+            Post.title,
+            Blog.platform_type,
+        )
+        .join(stats, latest.id == stats.c.latest_id)
+        .join(base, base.id == stats.c.base_id)
+        .join(Post, Post.id == latest.post_id)
+        .join(Blog, Blog.id == Post.blog_id)
+        .order_by(func.abs(base.rank - latest.rank).desc(), latest.keyword, latest.post_id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return [
+        {
+            "post_id": row.post_id,
+            "post_title": row.title,
+            "keyword": row.keyword,
+            "platform": row.platform_type,
+            "rank": row.rank,
+            "rank_before": row.rank_before,
+            "change": row.change,
+            "updated_at": row.observed_at.isoformat() if row.observed_at else "",
+            "compared_at": row.observed_before.isoformat() if row.observed_before else "",
+        }
+        for row in db.execute(query)
+    ]
+
+
+def rank_history(
+    db: Session,
+    user_id: int,
+    post_id: int,
+    days: int = 30,
+    keyword: str | None = None,
+) -> list[dict]:
+    """포스트의 키워드별 순위 이력 (observed_at 오름차순)."""
+    since = datetime.now() - timedelta(days=days)
+    conditions = [
+        KeywordRank.post_id == post_id,
+        KeywordRank.post_id.in_(_owned_post_ids(user_id)),
+        KeywordRank.observed_at >= since,
+    ]
+    if keyword:
+        conditions.append(KeywordRank.keyword == keyword)
+    query = (
+        select(KeywordRank.keyword, KeywordRank.rank, KeywordRank.change, KeywordRank.observed_at)
+        .where(and_(*conditions))
+        .order_by(KeywordRank.keyword, KeywordRank.observed_at, KeywordRank.id)
+    )
+    return [
+        {
+            "keyword": row.keyword,
+            "rank": row.rank,
+            "change": row.change,
+            "observed_at": row.observed_at.isoformat() if row.observed_at else "",
+        }
+        for row in db.execute(query)
+    ]
@@ -9,9 +9,12 @@ TO-BE 요구사항:
 
 import os
 import logging
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import httpx
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from app.core.http_client import get_client
 from app.models.sql_models import KeywordQueue
 
 LOGGER = logging.getLogger(__name__)
@@ -21,6 +24,9 @@ NAVER_API_CLIENT_ID = os.getenv("NAVER_API_CLIENT_ID")
 NAVER_API_CLIENT_SECRET = os.getenv("NAVER_API_CLIENT_SECRET")
 NAVER_API_BASE_URL = "https://api.naver.com/keywordstool"
 
+# 파이프라인이 키워드를 점유한 채 죽었을 때(프로세스 종료 등) 이 시간이 지나면 다른 실행이 다시 가져갈 수 있음
+KEYWORD_RESERVATION_TIMEOUT_SECONDS = float(os.getenv("KEYWORD_RESERVATION_TIMEOUT_SECONDS", "3600"))
+
 
 async def fetch_related_keywords(seed_keyword: str) -> List[Dict]:
     """
@@ -50,10 +56,10 @@ async def fetch_related_keywords(seed_keyword: str) -> List[Dict]:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(NAVER_API_BASE_URL, headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        client = get_client("naver_api")
+        resp = await client.get(NAVER_API_BASE_URL, headers=headers, params=params)
+        resp.raise_for_status()
+        data = resp.json()
         
         keywords = []
         for item in data.get("keywordList", []):
@@ -165,6 +171,101 @@ def get_next_keyword(db: Session, user_id: int) -> Optional[str]:
     return entry.keyword if entry else None
 
 
+def _reservable(user_id: int, now: datetime):
+    """미사용이면서 아무도 점유하지 않은(또는 점유가 만료된) 키워드 조건."""
+    stale_before = now - timedelta(seconds=KEYWORD_RESERVATION_TIMEOUT_SECONDS)
+    return (
+        KeywordQueue.user_id == user_id,
+        KeywordQueue.used_at.is_(None),
+        or_(KeywordQueue.reserved_at.is_(None), KeywordQueue.reserved_at < stale_before),
+    )
+
+
+def get_next_keywords(db: Session, user_id: int, count: int, reserved_at: Optional[datetime] = None) -> List[str]:
+    """
+    다음에 사용할 키워드 N개를 골라 점유하기 (하루 여러 건 생성 시 같은 키워드가 겹치지 않도록)
+
+    AS-IS: 읽기만 하고 used_at은 발행 후(mark_keyword_used)에 기록 → 실행이 겹치면(상주 스케줄러 + cron,
+           인스턴스 여러 개) 같은 키워드를 같이 가져감.
+    TO-BE: 고른 키워드마다 reserved_at을 조건부 UPDATE(CAS)로 기록해 같은 트랜잭션에서 점유합니다.
+           발행되면 mark_keyword_used가 used_at으로 바꾸고, 실패하면 release_keywords로 풉니다.
+
+    Args:
+        db: DB 세션
+        user_id: 사용자 ID
+        count: 필요한 키워드 개수
+        reserved_at: 점유 토큰 (release_keywords/mark_keyword_used에 같은 값을 넘김, 기본 현재 시각)
+
+    Returns:
+        List[str]: 우선순위 순 키워드 (큐에 등록된 키워드가 count보다 적으면 앞에서부터 반복,
+                   점유할 수 있는 키워드가 없으면 [])
+    """
+    if count <= 0:
+        return []
+    reserved_at = reserved_at or datetime.now()
+
+    def reserve(limit: int) -> List[str]:
+        claimed: List[str] = []
+        while len(claimed) < limit:
+            rows = (
+                db.query(KeywordQueue.id, KeywordQueue.keyword)
+                .filter(*_reservable(user_id, reserved_at))
+                .order_by(KeywordQueue.priority.desc())
+                .limit(limit - len(claimed))
+                .all()
+            )
+            if not rows:
+                break
+            for row in rows:
+                # 그 사이 다른 실행이 점유했으면 0건 → 다음 후보로 다시 조회
+                won = (
+                    db.query(KeywordQueue)
+                    .filter(KeywordQueue.id == row.id, *_reservable(user_id, reserved_at))
+                    .update({KeywordQueue.reserved_at: reserved_at}, synchronize_session=False)
+                )
+                if won == 1:
+                    claimed.append(row.keyword)
+        return claimed
+
+    # 1. 미사용 키워드 중 우선순위 높은 것부터
+    keywords = reserve(count)
+
+    # 2. 부족하면 큐 재가동 (점유 중인 키워드는 used_at이 비어 있으므로 영향 없음)
+    if len(keywords) < count:
+        LOGGER.info(f"사용자 {user_id}의 키워드 큐 소진 → 재가동")
+        db.query(KeywordQueue).filter(
+            KeywordQueue.user_id == user_id, KeywordQueue.used_at.isnot(None)
+        ).update({KeywordQueue.used_at: None}, synchronize_session=False)
+        keywords += reserve(count - len(keywords))
+    db.commit()
+
+    # 3. 등록된 키워드 자체가 적으면 순환
+    if keywords and len(keywords) < count:
+        keywords = [keywords[i % len(keywords)] for i in range(count)]
+    return keywords
+
+
+def release_keywords(db: Session, user_id: int, keywords: List[str], reserved_at: datetime) -> int:
+    """
+    발행하지 못한 키워드의 점유 해제 (다음 실행이 다시 고를 수 있도록). 반환값: 해제한 건수.
+    같은 reserved_at으로 점유한 것만 풀어서, 만료 후 다른 실행이 다시 점유한 키워드는 건드리지 않습니다.
+    """
+    if not keywords:
+        return 0
+    released = (
+        db.query(KeywordQueue)
+        .filter(
+            KeywordQueue.user_id == user_id,
+            KeywordQueue.keyword.in_(keywords),
+            KeywordQueue.used_at.is_(None),
+            KeywordQueue.reserved_at == reserved_at,
+        )
+        .update({KeywordQueue.reserved_at: None}, synchronize_session=False)
+    )
+    db.commit()
+    return released
+
+
 def mark_keyword_used(db: Session, user_id: int, keyword: str):
     """
     키워드 사용 처리
@@ -174,15 +275,12 @@ def mark_keyword_used(db: Session, user_id: int, keyword: str):
         user_id: 사용자 ID
         keyword: 사용한 키워드
     """
-    from datetime import datetime
-    
-    entry = db.query(KeywordQueue).filter(
+    updated = db.query(KeywordQueue).filter(
         KeywordQueue.user_id == user_id,
         KeywordQueue.keyword == keyword,
         KeywordQueue.used_at.is_(None)
-    ).first()
+    ).update({KeywordQueue.used_at: datetime.now(), KeywordQueue.reserved_at: None}, synchronize_session=False)
     
-    if entry:
-        entry.used_at = datetime.now()
+    if updated:
         db.commit()
         LOGGER.info(f"키워드 '{keyword}' 사용 처리 완료")
@@ -0,0 +1,221 @@
+"""
+LLM 응답 캐시 (opt-in).
+
+AS-IS: 같은 URL/별칭/주제로 블로그 분석 화면을 열 때마다 analyze_blog가 Gemini를 다시 호출하고,
+       재시도/미리보기에서 동일한 generate_html 프롬프트도 매번 새로 생성 → 지연 + 비용.
+TO-BE: (모델명 + 정규화된 프롬프트)의 sha256을 키로 원문 응답을 캐시합니다.
+- 1차: 프로세스 내 LRU + TTL (항상 사용)
+- 2차(선택): SQLite 파일 또는 Redis → 재시작/다중 워커 간 공유
+- 캐시 오류는 로그만 남기고 무시 (캐시 때문에 생성이 실패하지 않음)
+
+환경변수:
+- GEMINI_CACHE_ENABLED (기본 false)
+- GEMINI_CACHE_BACKEND: memory | sqlite | redis (기본 memory)
+- GEMINI_CACHE_TTL_SECONDS (기본 86400), GEMINI_CACHE_MAX_ENTRIES (기본 512, 메모리 LRU 크기)
+- GEMINI_CACHE_SQLITE_PATH (기본 <프로젝트 루트>/llm_cache.db), REDIS_URL (기본 redis://localhost:6379/0)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+LOGGER = logging.getLogger("llm_cache")
+
+GEMINI_CACHE_ENABLED = os.getenv("GEMINI_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+GEMINI_CACHE_BACKEND = os.getenv("GEMINI_CACHE_BACKEND", "memory").lower()
+GEMINI_CACHE_TTL_SECONDS = float(os.getenv("GEMINI_CACHE_TTL_SECONDS", "86400"))
+GEMINI_CACHE_MAX_ENTRIES = int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "512"))
+GEMINI_CACHE_SQLITE_PATH = os.getenv(
+    "GEMINI_CACHE_SQLITE_PATH", str(Path(__file__).resolve().parents[2] / "llm_cache.db")
+)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+try:
+    import redis.asyncio as _redis_asyncio  # type: ignore
+except Exception:  # pragma: no cover - 선택 의존성
+    _redis_asyncio = None
+
+
+def normalize_prompt(prompt: str) -> str:
+    """공백/줄바꿈 차이만 있는 프롬프트는 같은 키가 되도록 정규화합니다."""
+    return " ".join((prompt or "").split())
+
+
+def make_cache_key(model: str, prompt: str) -> str:
+    digest = hashlib.sha256(f"{model}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+    return f"llm:{model}:{digest}"
+
+
+class MemoryCache:
+    """프로세스 내 LRU + TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(max_entries, 1)
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.time():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._data[key] = (time.time() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteCache:
+    """단일 서버에서 재시작 후에도 유지되는 파일 캐시 (표준 라이브러리 sqlite3, 스레드에서 실행)."""
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _get_sync(self, key: str) -> str | None:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def _set_sync(self, key: str, value: str) -> None:
+        conn = self._connect()
+        try:
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + self.ttl_seconds),
+            )
+            conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set_sync, key, value)
+
+
+class RedisCache:
+    """여러 서버/워커가 공유하는 캐시 (redis.asyncio, SETEX로 TTL 위임)."""
+
+    def __init__(self, url: str, ttl_seconds: float):
+        if _redis_asyncio is None:
+            raise RuntimeError("redis 패키지가 설치되어 있지 않습니다.")
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self._client = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = _redis_asyncio.from_url(self.url, decode_responses=True)
+            self._loop = loop
+        return self._client
+
+    async def get(self, key: str) -> str | None:
+        return await self._get_client().get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        await self._get_client().set(key, value, ex=max(int(self.ttl_seconds), 1))
+
+
+class LLMCache:
+    def __init__(self, enabled: bool, memory: MemoryCache, backend=None):
+        self.enabled = enabled
+        self.memory = memory
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+        value = await self.memory.get(key)
+        if value is None and self.backend is not None:
+            try:
+                value = await self.backend.get(key)
+            except Exception as exc:
+                self.errors += 1
+                LOGGER.warning("LLM cache backend get failed: %s", exc)
+                value = None
+            if value is not None:
+                await self.memory.set(key, value)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        if not self.enabled or not value:
+            return
+        await self.memory.set(key, value)
+        if self.backend is not None:
+            try:
+                await self.backend.set(key, value)
+            except Exception as exc:
+                self.errors += 1
+                LOGGER.warning("LLM cache backend set failed: %s", exc)
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__ if self.backend is not None else "MemoryCache",
+            "memory_entries": len(self.memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+def build_llm_cache() -> LLMCache:
+    memory = MemoryCache(GEMINI_CACHE_MAX_ENTRIES, GEMINI_CACHE_TTL_SECONDS)
+    backend = None
+    if GEMINI_CACHE_ENABLED:
+        try:
+            if GEMINI_CACHE_BACKEND == "sqlite":
+                backend = SqliteCache(GEMINI_CACHE_SQLITE_PATH, GEMINI_CACHE_TTL_SECONDS)
+            elif GEMINI_CACHE_BACKEND == "redis":
+                backend = RedisCache(REDIS_URL, GEMINI_CACHE_TTL_SECONDS)
+        except Exception as exc:
+            LOGGER.warning("LLM cache backend %s unavailable, using memory only: %s", GEMINI_CACHE_BACKEND, exc)
+    return LLMCache(GEMINI_CACHE_ENABLED, memory, backend)
+
+
+llm_cache = build_llm_cache()
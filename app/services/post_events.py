@@ -0,0 +1,94 @@
+"""
+포스트 이미지 진행 이벤트 버스 (프로세스 내 pub/sub).
+
+AS-IS: 프론트엔드가 이미지 완료 여부를 알기 위해 /posts/status(모든 블로그 + 모든 포스트 + content 전체)를
+       반복 호출 → 대시보드에서 가장 무거운 쿼리가 폴링 주기마다 실행.
+TO-BE: 이미지 큐 워커가 작업을 마칠 때 이벤트를 발행하고, SSE 엔드포인트(/posts/{id}/events, /posts/events)가
+       구독자에게 바로 전달합니다.
+
+이벤트 형태 (dict):
+- {"event": "image", "post_id", "user_id", "index", "status": COMPLETED|FAILED|RETRYING, "url", "error", "timeout"}
+- {"event": "post_status", "post_id", "user_id", "img_gen_status"}
+
+워커가 별도 프로세스(scripts/run_image_worker.py)에서 돌면 이 버스로는 전달되지 않으므로,
+SSE 쪽은 구독 대기 중 주기적으로 해당 포스트의 Queue 상태를 확인해 보완합니다.
+"""
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+LOGGER = logging.getLogger("post_events")
+
+# 느린 구독자 때문에 메모리가 늘지 않도록 구독자별 대기열 상한 (초과 시 오래된 이벤트 버림)
+_SUBSCRIBER_QUEUE_SIZE = 256
+
+
+@dataclass(eq=False)
+class Subscription:
+    post_id: int | None
+    user_id: int | None
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(_SUBSCRIBER_QUEUE_SIZE))
+
+    def matches(self, event: dict) -> bool:
+        if self.post_id is not None and event.get("post_id") != self.post_id:
+            return False
+        if self.user_id is not None and event.get("user_id") != self.user_id:
+            return False
+        return True
+
+    def _put(self, event: dict) -> None:
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """다음 이벤트 (timeout 내 없으면 None)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PostEventBus:
+    def __init__(self):
+        self._subscribers: set[Subscription] = set()
+
+    @contextmanager
+    def subscribe(self, post_id: int | None = None, user_id: int | None = None) -> Iterator[Subscription]:
+        subscription = Subscription(post_id=post_id, user_id=user_id, loop=asyncio.get_running_loop())
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: dict) -> None:
+        """어느 스레드/루프에서 호출해도 안전합니다 (구독자 루프로 전달)."""
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for subscription in list(self._subscribers):
+            if not subscription.matches(event):
+                continue
+            if subscription.loop.is_closed():
+                self._subscribers.discard(subscription)
+                continue
+            if subscription.loop is current:
+                subscription._put(event)
+            else:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+post_event_bus = PostEventBus()
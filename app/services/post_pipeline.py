@@ -0,0 +1,443 @@
+"""
+자동 포스팅 단계별 파이프라인.
+
+AS-IS: generate_and_save_post가 크롤링 → 온톨로지 → Gemini → 저장 → 이미지 대기(10초 폴링) → 발행을 한 건씩 순서대로 실행
+       → Gemini가 글을 쓰는 동안 GPU는 놀고, 이미지를 기다리는 동안 Gemini는 다음 글을 쓰지 않음.
+TO-BE: 단계를 큐로 연결해 서로 다른 포스트의 단계가 겹쳐 실행되도록 합니다.
+
+    [텍스트 워커 x PIPELINE_TEXT_WORKERS] --draft--> [이미지 등록 워커] --> [발행 워커 x PIPELINE_PUBLISH_WORKERS]
+          (크롤링/Gemini, 사용자별 라운드 로빈)      (도착한 초안을 모아 한 번에      (이미지 완료 대기 → 발행)
+                                                   DB 이미지 큐에 등록 → GPU 워커)
+
+- 초안이 하나 완성되면 바로 이미지 큐에 들어가므로, 포스트 N의 이미지를 만드는 동안 포스트 N+1의 글을 씀
+- 텍스트 큐는 사용자별 라운드 로빈이라 한 사용자의 대량 생성이 다른 사용자의 첫 건을 막지 않음
+- 스크립트처럼 asyncio.run이 반복되는 환경을 위해 큐/워커는 이벤트 루프별로 다시 만듭니다.
+
+환경변수: PIPELINE_TEXT_WORKERS (기본 4), PIPELINE_PUBLISH_WORKERS (기본 16, 대부분 이미지 대기 시간),
+         PIPELINE_IMAGE_TIMEOUT_SECONDS (기본 300)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.agents.crawler import CrawlerAgent
+from app.agents.knowledge import KnowledgeAgent
+from app.core.database import SessionLocal
+from app.models import sql_models as models
+from app.services.gemini_service import generate_html
+from app.services.image_queue_service import wait_for_post_images
+from app.services.keyword_service import mark_keyword_used, release_keywords
+from app.services.publisher_api import publish_post
+
+LOGGER = logging.getLogger("post_pipeline")
+
+PIPELINE_TEXT_WORKERS = int(os.getenv("PIPELINE_TEXT_WORKERS", "4"))
+PIPELINE_PUBLISH_WORKERS = int(os.getenv("PIPELINE_PUBLISH_WORKERS", "16"))
+# 발행 전 이미지 완료를 기다리는 최대 시간 (기존 10초 x 30회 폴링과 동일한 5분)
+PIPELINE_IMAGE_TIMEOUT_SECONDS = float(os.getenv("PIPELINE_IMAGE_TIMEOUT_SECONDS", "300"))
+
+
+@dataclass
+class PostDraft:
+    """텍스트 단계가 끝난 포스트 (이미지/발행 단계 입력)."""
+
+    post_id: int
+    keyword: str
+    prompts: list[str]
+    filenames: list[str]
+    reserved_at: datetime | None = None  # get_next_keywords 점유 토큰 (발행 못 하면 이 값으로 해제)
+
+
+def _load_publish_target(user_id: int, with_config: bool = False) -> tuple[models.BlogConfig | None, models.Blog | None]:
+    """사용자의 블로그 설정/발행 대상 블로그를 읽어 세션에서 분리된 상태로 반환합니다 (스레드에서 실행)."""
+    db = SessionLocal()
+    try:
+        config = None
+        if with_config:
+            user = db.query(models.User).filter(models.User.id == user_id).first()
+            config = user.blog_config if user else None
+        target_blog = db.query(models.Blog).filter(models.Blog.owner_id == user_id).first()
+        return config, target_blog
+    finally:
+        db.close()
+
+
+def _insert_draft_post(values: dict) -> int:
+    db = SessionLocal()
+    try:
+        new_post = models.Post(**values)
+        db.add(new_post)
+        db.commit()
+        return new_post.id
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _read_post_for_publish(post_id: int) -> dict | None:
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(models.Post.title, models.Post.content, models.Post.image_paths)
+            .filter(models.Post.id == post_id)
+            .first()
+        )
+        return {"title": row.title, "html": row.content, "images": row.image_paths or []} if row else None
+    finally:
+        db.close()
+
+
+def _finish_post_sync(
+    post_id: int, values: dict, user_id: int, keyword: str, published: bool, reserved_at: datetime | None = None
+) -> None:
+    """
+    발행 단계 결과 기록 + 키워드 처리 (스레드에서 실행).
+    발행을 시도했으면 키워드를 사용 처리하고, 아니면 reserved_at 점유를 해제합니다.
+    """
+    db = SessionLocal()
+    try:
+        db.query(models.Post).filter(models.Post.id == post_id).update(values, synchronize_session=False)
+        db.commit()
+        if published:
+            mark_keyword_used(db, user_id, keyword)
+        elif reserved_at is not None:
+            release_keywords(db, user_id, [keyword], reserved_at)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _release_sync(user_id: int, keyword: str, reserved_at: datetime) -> None:
+    db = SessionLocal()
+    try:
+        release_keywords(db, user_id, [keyword], reserved_at)
+    finally:
+        db.close()
+
+
+def _enqueue_images_sync(items: list[tuple[int, list[str], list[str]]]) -> None:
+    from app.services.image_queue_service import enqueue_image_batch
+
+    db = SessionLocal()
+    try:
+        enqueue_image_batch(db, items)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _ontology_context(keyword: str) -> str:
+    """크롤러로 최신 정보 수집 → 온톨로지 반영/검색 (선택 단계라 실패해도 빈 문맥으로 진행)."""
+    crawler = CrawlerAgent()
+    crawled_summary = ""
+    try:
+        crawled_data = await crawler.fetch_latest_news(keyword)
+        knowledge_agent = KnowledgeAgent()
+        crawled_summary = await knowledge_agent.update_ontology(keyword, crawled_data)
+        LOGGER.info("[Crawler] 온톨로지 업데이트 완료")
+        ontology_context = await knowledge_agent.search_ontology(query=keyword)
+    except Exception as e:
+        LOGGER.warning(f"[Crawler Error] {e}")
+        ontology_context = ""
+    return f"{crawled_summary}\n{ontology_context}"
+
+
+async def write_post_draft(
+    config: models.BlogConfig,
+    target_blog: models.Blog,
+    keyword: str,
+) -> PostDraft:
+    """
+    텍스트 단계: 크롤링 → 온톨로지 → Gemini 본문 생성 → DRAFT 포스트 저장 (실패 시 예외).
+
+    AS-IS: 호출자의 동기 세션으로 이벤트 루프에서 조회/커밋 → DB가 느리면(SQLite 잠금 대기 등)
+           같은 루프의 다른 포스트의 Gemini/크롤링/발행 대기가 모두 멈춤.
+    TO-BE: config/target_blog는 미리 읽어 둔(세션에서 분리된) 객체로 받고, 저장은 스레드에서 실행합니다.
+    """
+    LOGGER.info(f"[Keyword] 선택된 키워드: {keyword}")
+
+    # 2. 크롤러로 최신 정보 수집 (선택)
+    await _ontology_context(keyword)
+
+    # 3. Gemini로 SEO 최적화 콘텐츠 생성
+    custom_prompt = config.custom_prompt or f"{keyword} 주제로 SEO 최적화 블로그 글을 작성하세요."
+    word_range = target_blog.word_range or {"min": 800, "max": 1200}
+    image_count = target_blog.image_count or config.image_count or 3
+
+    html_result = await generate_html(
+        topic=keyword,
+        persona=target_blog.persona or "전문 블로거",
+        prompt=custom_prompt,
+        word_count_range=(word_range.get("min", 800), word_range.get("max", 1200)),
+        image_count=image_count,
+        keywords=[keyword]
+    )
+
+    # 4. DB에 포스트 저장
+    title = html_result.get("title", "Untitled Auto Post")
+    post_id = await asyncio.to_thread(_insert_draft_post, {
+        "blog_id": target_blog.id,
+        "title": title,
+        "content": html_result.get("html", ""),
+        "status": "DRAFT",
+        "seo_title_length": html_result.get("seo_title_length"),
+        "meta_description_length": html_result.get("meta_description_length"),
+        "cta_text": html_result.get("cta_text"),
+        "expected_image_count": image_count,
+        "img_gen_status": "PROCESSING",
+    })
+    LOGGER.info(f"[Post Created] ID {post_id} / Title: {title}")
+
+    from app.api.v1.posts import validate_and_fix_image_prompts
+    import uuid
+    import re
+
+    img_prompts = html_result.get("image_prompts") or []
+    img_prompts, _ = validate_and_fix_image_prompts(keyword, img_prompts)
+
+    gen_key = uuid.uuid4().hex[:6]
+    safe_kw = re.sub(r"[^a-zA-Z0-9가-힣]", "", keyword)[:10]
+
+    fnames = [f"auto-{safe_kw}-{gen_key}-{i+1}.png" for i in range(image_count)]
+    prompts = [
+        img_prompts[i] if i < len(img_prompts) else f"{keyword} photography"
+        for i in range(image_count)
+    ]
+    return PostDraft(post_id=post_id, keyword=keyword, prompts=prompts, filenames=fnames)
+
+
+async def publish_when_images_ready(user_id: int, target_blog: models.Blog, draft: PostDraft) -> None:
+    """이미지 완료 대기 → 발행 → 키워드 사용 처리 (DB 접근은 모두 스레드에서 실행)."""
+    # 이미지 완료 대기 (워커 이벤트로 즉시 깨어남)
+    img_gen_status = await wait_for_post_images(draft.post_id, timeout=PIPELINE_IMAGE_TIMEOUT_SECONDS)
+    if img_gen_status is None:
+        LOGGER.error(
+            f"이미지 생성 대기 시간 초과({PIPELINE_IMAGE_TIMEOUT_SECONDS:.0f}초). 자동 포스팅을 중단합니다. 포스트 ID: {draft.post_id}"
+        )
+        await asyncio.to_thread(
+            _finish_post_sync,
+            draft.post_id,
+            {models.Post.status: "PUBLISH_FAILED", models.Post.img_gen_status: "TIMEOUT"},
+            user_id,
+            draft.keyword,
+            False,
+            draft.reserved_at,
+        )
+        return
+    if img_gen_status in ["FAILED", "TIMEOUT"]:
+        LOGGER.warning(f"이미지 생성 중 일부 오류 발생({img_gen_status}), 하지만 포스팅 시도")
+
+    # 6. 블로그 플랫폼 API로 자동 발행
+    # 이미지 경로가 포함된 상태로 다시 구성
+    publish_payload = await asyncio.to_thread(_read_post_for_publish, draft.post_id)
+    if publish_payload is None:
+        raise RuntimeError(f"post {draft.post_id} disappeared before publish")
+    try:
+        publish_result = await publish_post(target_blog, publish_payload)
+        values = {models.Post.status: "PUBLISHED", models.Post.published_url: publish_result.get("url")}
+        LOGGER.info(f"[Published] {publish_result.get('platform')}: {publish_result.get('url')}")
+    except Exception as e:
+        LOGGER.error(f"[Publish Failed] {e}")
+        values = {models.Post.status: "PUBLISH_FAILED"}
+
+    # 7. 결과 기록 + 키워드 사용 처리
+    await asyncio.to_thread(_finish_post_sync, draft.post_id, values, user_id, draft.keyword, True)
+
+
+@dataclass(eq=False)
+class PipelineJob:
+    user_id: int
+    keyword: str
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.monotonic)
+    draft: PostDraft | None = None
+    reserved_at: datetime | None = None
+
+
+class _FairQueue:
+    """사용자(테넌트)별 라운드 로빈으로 꺼내는 비동기 큐."""
+
+    def __init__(self):
+        self._by_tenant: OrderedDict[int, deque] = OrderedDict()
+        self._items = asyncio.Semaphore(0)
+
+    def put(self, tenant: int, item) -> None:
+        self._by_tenant.setdefault(tenant, deque()).append(item)
+        self._items.release()
+
+    async def get(self):
+        await self._items.acquire()
+        tenant, items = next(iter(self._by_tenant.items()))
+        item = items.popleft()
+        if items:
+            self._by_tenant.move_to_end(tenant)
+        else:
+            del self._by_tenant[tenant]
+        return item
+
+    def qsize(self) -> int:
+        return sum(len(items) for items in self._by_tenant.values())
+
+
+class PostPipeline:
+    def __init__(self, text_workers: int = PIPELINE_TEXT_WORKERS, publish_workers: int = PIPELINE_PUBLISH_WORKERS):
+        self.text_workers = max(text_workers, 1)
+        self.publish_workers = max(publish_workers, 1)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._workers: list[asyncio.Task] = []
+        self._text_queue: _FairQueue | None = None
+        self._image_queue: asyncio.Queue | None = None
+        self._publish_queue: asyncio.Queue | None = None
+        self._stats = {"submitted": 0, "drafted": 0, "text_failed": 0, "published": 0, "publish_failed": 0}
+        self._busy = {"text": 0, "publish": 0}
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._workers)
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self.running:
+            return
+        from app.services.image_queue_service import image_queue_worker
+        # cron/스크립트처럼 서버 startup 훅이 없는 프로세스에서도 현재 루프에 이미지 워커를 띄움
+        image_queue_worker.ensure_running()
+        self._loop = loop
+        self._text_queue = _FairQueue()
+        self._image_queue = asyncio.Queue()
+        self._publish_queue = asyncio.Queue()
+        self._busy = {"text": 0, "publish": 0}
+        self._workers = [
+            *(loop.create_task(self._text_worker()) for _ in range(self.text_workers)),
+            loop.create_task(self._image_worker()),
+            *(loop.create_task(self._publish_worker()) for _ in range(self.publish_workers)),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def run(self, user_id: int, keywords: list[str], reserved_at: datetime | None = None) -> list[int | None]:
+        """
+        키워드마다 포스트 1건을 파이프라인에 넣고, 모두 끝나면 포스트 ID 목록을 반환합니다.
+        reserved_at: 키워드 점유 토큰 (get_next_keywords에 넘긴 값). 발행하지 못한 키워드는 이 토큰으로 해제합니다.
+        """
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        jobs = [
+            PipelineJob(user_id=user_id, keyword=keyword, future=loop.create_future(), reserved_at=reserved_at)
+            for keyword in keywords
+        ]
+        for job in jobs:
+            self._stats["submitted"] += 1
+            self._text_queue.put(user_id, job)
+        return list(await asyncio.gather(*(job.future for job in jobs)))
+
+    @staticmethod
+    async def _release(job: PipelineJob) -> None:
+        """발행까지 가지 못한 작업의 키워드 점유 해제 (해제 실패는 점유 만료로 회수되므로 로그만)."""
+        if job.reserved_at is None:
+            return
+        try:
+            await asyncio.to_thread(_release_sync, job.user_id, job.keyword, job.reserved_at)
+        except Exception as e:
+            LOGGER.warning(f"[Keyword] 점유 해제 실패 ({job.keyword}): {e}")
+
+    @staticmethod
+    def _finish(job: PipelineJob, post_id: int | None) -> None:
+        if not job.future.done():
+            job.future.set_result(post_id)
+
+    # AS-IS: 워커마다 SessionLocal을 열어 이벤트 루프에서 조회/커밋 → DB 대기 동안 루프 전체가 멈춤.
+    # TO-BE: DB 작업은 asyncio.to_thread 헬퍼(각자 세션을 열고 닫음)로 보내고,
+    #        루프에서는 크롤러/Gemini/이미지 대기/발행 API만 await 합니다.
+    async def _text_worker(self) -> None:
+        while True:
+            job = await self._text_queue.get()
+            self._busy["text"] += 1
+            try:
+                config, target_blog = await asyncio.to_thread(_load_publish_target, job.user_id, True)
+                if not config or not target_blog:
+                    raise RuntimeError(f"user {job.user_id} has no blog/config")
+                job.draft = await write_post_draft(config, target_blog, job.keyword)
+                job.draft.reserved_at = job.reserved_at
+                self._stats["drafted"] += 1
+                self._image_queue.put_nowait(job)
+            except asyncio.CancelledError:
+                self._finish(job, None)
+                raise
+            except Exception as e:
+                self._stats["text_failed"] += 1
+                LOGGER.error(f"[Fail] AI Generation failed ({job.keyword}): {str(e)}")
+                await self._release(job)
+                self._finish(job, None)
+            finally:
+                self._busy["text"] -= 1
+
+    async def _image_worker(self) -> None:
+        while True:
+            # 도착해 있는 초안을 모두 모아 한 트랜잭션으로 등록 (기다리지는 않음)
+            jobs = [await self._image_queue.get()]
+            while not self._image_queue.empty():
+                jobs.append(self._image_queue.get_nowait())
+            try:
+                await asyncio.to_thread(
+                    _enqueue_images_sync, [(j.draft.post_id, j.draft.prompts, j.draft.filenames) for j in jobs]
+                )
+                for job in jobs:
+                    self._publish_queue.put_nowait(job)
+            except asyncio.CancelledError:
+                for job in jobs:
+                    self._finish(job, job.draft.post_id)
+                raise
+            except Exception as e:
+                LOGGER.error(f"[Fail] Image enqueue failed ({len(jobs)} posts): {e}")
+                for job in jobs:
+                    await self._release(job)
+                    self._finish(job, job.draft.post_id)
+
+    async def _publish_worker(self) -> None:
+        while True:
+            job = await self._publish_queue.get()
+            self._busy["publish"] += 1
+            try:
+                _, target_blog = await asyncio.to_thread(_load_publish_target, job.user_id)
+                await publish_when_images_ready(job.user_id, target_blog, job.draft)
+                self._stats["published"] += 1
+            except asyncio.CancelledError:
+                self._finish(job, job.draft.post_id)
+                raise
+            except Exception as e:
+                self._stats["publish_failed"] += 1
+                LOGGER.error(f"[Fail] Publish stage failed (post {job.draft.post_id}): {str(e)}")
+                await self._release(job)
+            finally:
+                self._busy["publish"] -= 1
+                self._finish(job, job.draft.post_id)
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "text_queue": self._text_queue.qsize() if self._text_queue else 0,
+            "image_queue": self._image_queue.qsize() if self._image_queue else 0,
+            "publish_queue": self._publish_queue.qsize() if self._publish_queue else 0,
+            "text_busy": self._busy["text"],
+            "publish_busy": self._busy["publish"],
+            **self._stats,
+        }
+
+
+post_pipeline = PostPipeline()
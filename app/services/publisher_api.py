@@ -14,6 +14,7 @@ from typing import Dict, Optional
 import httpx
 from app.models.sql_models import Blog
 from app.core.config import settings
+from app.core.http_client import get_client
 
 LOGGER = logging.getLogger(__name__)
 
@@ -50,10 +51,10 @@ async def publish_to_blogger(blog: Blog, html_result: Dict) -> Dict:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(url, headers=headers, json=payload)
-            resp.raise_for_status()
-            result = resp.json()
+        client = get_client("publisher")
+        resp = await client.post(url, headers=headers, json=payload)
+        resp.raise_for_status()
+        result = resp.json()
         
         LOGGER.info(f"블로거 발행 성공: {result.get('url')}")
         return {
@@ -102,10 +103,10 @@ async def publish_to_tistory(blog: Blog, html_result: Dict) -> Dict:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(url, params=params)
-            resp.raise_for_status()
-            result = resp.json()
+        client = get_client("publisher")
+        resp = await client.post(url, params=params)
+        resp.raise_for_status()
+        result = resp.json()
         
         if result.get("tistory", {}).get("status") == "200":
             post_id = result["tistory"]["postId"]
@@ -171,10 +172,10 @@ async def publish_to_inblog(blog: Blog, html_result: Dict) -> Dict:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(url, headers=headers, json=payload)
-            resp.raise_for_status()
-            result = resp.json()
+        client = get_client("publisher")
+        resp = await client.post(url, headers=headers, json=payload)
+        resp.raise_for_status()
+        result = resp.json()
         
         post_url = result.get("url") or f"https://inblog.ai/post/{result.get('id')}"
         LOGGER.info(f"인블로그 발행 성공: {post_url}")
@@ -0,0 +1,110 @@
+"""
+비동기 토큰 버킷 / 동시 실행 한도.
+
+외부 API 쿼터(Gemini RPM/TPM, 검색 호스트별 요청 속도 등)를 프로세스 안에서 지키기 위한 공용 유틸입니다.
+- AsyncTokenBucket: 초당 rate만큼 채워지는 버킷. acquire()는 도착 순서(FIFO)대로 토큰을 배정합니다.
+- 실제 사용량이 예상보다 많았던 경우 consume()으로 사후 차감(음수 허용)하여 다음 호출이 그만큼 기다리게 합니다.
+
+asyncio.run()이 여러 번 호출되는 스크립트 환경을 위해 Lock은 이벤트 루프별로 다시 만듭니다.
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float):
+        if rate_per_second <= 0 or capacity <= 0:
+            raise ValueError("AsyncTokenBucket requires positive rate and capacity")
+        self.rate = float(rate_per_second)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def per_minute(cls, amount: float) -> "AsyncTokenBucket":
+        """분당 amount (버스트 상한 = amount)."""
+        return cls(rate_per_second=amount / 60.0, capacity=amount)
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def consume(self, amount: float) -> None:
+        """대기 없이 차감합니다 (사후 정산용, 음수가 될 수 있음. 음수 amount는 환급)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        amount만큼 토큰이 쌓일 때까지 대기 후 차감합니다. 반환값: 대기한 시간(초).
+        버킷 용량보다 큰 요청은 용량만큼만 기다린 뒤 나머지를 부채로 남깁니다.
+        """
+        need = min(float(amount), self.capacity)
+        waited = 0.0
+        # Lock을 잡은 채로 기다리므로 뒤에 온 호출자가 앞지르지 못함 (FIFO)
+        async with self._get_lock():
+            while True:
+                self._refill()
+                if self._tokens >= need:
+                    self._tokens -= amount
+                    return waited
+                delay = (need - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class ConcurrencyLimiter:
+    """이벤트 루프별로 재생성되는 Semaphore (최대 동시 실행 수)."""
+
+    def __init__(self, limit: int):
+        self.limit = max(int(limit), 1)
+        self.in_flight = 0
+        # 대기 중 + 실행 중인 호출 수 (0이면 유휴 → 호출자가 레지스트리에서 정리 가능)
+        self.pending = 0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+            self.in_flight = 0
+            self.pending = 0
+        return self._semaphore
+
+    @property
+    def idle(self) -> bool:
+        return self.pending == 0
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        semaphore = self._get_semaphore()
+        self.pending += 1
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            self.pending -= 1
+            raise
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.in_flight -= 1
+        self.pending -= 1
+        self._get_semaphore().release()
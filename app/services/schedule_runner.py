@@ -0,0 +1,279 @@
+"""
+상주 스케줄러 (프로세스 내 실행 시각 인덱스).
+
+AS-IS: 외부 cron이 매분 scripts/run_batch.py를 실행 → 활성 스케줄 전체를 조회해 "%H:%M" 문자열을 비교.
+       cron이 1분만 늦어도 그 슬롯은 조용히 누락되고, 실행할 것이 없어도 매분 전체 테이블을 스캔.
+TO-BE: 서버 startup(또는 scripts/run_scheduler.py)에서 한 번 스케줄을 읽어
+       (다음 실행 시각, schedule_id) 최소 힙을 만들고, 가장 이른 시각까지 정확히 잠들었다가 깨어납니다.
+- 재시작/지연으로 놓친 슬롯은 SCHEDULER_GRACE_SECONDS 안이면 따라잡아 실행, 그보다 오래되면 건너뜀(로그)
+- dashboard/config에서 스케줄을 저장하면 notify_changed(schedule_id)로 해당 스케줄만 다시 계산
+- 슬롯 점유는 last_run_at CAS(claim_slot)라서 cron 배치나 다른 서버 인스턴스와 동시에 돌아도 중복 실행되지 않음
+- 다른 프로세스에서 저장된 변경(별도 스케줄러 프로세스 등)은 SCHEDULER_RESYNC_SECONDS 주기의 전체 재적재로 반영
+
+환경변수:
+- SCHEDULER_ENABLED (기본 true): API 서버 startup에서 스케줄러 실행 여부
+- SCHEDULER_RESYNC_SECONDS (기본 600)
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from app.core.database import SessionLocal
+from app.models import sql_models as models
+from app.services.scheduler_service import (
+    SCHEDULER_GRACE_SECONDS,
+    ScheduledBatchReport,
+    _as_local_naive,
+    charge_schedule_slot,
+    log_report,
+    next_slot_after,
+    run_due_schedules,
+    split_charge_results,
+)
+
+LOGGER = logging.getLogger("schedule_runner")
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+SCHEDULER_RESYNC_SECONDS = float(os.getenv("SCHEDULER_RESYNC_SECONDS", "600"))
+
+
+@dataclass(frozen=True)
+class ScheduleEntry:
+    """힙 계산에 필요한 스케줄 스냅샷 (세션과 분리)."""
+
+    schedule_id: int
+    user_id: int
+    frequency: str
+    active_days: tuple
+    target_times: tuple
+    last_run_at: datetime | None
+
+    @classmethod
+    def from_model(cls, schedule: models.ScheduleConfig) -> "ScheduleEntry":
+        return cls(
+            schedule_id=schedule.id,
+            user_id=schedule.user_id,
+            frequency=schedule.frequency,
+            active_days=tuple(schedule.active_days or ()),
+            target_times=tuple(schedule.target_times or ()),
+            last_run_at=_as_local_naive(schedule.last_run_at),
+        )
+
+    def next_after(self, after: datetime) -> datetime | None:
+        return next_slot_after(self.frequency, self.active_days, self.target_times, after)
+
+
+def _load_entries(schedule_ids: list[int] | None = None) -> dict[int, ScheduleEntry | None]:
+    """
+    활성 스케줄을 읽습니다. schedule_ids를 주면 해당 스케줄만 읽고,
+    비활성/삭제된 스케줄은 None으로 돌려줍니다 (힙에서 제거하도록).
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(models.ScheduleConfig)
+        if schedule_ids is not None:
+            query = query.filter(models.ScheduleConfig.id.in_(schedule_ids))
+        else:
+            query = query.filter(models.ScheduleConfig.is_active == True)
+        found = {s.id: ScheduleEntry.from_model(s) for s in query.all() if s.is_active}
+        if schedule_ids is None:
+            return found
+        return {sid: found.get(sid) for sid in schedule_ids}
+    finally:
+        db.close()
+
+
+def _claim_due(slots: list[tuple[int, datetime]]):
+    """슬롯 점유 + 크레딧 차감 (스레드에서 실행)."""
+    db = SessionLocal()
+    try:
+        policy = db.query(models.SystemPolicy).first()
+        results = []
+        for schedule_id, slot in slots:
+            schedule = db.query(models.ScheduleConfig).filter(models.ScheduleConfig.id == schedule_id).first()
+            if schedule is None or not schedule.is_active:
+                continue
+            results.append(charge_schedule_slot(db, schedule, policy, slot))
+        return split_charge_results(results)
+    finally:
+        db.close()
+
+
+class ScheduleRunner:
+    def __init__(
+        self,
+        grace_seconds: float = SCHEDULER_GRACE_SECONDS,
+        resync_seconds: float = SCHEDULER_RESYNC_SECONDS,
+    ):
+        self.grace_seconds = grace_seconds
+        self.resync_seconds = resync_seconds
+        self._entries: dict[int, ScheduleEntry] = {}
+        self._next_due: dict[int, datetime] = {}
+        # (due_at, schedule_id). 스케줄이 바뀌면 새 항목을 넣고, 오래된 항목은 꺼낼 때 _next_due와 비교해 버림
+        self._heap: list[tuple[datetime, int]] = []
+        self._dirty: set[int] = set()
+        self._task: asyncio.Task | None = None
+        self._runs: set[asyncio.Task] = set()
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._last_resync: float | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        # 진행 중인 생성은 취소됨 (슬롯/크레딧은 이미 처리된 상태이므로 로그로 남김)
+        if self._runs:
+            LOGGER.warning("Stopping scheduler with %d run batch(es) in progress", len(self._runs))
+        tasks = [t for t in (self._task, *self._runs) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._runs = set()
+
+    def notify_changed(self, schedule_id: int) -> None:
+        """스케줄 저장 후 호출 (동기 라우트의 스레드풀에서 호출해도 안전)."""
+        if self._loop is None or self._loop.is_closed() or not self.running:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._mark_dirty(schedule_id)
+        else:
+            self._loop.call_soon_threadsafe(self._mark_dirty, schedule_id)
+
+    def _mark_dirty(self, schedule_id: int) -> None:
+        self._dirty.add(schedule_id)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _push(self, entry: ScheduleEntry, after: datetime) -> None:
+        self._entries[entry.schedule_id] = entry
+        due_at = entry.next_after(after)
+        if due_at is None:
+            self._next_due.pop(entry.schedule_id, None)
+            return
+        self._next_due[entry.schedule_id] = due_at
+        heapq.heappush(self._heap, (due_at, entry.schedule_id))
+
+    def _drop(self, schedule_id: int) -> None:
+        self._entries.pop(schedule_id, None)
+        self._next_due.pop(schedule_id, None)
+
+    def _catch_up_from(self, entry: ScheduleEntry, now: datetime) -> datetime:
+        """grace 안의 놓친 슬롯부터 다시 보도록 기준 시각을 정합니다 (이미 실행한 슬롯 이후)."""
+        floor = now - timedelta(seconds=self.grace_seconds)
+        if entry.last_run_at is not None and entry.last_run_at > floor:
+            return entry.last_run_at
+        return floor
+
+    async def _resync(self) -> None:
+        entries = await asyncio.to_thread(_load_entries)
+        now = datetime.now()
+        self._entries = {}
+        self._next_due = {}
+        self._heap = []
+        for entry in entries.values():
+            self._push(entry, self._catch_up_from(entry, now))
+        self._last_resync = time.monotonic()
+        LOGGER.info("Scheduler index loaded: %d schedule(s), next=%s", len(self._next_due), self._peek())
+
+    async def _reload_dirty(self) -> None:
+        schedule_ids = sorted(self._dirty)
+        self._dirty.clear()
+        entries = await asyncio.to_thread(_load_entries, schedule_ids)
+        now = datetime.now()
+        for schedule_id, entry in entries.items():
+            if entry is None:
+                self._drop(schedule_id)
+            else:
+                # 저장 시점 이전 슬롯은 따라잡지 않음 (설정 변경이 곧바로 과거 슬롯 실행으로 이어지지 않도록)
+                after = max(now, entry.last_run_at) if entry.last_run_at else now
+                self._push(entry, after)
+
+    def _peek(self) -> datetime | None:
+        while self._heap:
+            due_at, schedule_id = self._heap[0]
+            if self._next_due.get(schedule_id) == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime) -> list[tuple[int, datetime]]:
+        due: list[tuple[int, datetime]] = []
+        while (due_at := self._peek()) is not None and due_at <= now:
+            _, schedule_id = heapq.heappop(self._heap)
+            entry = self._entries[schedule_id]
+            if (now - due_at).total_seconds() > self.grace_seconds:
+                LOGGER.warning(
+                    "Skipping missed slot %s for schedule %s (beyond %ss grace)", due_at, schedule_id, self.grace_seconds
+                )
+            else:
+                due.append((schedule_id, due_at))
+            self._push(entry, due_at)
+        return due
+
+    async def _dispatch(self, due: list[tuple[int, datetime]]) -> None:
+        runs, skipped = await asyncio.to_thread(_claim_due, due)
+        label = ", ".join(sorted({slot.strftime("%a %H:%M").upper() for _, slot in due}))
+        report = ScheduledBatchReport(slot=label, outcomes=list(skipped))
+        if not runs:
+            if skipped:
+                log_report(report)
+            return
+
+        async def execute() -> None:
+            report.outcomes.extend(await run_due_schedules(runs))
+            log_report(report)
+
+        task = asyncio.create_task(execute())
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._last_resync is None or time.monotonic() - self._last_resync >= self.resync_seconds:
+                    await self._resync()
+                if self._dirty:
+                    await self._reload_dirty()
+
+                due = self._pop_due(datetime.now())
+                if due:
+                    await self._dispatch(due)
+                    continue
+
+                timeout = max(self.resync_seconds - (time.monotonic() - self._last_resync), 0.0)
+                next_due = self._peek()
+                if next_due is not None:
+                    timeout = min(timeout, max((next_due - datetime.now()).total_seconds(), 0.0))
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                LOGGER.exception("Scheduler loop error")
+                await asyncio.sleep(5)
+
+
+schedule_runner = ScheduleRunner()
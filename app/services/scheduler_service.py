@@ -1,221 +1,444 @@
 import asyncio
-from datetime import datetime
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dtime, timedelta
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.services.rate_limiter import ConcurrencyLimiter
 from app.models import sql_models as models
-from app.agents.writer import WriterAgent
-from app.agents.publisher import PublisherAgent
-from app.agents.knowledge import KnowledgeAgent
-from app.agents.crawler import CrawlerAgent
-# TO-BE: 키워드 큐 및 발행 API 연동
-from app.services.keyword_service import get_next_keyword, mark_keyword_used
-from app.services.publisher_api import publish_post
-from app.services.gemini_service import generate_html
+# TO-BE: 키워드 큐 연동
+from app.services.keyword_service import get_next_keywords
+from app.services.post_pipeline import post_pipeline
 import logging
 
 LOGGER = logging.getLogger(__name__)
 
+# 동시에 실행할 자동 포스팅 파이프라인 수 (Gemini/ComfyUI 호출은 각자의 리미터/풀이 다시 제한)
+SCHEDULER_MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "8"))
+# 한 사용자(테넌트)가 동시에 점유할 수 있는 파이프라인 수
+SCHEDULER_MAX_PER_TENANT = int(os.getenv("SCHEDULER_MAX_PER_TENANT", "1"))
+# 예정 시각을 놓쳤을 때(cron 지연, 서버 재시작 등) 이 시간 안이면 따라잡아 실행
+SCHEDULER_GRACE_SECONDS = float(os.getenv("SCHEDULER_GRACE_SECONDS", "900"))
 
-async def generate_and_save_post(db: Session, user: models.User, config: models.BlogConfig):
-    """
-    TO-BE: 키워드 큐 기반 자동 포스팅 생성 및 발행
-    
-    1. 키워드 큐에서 다음 키워드 가져오기 (순환 로직)
-    2. Gemini로 SEO 최적화 콘텐츠 생성
-    3. 블로그 플랫폼 API로 자동 발행
-    4. 키워드 사용 처리
-    """
-    LOGGER.info(f"[Process Start] User {user.email} / Category: {config.default_category}")
-    
-    target_blog = db.query(models.Blog).filter(models.Blog.owner_id == user.id).first()
-    if not target_blog:
-        LOGGER.error(f"[Error] No blog found for user {user.id}")
-        return
-
-    # 1. 키워드 큐에서 다음 키워드 가져오기
-    keyword = get_next_keyword(db, user.id)
-    if not keyword:
-        keyword = config.default_category or "최신 트렌드"
-        LOGGER.warning(f"키워드 큐가 비어있어 기본 카테고리 사용: {keyword}")
-    
-    LOGGER.info(f"[Keyword] 선택된 키워드: {keyword}")
-    
-    # 2. 크롤러로 최신 정보 수집 (선택)
-    crawler = CrawlerAgent()
-    knowledge_agent = KnowledgeAgent(db)
-    crawled_summary = ""
-    try:
-        crawled_data = await crawler.fetch_latest_news(keyword)
-        crawled_summary = await knowledge_agent.update_ontology(keyword, crawled_data)
-        LOGGER.info("[Crawler] 온톨로지 업데이트 완료")
-    except Exception as e:
-        LOGGER.warning(f"[Crawler Error] {e}")
-    
-    # 3. Gemini로 SEO 최적화 콘텐츠 생성
-    ontology_context = await knowledge_agent.search_ontology(query=keyword)
-    full_context = f"{crawled_summary}\n{ontology_context}"
-    
-    custom_prompt = config.custom_prompt or f"{keyword} 주제로 SEO 최적화 블로그 글을 작성하세요."
-    word_range = target_blog.word_range or {"min": 800, "max": 1200}
-    image_count = target_blog.image_count or config.image_count or 3
-    
+# 배치가 겹쳐도(상주 스케줄러에서 다음 슬롯이 먼저 도래) 한도를 공유하도록 모듈 단위로 유지
+_global_limit = ConcurrencyLimiter(SCHEDULER_MAX_CONCURRENCY)
+# 실행 중/대기 중인 테넌트만 보관 (유휴가 되면 제거해 사용자 수만큼 계속 늘어나지 않도록)
+_tenant_limits: dict[int, ConcurrencyLimiter] = {}
+
+
+async def generate_and_save_posts(user_id: int, count: int) -> list[int | None]:
+    """
+    AS-IS: 한 슬롯에 포스트 1건만 생성 (posts_per_day는 저장만 되고 사용되지 않음).
+    TO-BE: 슬롯당 count건을 생성합니다.
+    1. 키워드 count개를 한 번에 선택·점유 (get_next_keywords, 포스트끼리/겹쳐 도는 실행끼리 키워드가 겹치지 않음)
+    2. 공용 파이프라인(post_pipeline)에 넣어 텍스트 → 이미지 → 발행 단계를 다른 포스트/사용자와 겹쳐 실행
+
+    Returns:
+        list[int | None]: 포스트 ID (텍스트 단계에서 실패한 건은 None)
+    """
+    reserved_at = datetime.now()
+    db = SessionLocal()
     try:
-        html_result = await generate_html(
-            topic=keyword,
-            persona=target_blog.persona or "전문 블로거",
-            prompt=custom_prompt,
-            word_count_range=(word_range.get("min", 800), word_range.get("max", 1200)),
-            image_count=image_count,
-            keywords=[keyword]
-        )
-        
-        # 4. DB에 포스트 저장
-        new_post = models.Post(
-            blog_id=target_blog.id,
-            title=html_result.get("title", "Untitled Auto Post"),
-            content=html_result.get("html", ""),
-            status="DRAFT",
-            seo_title_length=html_result.get("seo_title_length"),
-            meta_description_length=html_result.get("meta_description_length"),
-            cta_text=html_result.get("cta_text"),
-            expected_image_count=image_count,
-            img_gen_status="PROCESSING"
+        user = db.query(models.User).filter(models.User.id == user_id).first()
+        config = user.blog_config if user else None
+        if not config:
+            return [None] * count
+        LOGGER.info(f"[Process Start] User {user.email} / Category: {config.default_category} / x{count}")
+        if not db.query(models.Blog.id).filter(models.Blog.owner_id == user_id).first():
+            LOGGER.error(f"[Error] No blog found for user {user_id}")
+            return [None] * count
+        keywords = get_next_keywords(db, user_id, count, reserved_at=reserved_at)
+        if not keywords:
+            fallback = config.default_category or "최신 트렌드"
+            LOGGER.warning(f"키워드 큐가 비어있어 기본 카테고리 사용: {fallback}")
+            keywords = [fallback] * count
+    finally:
+        db.close()
+
+    return await post_pipeline.run(user_id, keywords, reserved_at=reserved_at)
+
+
+@dataclass
+class DueRun:
+    """크레딧 차감까지 끝난 실행 예정 건 (세션과 분리된 ID만 보관)."""
+
+    schedule_id: int
+    user_id: int
+    cost: int  # 슬롯 전체 차감액
+    posts: int = 1
+
+
+@dataclass
+class ScheduledRunOutcome:
+    schedule_id: int
+    user_id: int
+    status: str  # PUBLISHED | PUBLISH_FAILED | DRAFT | FAILED | SKIPPED_NO_CONFIG | SKIPPED_NO_CREDIT ...
+    cost: int = 0
+    post_id: int | None = None
+    error: str | None = None
+    started_at: datetime | None = None
+    duration_seconds: float = 0.0
+    queued_seconds: float = 0.0
+
+
+@dataclass
+class ScheduledBatchReport:
+    slot: str
+    outcomes: list[ScheduledRunOutcome] = field(default_factory=list)
+
+    @property
+    def counts(self) -> dict:
+        counts: dict[str, int] = defaultdict(int)
+        for outcome in self.outcomes:
+            counts[outcome.status] += 1
+        return dict(counts)
+
+
+def _as_local_naive(value: datetime | None) -> datetime | None:
+    """DB에서 읽은 last_run_at(SQLite=naive, Postgres=aware)을 로컬 naive 시각으로 맞춥니다."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _parse_target_times(target_times) -> list[dtime]:
+    parsed = set()
+    for raw in target_times or []:
+        try:
+            hour, minute = str(raw).strip().split(":")[:2]
+            parsed.add(dtime(int(hour), int(minute)))
+        except (TypeError, ValueError):
+            LOGGER.warning(f"[Scheduler] Ignoring invalid target time: {raw!r}")
+    return sorted(parsed)
+
+
+def _runs_on(frequency, active_days, day: date) -> bool:
+    if frequency == models.Frequency.WEEKLY:
+        return bool(active_days) and day.strftime("%a").upper() in active_days
+    return True
+
+
+def next_slot_after(frequency, active_days, target_times, after: datetime) -> datetime | None:
+    """after 이후(초과) 가장 가까운 실행 시각. 실행 요일/시각이 없으면 None."""
+    times = _parse_target_times(target_times)
+    if not times:
+        return None
+    for offset in range(8):
+        day = after.date() + timedelta(days=offset)
+        if not _runs_on(frequency, active_days, day):
+            continue
+        for t in times:
+            slot = datetime.combine(day, t)
+            if slot > after:
+                return slot
+    return None
+
+
+def latest_slot_at_or_before(frequency, active_days, target_times, at: datetime) -> datetime | None:
+    """at 이하에서 가장 최근 실행 시각 (최대 7일 전까지)."""
+    times = _parse_target_times(target_times)
+    if not times:
+        return None
+    for offset in range(8):
+        day = at.date() - timedelta(days=offset)
+        if not _runs_on(frequency, active_days, day):
+            continue
+        for t in reversed(times):
+            slot = datetime.combine(day, t)
+            if slot <= at:
+                return slot
+    return None
+
+
+def posts_for_slot(target_times, posts_per_day: int | None, slot: datetime) -> int:
+    """
+    슬롯 하나에서 생성할 포스트 수.
+    - 같은 시각이 target_times에 여러 번 있으면 그 횟수만큼 (설정 화면은 포스트마다 시각을 하나씩 저장)
+    - posts_per_day가 target_times 개수보다 많으면 남는 수를 시각 순서대로 나눠 배정
+      (예: 시각 2개, 하루 5건 → 3건 + 2건)
+    """
+    times = [t for raw in (target_times or []) for t in _parse_target_times([raw])]
+    distinct = sorted(set(times))
+    if slot.time() not in distinct:
+        return 1
+    count = times.count(slot.time())
+    extra = max((posts_per_day or 0) - len(times), 0)
+    base, remainder = divmod(extra, len(distinct))
+    count += base + (1 if distinct.index(slot.time()) < remainder else 0)
+    return max(count, 1)
+
+
+def due_slot(schedule: models.ScheduleConfig, now: datetime, grace_seconds: float = SCHEDULER_GRACE_SECONDS) -> datetime | None:
+    """
+    AS-IS: now.strftime("%H:%M") in target_times 로 비교 → cron이 1분만 늦어도 해당 슬롯이 조용히 누락.
+    TO-BE: now 이하의 가장 최근 슬롯이 grace 안에 있고 아직 실행되지 않았으면(last_run_at < slot) 그 슬롯을 반환.
+    """
+    slot = latest_slot_at_or_before(schedule.frequency, schedule.active_days, schedule.target_times, now)
+    if slot is None or (now - slot).total_seconds() > grace_seconds:
+        return None
+    last_run_at = _as_local_naive(schedule.last_run_at)
+    if last_run_at is not None and last_run_at >= slot:
+        return None
+    return slot
+
+
+def claim_slot(db: Session, schedule_id: int, slot: datetime) -> bool:
+    """
+    last_run_at을 CAS로 slot까지 올립니다 (커밋은 호출자).
+    cron 배치/상주 스케줄러/여러 서버 인스턴스가 같은 슬롯을 동시에 보더라도 한 곳만 성공합니다.
+    """
+    claimed = (
+        db.query(models.ScheduleConfig)
+        .filter(
+            models.ScheduleConfig.id == schedule_id,
+            (models.ScheduleConfig.last_run_at.is_(None)) | (models.ScheduleConfig.last_run_at < slot),
         )
-        db.add(new_post)
-        db.commit()
-        db.refresh(new_post)
-        LOGGER.info(f"[Post Created] ID {new_post.id} / Title: {new_post.title}")
-
-        # 5. 이미지 생성 프로세스 (동기 방식으로 대기)
-        from app.api.v1.posts import process_image_generation, validate_and_fix_image_prompts
-        import uuid
-        import re
-
-        img_prompts = html_result.get("image_prompts") or []
-        img_prompts, _ = validate_and_fix_image_prompts(keyword, img_prompts)
-        
-        gen_key = uuid.uuid4().hex[:6]
-        safe_kw = re.sub(r"[^a-zA-Z0-9가-힣]", "", keyword)[:10]
-        
-        for i in range(image_count):
-            fname = f"auto-{safe_kw}-{gen_key}-{i+1}.png"
-            prompt = img_prompts[i] if i < len(img_prompts) else f"{keyword} photography"
-            # 백그라운드 태스크 대신 직접 await 하여 완료를 기다림
-            await process_image_generation(new_post.id, i+1, prompt, fname)
-        
-        # 최신 상태 리프레시 (이미지 생성 완료 대기)
-        max_retries = 30 # 최대 5분 (10초 * 30)
-        images_ready = False
-        for _ in range(max_retries):
-            db.refresh(new_post)
-            if new_post.img_gen_status == "COMPLETED":
-                images_ready = True
-                break
-            if new_post.img_gen_status in ["FAILED", "TIMEOUT"]:
-                LOGGER.warning(f"이미지 생성 중 일부 오류 발생({new_post.img_gen_status}), 하지만 포스팅 시도")
-                images_ready = True # 일부 실패해도 일단 진행
-                break
-            await asyncio.sleep(10)
-        
-        if not images_ready:
-            LOGGER.error(f"이미지 생성 대기 시간 초과(5분). 자동 포스팅을 중단합니다. 포스트 ID: {new_post.id}")
-            new_post.status = "PUBLISH_FAILED"
-            new_post.img_gen_status = "TIMEOUT"
+        .update({models.ScheduleConfig.last_run_at: slot}, synchronize_session=False)
+    )
+    return claimed == 1
+
+
+def _posting_cost(policy: models.SystemPolicy, blog_config: models.BlogConfig) -> int:
+    cost = 0
+    if blog_config.post_length == models.PostLength.SHORT:
+        cost += policy.cost_short
+    elif blog_config.post_length == models.PostLength.MEDIUM:
+        cost += policy.cost_medium
+    elif blog_config.post_length == models.PostLength.LONG:
+        cost += policy.cost_long
+    cost += policy.cost_image * blog_config.image_count
+    return cost
+
+
+def charge_schedule_slot(
+    db: Session,
+    schedule: models.ScheduleConfig,
+    policy: models.SystemPolicy | None,
+    slot: datetime,
+) -> DueRun | ScheduledRunOutcome | None:
+    """
+    슬롯 1건을 점유하고 크레딧을 차감합니다 (한 트랜잭션).
+    - 다른 곳에서 이미 점유한 슬롯이면 None
+    - 설정/정책/크레딧 부족으로 건너뛰면 ScheduledRunOutcome (슬롯은 소비된 것으로 기록)
+    - 실행 대상이면 DueRun
+    """
+    user = schedule.user
+    try:
+        if not claim_slot(db, schedule.id, slot):
+            db.rollback()
+            return None
+
+        blog_config = user.blog_config
+        if not blog_config:
             db.commit()
-            return
-        
-        # 6. 블로그 플랫폼 API로 자동 발행
-        try:
-            # 이미지 경로가 포함된 상태로 다시 구성
-            publish_payload = {
-                "title": new_post.title,
-                "html": new_post.content,
-                "images": new_post.image_paths or []
-            }
-            publish_result = await publish_post(target_blog, publish_payload)
-            new_post.status = "PUBLISHED"
-            new_post.published_url = publish_result.get("url")
+            LOGGER.info(f"[Scheduler] User {user.id} has no blog config. Skipping.")
+            return ScheduledRunOutcome(schedule.id, user.id, "SKIPPED_NO_CONFIG")
+
+        if not policy:
             db.commit()
-            LOGGER.info(f"[Published] {publish_result.get('platform')}: {publish_result.get('url')}")
-        except Exception as e:
-            LOGGER.error(f"[Publish Failed] {e}")
-            new_post.status = "PUBLISH_FAILED"
+            LOGGER.warning("[Scheduler] System policy missing. Skipping.")
+            return ScheduledRunOutcome(schedule.id, user.id, "SKIPPED_NO_POLICY")
+
+        unit_cost = _posting_cost(policy, blog_config)
+        wanted = posts_for_slot(schedule.target_times, schedule.posts_per_day, slot)
+        # 크레딧이 모자라면 가능한 건수만큼만 생성
+        posts = min(wanted, user.current_credit // unit_cost) if unit_cost > 0 else wanted
+        if posts <= 0:
+            db.commit()
+            LOGGER.info(f"[Scheduler] User {user.id} skipped: Not enough credit ({user.current_credit} < {unit_cost})")
+            return ScheduledRunOutcome(schedule.id, user.id, "SKIPPED_NO_CREDIT", cost=unit_cost)
+        if posts < wanted:
+            LOGGER.info(f"[Scheduler] User {user.id}: credit covers {posts}/{wanted} posts for this slot")
+
+        cost = unit_cost * posts
+        # AS-IS: user.current_credit -= cost (읽고-수정-쓰기) → 동시에 도는 미리보기 차감/다른 인스턴스와
+        #        겹치면 한쪽 차감이 덮어써지거나 잔액이 음수가 됨.
+        # TO-BE: 잔액 조건부 UPDATE 한 번으로 차감하고, 그 사이 잔액이 줄었으면(rowcount 0) 건너뜀
+        charged = db.execute(
+            update(models.User)
+            .where(models.User.id == user.id, models.User.current_credit >= cost)
+            .values(current_credit=models.User.current_credit - cost)
+            .execution_options(synchronize_session=False)
+        )
+        if charged.rowcount != 1:
+            # 슬롯 점유는 유지 (다음 슬롯에서 다시 판단)
             db.commit()
-        
-        # 7. 키워드 사용 처리
-        mark_keyword_used(db, user.id, keyword)
-        
+            LOGGER.info(f"[Scheduler] User {user.id} skipped: credit changed before charge (needed {cost})")
+            return ScheduledRunOutcome(schedule.id, user.id, "SKIPPED_NO_CREDIT", cost=cost)
+        db.expire(user, ["current_credit"])
+        log = models.CreditLog(
+            user_id=user.id,
+            amount=-cost,
+            action_type="AUTO_POSTING",
+            details={
+                "time": slot.strftime("%H:%M"),
+                "length": blog_config.post_length,
+                "image_count": blog_config.image_count,
+                "posts": posts,
+            },
+        )
+        db.add(log)
+        db.commit()
+        LOGGER.info(f"[Scheduler] User {user.id}: Credit deducted (-{cost}, {posts} post(s)). Queued for AI generation.")
+        return DueRun(schedule_id=schedule.id, user_id=user.id, cost=cost, posts=posts)
     except Exception as e:
         db.rollback()
-        LOGGER.error(f"[Fail] AI Generation failed: {str(e)}")
+        LOGGER.exception(f"[Scheduler] Error processing user {user.id}: {e}")
+        return ScheduledRunOutcome(schedule.id, user.id, "FAILED", error=str(e))
 
 
-def process_scheduled_tasks(db: Session):
-    now = datetime.now()
-    current_time_str = now.strftime("%H:%M")
-    current_day_str = now.strftime("%a").upper()
-    print(f"[Scheduler] Checking tasks for {current_day_str} {current_time_str}...")
+def split_charge_results(results) -> tuple[list[DueRun], list[ScheduledRunOutcome]]:
+    due = [r for r in results if isinstance(r, DueRun)]
+    skipped = [r for r in results if isinstance(r, ScheduledRunOutcome)]
+    return due, skipped
 
+
+def collect_due_runs(db: Session, now: datetime) -> tuple[list[DueRun], list[ScheduledRunOutcome]]:
+    """
+    cron 배치용: 실행할 슬롯이 있는 스케줄을 모으고, 건별로 슬롯 점유 + 크레딧 차감을 커밋합니다.
+    실행 파이프라인은 포함하지 않으므로 빠르게 끝나며, 건너뛴 스케줄은 outcome으로 반환합니다.
+    (상주 스케줄러는 app/services/schedule_runner.py 참고)
+    """
     schedules = db.query(models.ScheduleConfig).filter(models.ScheduleConfig.is_active == True).all()
+    policy = db.query(models.SystemPolicy).first()
 
+    results = []
     for schedule in schedules:
-        if schedule.frequency == models.Frequency.WEEKLY:
-            if not schedule.active_days or current_day_str not in schedule.active_days:
-                continue
+        slot = due_slot(schedule, now)
+        if slot is not None:
+            results.append(charge_schedule_slot(db, schedule, policy, slot))
+    return split_charge_results(results)
 
-        if not schedule.target_times or current_time_str not in schedule.target_times:
-            continue
 
-        if schedule.last_run_at:
-            last_run_str = schedule.last_run_at.strftime("%H:%M")
-            last_run_day = schedule.last_run_at.strftime("%Y-%m-%d")
-            if last_run_day == now.strftime("%Y-%m-%d") and last_run_str == current_time_str:
-                continue
+def _fair_order(runs: list[DueRun]) -> list[DueRun]:
+    """테넌트별 라운드 로빈 순서 (한 사용자의 여러 건이 다른 사용자의 첫 건보다 앞서지 않도록)."""
+    by_tenant: dict[int, list[DueRun]] = defaultdict(list)
+    for run in runs:
+        by_tenant[run.user_id].append(run)
+    ordered: list[DueRun] = []
+    while by_tenant:
+        for user_id in list(by_tenant):
+            ordered.append(by_tenant[user_id].pop(0))
+            if not by_tenant[user_id]:
+                del by_tenant[user_id]
+    return ordered
 
-        user = schedule.user
-        blog_config = user.blog_config
-        if not blog_config:
-            print(f" -> User {user.id} has no blog config. Skipping.")
-            continue
 
-        policy = db.query(models.SystemPolicy).first()
-        if not policy:
-            print(" -> System policy missing. Skipping.")
-            continue
+async def _execute_run(run: DueRun, enqueued_at: float) -> list[ScheduledRunOutcome]:
+    """실행 1건 (슬롯당 run.posts건 fan-out). 포스트별 outcome을 반환합니다."""
+    started_at = datetime.now()
+    started = time.monotonic()
+    unit_cost = run.cost // max(run.posts, 1)
+    outcomes = [
+        ScheduledRunOutcome(run.schedule_id, run.user_id, "FAILED", cost=unit_cost, started_at=started_at,
+                            queued_seconds=round(started - enqueued_at, 3))
+        for _ in range(run.posts)
+    ]
+    try:
+        post_ids = await generate_and_save_posts(run.user_id, run.posts)
+        db = SessionLocal()
+        try:
+            found = {
+                post.id: post.status
+                for post in db.query(models.Post.id, models.Post.status)
+                .filter(models.Post.id.in_([pid for pid in post_ids if pid is not None]))
+            }
+        finally:
+            db.close()
+        for outcome, post_id in zip(outcomes, post_ids):
+            outcome.post_id = post_id
+            if post_id is not None:
+                outcome.status = found.get(post_id, "FAILED")
+    except Exception as e:
+        for outcome in outcomes:
+            outcome.error = str(e)
+        LOGGER.exception(f"[Scheduler] Run failed (user={run.user_id}): {e}")
+    duration = round(time.monotonic() - started, 3)
+    for outcome in outcomes:
+        outcome.duration_seconds = duration
+    return outcomes
 
-        cost = 0
-        if blog_config.post_length == models.PostLength.SHORT:
-            cost += policy.cost_short
-        elif blog_config.post_length == models.PostLength.MEDIUM:
-            cost += policy.cost_medium
-        elif blog_config.post_length == models.PostLength.LONG:
-            cost += policy.cost_long
-        cost += policy.cost_image * blog_config.image_count
-
-        if user.current_credit < cost:
-            print(f" -> User {user.id} failed: Not enough credit ({user.current_credit} < {cost})")
-            continue
 
+async def run_due_schedules(runs: list[DueRun]) -> list[ScheduledRunOutcome]:
+    """
+    실행 예정 건을 전역 동시성 한도(SCHEDULER_MAX_CONCURRENCY)와
+    테넌트별 한도(SCHEDULER_MAX_PER_TENANT) 안에서 동시에 실행합니다.
+    """
+    enqueued_at = time.monotonic()
+
+    async def guarded(run: DueRun) -> list[ScheduledRunOutcome]:
+        tenant_limit = _tenant_limits.setdefault(run.user_id, ConcurrencyLimiter(SCHEDULER_MAX_PER_TENANT))
+        # 테넌트 슬롯을 먼저 잡아, 같은 사용자의 대기 건이 전역 슬롯을 점유한 채 기다리지 않도록 함
         try:
-            user.current_credit -= cost
-            log = models.CreditLog(
-                user_id=user.id,
-                amount=-cost,
-                action_type="AUTO_POSTING",
-                details={
-                    "time": current_time_str,
-                    "length": blog_config.post_length,
-                    "image_count": blog_config.image_count,
-                },
-            )
-            db.add(log)
-            schedule.last_run_at = now
-            db.commit()
-            print(f" -> User {user.id}: Credit deducted (-{cost}). Starting AI generation...")
-            try:
-                asyncio.run(generate_and_save_post(db, user, blog_config))
-            except Exception as e:
-                print(f"   [System Error] Async execution failed: {e}")
-        except Exception as e:
-            db.rollback()
-            print(f" -> Error processing user {user.id}: {str(e)}")
+            async with tenant_limit:
+                async with _global_limit:
+                    return await _execute_run(run, enqueued_at)
+        finally:
+            # 같은 테넌트의 대기/실행 건이 남아 있지 않으면 정리 (단일 이벤트 루프라 확인-삭제 사이 경합 없음)
+            if tenant_limit.idle and _tenant_limits.get(run.user_id) is tenant_limit:
+                del _tenant_limits[run.user_id]
+
+    # Semaphore 대기는 FIFO이므로 태스크 생성 순서(라운드 로빈)가 곧 실행 순서
+    ordered = _fair_order(runs)
+    results = await asyncio.gather(*(guarded(run) for run in ordered), return_exceptions=True)
+    outcomes: list[ScheduledRunOutcome] = []
+    for run, result in zip(ordered, results):
+        if isinstance(result, BaseException):
+            outcomes.append(ScheduledRunOutcome(run.schedule_id, run.user_id, "FAILED", cost=run.cost, error=str(result)))
+        else:
+            outcomes.extend(result)
+    return outcomes
+
+
+async def run_scheduled_tasks(now: datetime | None = None, db: Session | None = None) -> ScheduledBatchReport:
+    """
+    AS-IS: 스케줄을 순차로 돌며 사용자마다 asyncio.run(generate_and_save_post(...)) → 한 사용자의 느린
+           Gemini/ComfyUI 실행이 같은 시각의 다른 모든 사용자를 지연시킴.
+    TO-BE: 이번 분에 실행할 스케줄을 모두 모은 뒤(크레딧 차감까지) 하나의 이벤트 루프에서 동시에 실행하고,
+           실행 건별 결과(ScheduledRunOutcome)를 모아 보고합니다.
+    """
+    now = now or datetime.now()
+    slot = f"{now.strftime('%a').upper()} {now.strftime('%H:%M')}"
+    LOGGER.info(f"[Scheduler] Checking tasks for {slot}...")
+
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        due, skipped = collect_due_runs(db, now)
+    finally:
+        if own_session:
+            db.close()
+
+    report = ScheduledBatchReport(slot=slot, outcomes=list(skipped))
+    if due:
+        # 이미지 큐 워커를 이 루프에서 한 번만 띄움 (서버 startup 훅이 없는 cron 실행 대비)
+        from app.services.image_queue_service import image_queue_worker
+        started_here = not image_queue_worker.running
+        image_queue_worker.ensure_running()
+        try:
+            report.outcomes.extend(await run_due_schedules(due))
+        finally:
+            if started_here:
+                await post_pipeline.stop()
+                await image_queue_worker.stop()
+
+    log_report(report)
+    return report
+
+
+def log_report(report: ScheduledBatchReport) -> None:
+    LOGGER.info(f"[Scheduler] {report.slot} done: {report.counts}")
+    for outcome in report.outcomes:
+        LOGGER.info(
+            f"[Scheduler] schedule={outcome.schedule_id} user={outcome.user_id} status={outcome.status} "
+            f"post={outcome.post_id} queued={outcome.queued_seconds}s took={outcome.duration_seconds}s"
+            + (f" error={outcome.error}" if outcome.error else "")
+        )
+
 
+def process_scheduled_tasks(db: Session) -> ScheduledBatchReport:
+    """동기 진입점 (scripts/run_batch.py). 한 번의 asyncio.run 안에서 모든 실행을 동시에 처리합니다."""
+    return asyncio.run(run_scheduled_tasks(db=db))
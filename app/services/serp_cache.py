@@ -0,0 +1,102 @@
+"""
+검색 결과(SERP) 링크 목록 캐시.
+
+AS-IS: 같은 키워드를 노리는 포스트가 여러 개면 (키워드, 포스트) 쌍마다 네이버 검색 페이지를 다시 받아 파싱
+       → 외부 요청량(차단 위험)과 트래킹 지연이 포스트 수에 비례.
+TO-BE: 정규화한 키워드를 키로 파싱된 링크 목록을 짧은 TTL 동안 메모리에 보관합니다.
+- 두 번째 URL의 순위 확인은 캐시 조회 + 목록 탐색만 수행
+- single-flight: 같은 키워드를 동시에 요청하면 검색은 한 번만 하고 나머지는 그 결과를 기다림
+- 차단/오류 결과는 캐시하지 않음 (다음 요청이 다시 시도)
+- 순위는 수 분 안에 거의 변하지 않으므로 TTL은 트래킹 한 주기보다 짧게 (기본 10분)
+
+환경변수:
+- TRACKING_SERP_CACHE_TTL_SECONDS (기본 600, 0이면 캐시 끔)
+- TRACKING_SERP_CACHE_MAX_ENTRIES (기본 2048)
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable
+
+from app.services.llm_cache import MemoryCache, normalize_prompt
+
+LOGGER = logging.getLogger("serp_cache")
+
+TRACKING_SERP_CACHE_TTL_SECONDS = float(os.getenv("TRACKING_SERP_CACHE_TTL_SECONDS", "600"))
+TRACKING_SERP_CACHE_MAX_ENTRIES = int(os.getenv("TRACKING_SERP_CACHE_MAX_ENTRIES", "2048"))
+
+
+def make_serp_key(engine: str, keyword: str) -> str:
+    return f"serp:{engine}:{normalize_prompt(keyword)}"
+
+
+class SerpCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.enabled = ttl_seconds > 0
+        self.memory = MemoryCache(max_entries, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # 진행 중인 같은 키워드 요청을 기다려 받은 횟수
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_inflight(self) -> dict[str, asyncio.Future]:
+        # asyncio.run()이 다시 호출된 경우 이전 루프의 Future는 기다릴 수 없음
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._inflight = {}
+            self._loop = loop
+        return self._inflight
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+        if not self.enabled:
+            return await fetch()
+
+        cached = await self.memory.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._get_inflight()
+        while (pending := inflight.get(key)) is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # 먼저 요청한 쪽이 취소됨 → 이 요청이 직접 가져옴
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # 기다리는 쪽이 없으면 "exception was never retrieved" 경고가 남지 않도록 소비
+            future.exception()
+            raise
+        else:
+            if result.get("status") == "success":
+                await self.memory.set(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            inflight.pop(key, None)
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+        }
+
+
+serp_cache = SerpCache(TRACKING_SERP_CACHE_TTL_SECONDS, TRACKING_SERP_CACHE_MAX_ENTRIES)
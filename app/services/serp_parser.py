@@ -0,0 +1,124 @@
+"""
+검색 결과(SERP) HTML에서 순위 계산용 링크만 추출합니다.
+
+AS-IS: BeautifulSoup(..., "html.parser")로 페이지 전체를 파이썬 객체 트리로 만든 뒤 select
+       → 호출당 수십 ms의 순수 파이썬 CPU를 이벤트 루프 위에서 사용해, 그동안 다른 코루틴이 모두 멈춤.
+TO-BE:
+- 백엔드 자동 선택: selectolax(lexbor, C) > lxml(libxml2, C) > bs4(html.parser, a 태그만 파싱)
+- 결과 링크(a.api_link_all, a.link_tit, a.total_tit)의 href만 문서 순서대로 추출 (세 백엔드 결과 동일)
+- 비동기 경로는 스레드(기본) 또는 프로세스 풀에서 파싱해 이벤트 루프를 막지 않음
+
+환경변수:
+- SERP_PARSER_BACKEND: auto | selectolax | lxml | bs4 (기본 auto)
+- SERP_PARSER_PROCESSES (기본 0 = 스레드, N > 0이면 N개 프로세스 풀. bs4처럼 GIL을 잡는 백엔드에서 유리)
+
+벤치마크: python scripts/bench_serp_parser.py (scripts/fixtures/serp/*.html)
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+LOGGER = logging.getLogger("serp_parser")
+
+SERP_PARSER_BACKEND = os.getenv("SERP_PARSER_BACKEND", "auto").lower()
+SERP_PARSER_PROCESSES = int(os.getenv("SERP_PARSER_PROCESSES", "0"))
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser  # type: ignore
+except Exception:  # pragma: no cover - 선택 의존성
+    try:
+        from selectolax.parser import HTMLParser as _SelectolaxParser  # type: ignore
+    except Exception:
+        _SelectolaxParser = None
+
+try:
+    from lxml import etree as _lxml_etree  # type: ignore
+except Exception:  # pragma: no cover - 선택 의존성
+    _lxml_etree = None
+
+# 네이버 통합검색 결과 내 링크 (VIEW, 블로그, 스마트블록 등). HTML 구조가 자주 바뀌므로 여러 패턴을 함께 확인
+NAVER_RESULT_LINK_CLASSES = ("api_link_all", "link_tit", "total_tit")
+NAVER_RESULT_LINK_SELECTOR = ", ".join(f"a.{name}" for name in NAVER_RESULT_LINK_CLASSES)
+
+_lxml_xpath = None
+if _lxml_etree is not None:
+    # class 토큰 일치 (CSS의 a.name과 동일). XPath 단일 식이라 결과는 문서 순서
+    _lxml_xpath = _lxml_etree.XPath(
+        "//a["
+        + " or ".join(
+            f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in NAVER_RESULT_LINK_CLASSES
+        )
+        + "]"
+    )
+
+
+def _extract_selectolax(html: str) -> list[str]:
+    tree = _SelectolaxParser(html)
+    return [node.attributes.get("href") or "" for node in tree.css(NAVER_RESULT_LINK_SELECTOR)]
+
+
+def _extract_lxml(html: str) -> list[str]:
+    try:
+        root = _lxml_etree.fromstring(html, _lxml_etree.HTMLParser())
+    except ValueError:
+        # XML 인코딩 선언이 있는 str은 lxml이 거부하므로 bytes로 다시 파싱
+        root = _lxml_etree.fromstring(html.encode("utf-8"), _lxml_etree.HTMLParser(encoding="utf-8"))
+    if root is None:
+        return []
+    return [anchor.get("href") or "" for anchor in _lxml_xpath(root)]
+
+
+def _extract_bs4(html: str) -> list[str]:
+    # a 태그만 트리에 올려 파싱 비용을 줄임
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("a"))
+    return [link.get("href", "") for link in soup.select(NAVER_RESULT_LINK_SELECTOR)]
+
+
+_BACKENDS = {
+    "selectolax": (_extract_selectolax, _SelectolaxParser is not None),
+    "lxml": (_extract_lxml, _lxml_etree is not None),
+    "bs4": (_extract_bs4, True),
+}
+
+
+def available_backends() -> list[str]:
+    """사용 가능한 백엔드 (빠른 순)."""
+    return [name for name, (_, available) in _BACKENDS.items() if available]
+
+
+def resolve_backend(name: str = SERP_PARSER_BACKEND) -> str:
+    if name in _BACKENDS and _BACKENDS[name][1]:
+        return name
+    if name not in ("auto", ""):
+        LOGGER.warning("SERP parser backend %s unavailable; falling back to auto", name)
+    return available_backends()[0]
+
+
+_default_backend = resolve_backend()
+
+
+def extract_result_links(html: str, backend: str | None = None) -> list[str]:
+    """결과 링크 href 목록 (노출 순서). 동기 함수이므로 이벤트 루프에서는 extract_result_links_async 사용."""
+    extract, _ = _BACKENDS[resolve_backend(backend) if backend else _default_backend]
+    return extract(html)
+
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=SERP_PARSER_PROCESSES)
+    return _process_pool
+
+
+async def extract_result_links_async(html: str) -> list[str]:
+    if SERP_PARSER_PROCESSES > 0:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_process_pool(), extract_result_links, html, _default_backend)
+    return await asyncio.to_thread(extract_result_links, html)
@@ -0,0 +1,349 @@
+"""
+순위 트래킹 엔진 (발행 포스트 일괄 갱신).
+
+AS-IS: (제거된) TrackingService.update_post_tracking이 포스트 하나의 키워드를 순서대로 조회하며 매번 asyncio.sleep(1),
+       /posts/{id}/track 요청 안에서 그대로 실행되고, 발행된 포스트 전체를 주기적으로 갱신하는 경로가 없음
+       (1,000개 포스트 × 키워드 수 × (응답 시간 + 1초) → 한 시간 가까이 소요).
+TO-BE: 발행 포스트를 모아 키워드 단위로 묶은 뒤 병렬로 조회하고 결과를 묶어서 기록합니다.
+- 같은 키워드를 노리는 포스트는 검색 1회 결과를 공유 (fetch_naver_links → rank_in_links)
+- 동시 검색 수 TRACKING_CONCURRENCY + 검색 호스트별 토큰 버킷(tracking_service.host_bucket)으로 속도 제한
+- 포스트의 모든 키워드가 끝나면 완료 목록에 넣고, TRACKING_WRITE_BATCH개씩 한 트랜잭션으로
+  keyword_ranks 일괄 INSERT + posts 일괄 UPDATE
+- 상주 루프: TRACKING_POLL_SECONDS마다 last_tracked_at이 TRACKING_INTERVAL_SECONDS보다 오래된 포스트를 갱신
+- /posts/{id}/track, 수동 발행 직후 트래킹은 submit()으로 백그라운드 실행 (요청은 즉시 응답)
+- 포스트 점유는 tracking_status/tracking_claimed_at CAS(claim_posts)라서 API 인스턴스 여러 개나
+  scripts/run_tracking.py가 동시에 돌아도 같은 포스트를 중복 조회하지 않음.
+  점유 후 기록하지 못한 포스트(쓰기 실패/취소/키워드 없음)는 FAILED로 되돌려 TRACKING에 남지 않음.
+  프로세스가 죽어 남은 점유는 TRACKING_CLAIM_TIMEOUT_SECONDS가 지나면 다시 점유 가능
+
+환경변수:
+- TRACKING_ENABLED (기본 true): API 서버 startup에서 주기 갱신 루프 실행 여부
+- TRACKING_INTERVAL_SECONDS (기본 21600), TRACKING_POLL_SECONDS (기본 600)
+- TRACKING_CONCURRENCY (기본 4), TRACKING_WRITE_BATCH (기본 100)
+- TRACKING_CLAIM_TIMEOUT_SECONDS (기본 1800)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.sql_models import Post
+from app.services.keyword_rank_service import record_keyword_ranks
+from app.services.rate_limiter import ConcurrencyLimiter
+from app.services.tracking_service import tracking_keywords, tracking_service
+
+LOGGER = logging.getLogger("tracking_engine")
+
+TRACKING_ENABLED = os.getenv("TRACKING_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACKING_INTERVAL_SECONDS = float(os.getenv("TRACKING_INTERVAL_SECONDS", "21600"))
+TRACKING_POLL_SECONDS = float(os.getenv("TRACKING_POLL_SECONDS", "600"))
+TRACKING_CONCURRENCY = int(os.getenv("TRACKING_CONCURRENCY", "4"))
+TRACKING_WRITE_BATCH = int(os.getenv("TRACKING_WRITE_BATCH", "100"))
+TRACKING_CLAIM_TIMEOUT_SECONDS = float(os.getenv("TRACKING_CLAIM_TIMEOUT_SECONDS", "1800"))
+
+# IN (...) 목록 길이 상한 (DB 바인드 변수 제한 대비)
+_ID_CHUNK = 500
+
+
+@dataclass(eq=False)
+class TrackingTarget:
+    post_id: int
+    url: str
+    keywords: tuple[str, ...]
+    previous: dict
+    results: dict = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= len(self.keywords)
+
+
+@dataclass
+class TrackingReport:
+    posts: int = 0
+    searches: int = 0  # 중복 제거된 키워드 검색 수
+    failed_searches: int = 0
+    written: int = 0
+    duration_seconds: float = 0.0
+
+
+def _chunks(items: list, size: int = _ID_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _load_targets(post_ids: list[int] | None, stale_before: datetime | None) -> list[TrackingTarget]:
+    db = SessionLocal()
+    try:
+        query = db.query(Post.id, Post.published_url, Post.keyword_ranks, Post.title).filter(
+            Post.published_url.isnot(None), Post.published_url != ""
+        )
+        if stale_before is not None:
+            query = query.filter(or_(Post.last_tracked_at.is_(None), Post.last_tracked_at < stale_before))
+        rows = []
+        if post_ids is None:
+            rows = query.all()
+        else:
+            for chunk in _chunks(post_ids):
+                rows.extend(query.filter(Post.id.in_(chunk)).all())
+        return [
+            TrackingTarget(
+                post_id=row.id,
+                url=row.published_url,
+                keywords=tuple(dict.fromkeys(tracking_keywords(row))),
+                previous=row.keyword_ranks if isinstance(row.keyword_ranks, dict) else {},
+            )
+            for row in rows
+        ]
+    finally:
+        db.close()
+
+
+def claim_posts(db: Session, post_ids: list[int], claimed_at: datetime) -> list[int]:
+    """
+    CAS 점유: TRACKING이 아니거나 점유가 만료된 포스트만 TRACKING으로 바꾸고, 이번에 점유한 id를 돌려줍니다.
+    claimed_at은 점유 토큰으로도 쓰임 (release_claims). 커밋은 호출자가 합니다.
+    """
+    stale_before = claimed_at - timedelta(seconds=TRACKING_CLAIM_TIMEOUT_SECONDS)
+    claimable = or_(
+        Post.tracking_status.is_(None),
+        Post.tracking_status != "TRACKING",
+        Post.tracking_claimed_at.is_(None),
+        Post.tracking_claimed_at < stale_before,
+    )
+    claimed = []
+    for chunk in _chunks(post_ids):
+        db.query(Post).filter(Post.id.in_(chunk), claimable).update(
+            {Post.tracking_status: "TRACKING", Post.tracking_claimed_at: claimed_at}, synchronize_session=False
+        )
+        # 같은 트랜잭션 안이라 다른 프로세스의 점유와 섞이지 않음 (UPDATE가 행/DB 쓰기 잠금을 잡고 있음)
+        rows = db.query(Post.id).filter(
+            Post.id.in_(chunk), Post.tracking_status == "TRACKING", Post.tracking_claimed_at == claimed_at
+        )
+        claimed.extend(row.id for row in rows)
+    return claimed
+
+
+def _claim(post_ids: list[int], claimed_at: datetime) -> list[int]:
+    db = SessionLocal()
+    try:
+        claimed = claim_posts(db, post_ids, claimed_at)
+        db.commit()
+        return claimed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def release_claims(post_ids: list[int], claimed_at: datetime) -> None:
+    """이번 실행이 점유했지만 결과를 기록하지 못한 포스트를 FAILED로 되돌립니다 (다음 주기에 다시 시도)."""
+    db = SessionLocal()
+    try:
+        for chunk in _chunks(post_ids):
+            db.query(Post).filter(
+                Post.id.in_(chunk), Post.tracking_status == "TRACKING", Post.tracking_claimed_at == claimed_at
+            ).update({Post.tracking_status: "FAILED"}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _write_results(targets: list[TrackingTarget]) -> int:
+    """완료된 포스트들의 순위를 한 트랜잭션으로 기록합니다."""
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        recorded = record_keyword_ranks(
+            db,
+            [(t.post_id, kw, result.get("rank", -1)) for t in targets for kw, result in t.results.items()],
+            observed_at=now,
+        )
+        updates = []
+        for target in targets:
+            snapshot = {}
+            succeeded = False
+            for kw, result in target.results.items():
+                observed = recorded.get((target.post_id, kw))
+                if observed is not None:
+                    snapshot[kw] = {**result, **observed}
+                    succeeded = True
+                else:
+                    # 차단/오류로 순위를 못 얻은 키워드는 직전 스냅샷 유지
+                    snapshot[kw] = target.previous.get(kw, result)
+            row = {"id": target.post_id, "keyword_ranks": snapshot}
+            if succeeded:
+                row.update(tracking_status="COMPLETED", last_tracked_at=now)
+            else:
+                # last_tracked_at을 갱신하지 않으므로 다음 주기에 다시 시도됨
+                row.update(tracking_status="FAILED")
+            updates.append(row)
+        db.execute(update(Post), updates)
+        db.commit()
+        return len(updates)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class TrackingEngine:
+    def __init__(
+        self,
+        interval_seconds: float = TRACKING_INTERVAL_SECONDS,
+        poll_seconds: float = TRACKING_POLL_SECONDS,
+        concurrency: int = TRACKING_CONCURRENCY,
+        write_batch: int = TRACKING_WRITE_BATCH,
+    ):
+        self.interval_seconds = interval_seconds
+        self.poll_seconds = poll_seconds
+        self.write_batch = max(write_batch, 1)
+        self._limit = ConcurrencyLimiter(concurrency)
+        self._task: asyncio.Task | None = None
+        self._submitted: set[asyncio.Task] = set()
+        # 진행 중인 포스트 (주기 갱신과 수동 요청이 겹쳐도 같은 포스트를 두 번 조회하지 않음)
+        self._in_flight: set[int] = set()
+        self.last_report: TrackingReport | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._task, *self._submitted) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._submitted = set()
+        self._in_flight = set()
+
+    def submit(self, post_ids: list[int], claimed_at: datetime | None = None) -> None:
+        """
+        백그라운드 갱신 요청 (API 요청 안에서 호출, 결과를 기다리지 않음).
+        claimed_at: 호출자가 claim_posts로 이미 점유한 경우 그 토큰.
+        """
+        task = asyncio.get_running_loop().create_task(self._refresh_logged(list(post_ids), claimed_at))
+        self._submitted.add(task)
+        task.add_done_callback(self._submitted.discard)
+
+    async def _refresh_logged(self, post_ids: list[int] | None, claimed_at: datetime | None = None) -> None:
+        try:
+            report = await self.refresh(post_ids, claimed_at=claimed_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            LOGGER.exception("Rank tracking refresh failed (posts=%s)", post_ids)
+            return
+        if report.posts:
+            LOGGER.info(
+                "Rank tracking: %d post(s), %d search(es), %d failed, %d written in %.1fs",
+                report.posts,
+                report.searches,
+                report.failed_searches,
+                report.written,
+                report.duration_seconds,
+            )
+
+    async def refresh(
+        self, post_ids: list[int] | None = None, all_posts: bool = False, claimed_at: datetime | None = None
+    ) -> TrackingReport:
+        """
+        순위를 갱신합니다.
+        - post_ids 지정: 해당 포스트만 (만료 여부 무관)
+        - 미지정: last_tracked_at이 interval보다 오래된 발행 포스트 (all_posts=True면 전체)
+        - claimed_at 지정: post_ids를 호출자가 이미 점유함 (처리하지 못한 포스트는 FAILED로 되돌림)
+        """
+        started = time.monotonic()
+        stale_before = None
+        if post_ids is None and not all_posts:
+            stale_before = datetime.now() - timedelta(seconds=self.interval_seconds)
+        targets = await asyncio.to_thread(_load_targets, post_ids, stale_before)
+        targets = [t for t in targets if t.keywords and t.post_id not in self._in_flight]
+        if claimed_at is None:
+            claimed_at = datetime.now()
+            claimed = set(await asyncio.to_thread(_claim, [t.post_id for t in targets], claimed_at))
+            targets = [t for t in targets if t.post_id in claimed]
+        else:
+            # 점유했지만 처리 대상에서 빠진 포스트 (URL/키워드 없음, 이 프로세스에서 이미 진행 중)
+            kept = {t.post_id for t in targets}
+            dropped = [post_id for post_id in post_ids or [] if post_id not in kept]
+            if dropped:
+                await asyncio.to_thread(release_claims, dropped, claimed_at)
+        report = TrackingReport(posts=len(targets))
+        if not targets:
+            return report
+
+        ids = [t.post_id for t in targets]
+        unwritten = set(ids)
+        self._in_flight.update(ids)
+        try:
+            by_keyword: dict[str, list[TrackingTarget]] = defaultdict(list)
+            for target in targets:
+                for keyword in target.keywords:
+                    by_keyword[keyword].append(target)
+            report.searches = len(by_keyword)
+
+            ready: list[TrackingTarget] = []
+
+            async def flush(batch: list[TrackingTarget]) -> None:
+                try:
+                    written = await asyncio.to_thread(_write_results, batch)
+                except Exception:
+                    # 기록하지 못한 포스트는 finally에서 FAILED로 되돌림
+                    LOGGER.exception("Failed to write rank results for %d post(s)", len(batch))
+                    return
+                report.written += written
+                unwritten.difference_update(t.post_id for t in batch)
+
+            async def check(keyword: str, group: list[TrackingTarget]) -> None:
+                async with self._limit:
+                    fetched = await tracking_service.fetch_naver_links(keyword)
+                if fetched.get("status") != "success":
+                    report.failed_searches += 1
+                for target in group:
+                    target.results[keyword] = tracking_service.rank_in_links(fetched, target.url)
+                    if target.done:
+                        ready.append(target)
+                if len(ready) >= self.write_batch:
+                    batch = ready[:]
+                    ready.clear()
+                    await flush(batch)
+
+            await asyncio.gather(*(check(keyword, group) for keyword, group in by_keyword.items()))
+            if ready:
+                await flush(ready)
+        finally:
+            self._in_flight.difference_update(ids)
+            if unwritten:
+                # 쓰기 실패/취소/예외로 TRACKING에 남은 포스트 해제 (스레드에서 실행되므로 취소되어도 끝까지 반영)
+                try:
+                    await asyncio.to_thread(release_claims, list(unwritten), claimed_at)
+                except Exception:
+                    LOGGER.exception("Failed to release tracking claims for %d post(s)", len(unwritten))
+
+        report.duration_seconds = time.monotonic() - started
+        self.last_report = report
+        return report
+
+    async def _run(self) -> None:
+        while True:
+            await self._refresh_logged(None)
+            await asyncio.sleep(self.poll_seconds)
+
+
+tracking_engine = TrackingEngine()
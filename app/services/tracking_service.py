@@ -1,86 +1,98 @@
-import httpx
-from bs4 import BeautifulSoup
 import logging
-from sqlalchemy.orm import Session
+import os
+from urllib.parse import quote_plus, urlsplit
+from app.core.http_client import get_client
 from app.models.sql_models import Post
+from app.services.rate_limiter import AsyncTokenBucket
+from app.services.serp_cache import make_serp_key, serp_cache
+from app.services.serp_parser import extract_result_links_async
 from typing import Dict, List, Optional, Any
-import asyncio
 
 logger = logging.getLogger(__name__)
 
+NAVER_SEARCH_URL = "https://search.naver.com/search.naver"
+NAVER_SEARCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+# AS-IS: 키워드마다 asyncio.sleep(1) 고정 대기 → 호출 경로(수동 트래킹/배치)가 여러 개면 합산 속도가 제어되지 않음.
+# TO-BE: 검색 호스트별 토큰 버킷을 프로세스 전체에서 공유해 어느 경로에서 호출하든 호스트당 요청 속도를 지킴.
+TRACKING_HOST_RATE_PER_SECOND = float(os.getenv("TRACKING_HOST_RATE_PER_SECOND", "2"))
+TRACKING_HOST_BURST = float(os.getenv("TRACKING_HOST_BURST", "4"))
+
+_host_buckets: dict[str, AsyncTokenBucket] = {}
+
+
+def host_bucket(url: str) -> AsyncTokenBucket:
+    host = urlsplit(url).hostname or ""
+    bucket = _host_buckets.get(host)
+    if bucket is None:
+        bucket = AsyncTokenBucket(TRACKING_HOST_RATE_PER_SECOND, TRACKING_HOST_BURST)
+        _host_buckets[host] = bucket
+    return bucket
+
+
+def tracking_keywords(post: Post) -> List[str]:
+    """포스트의 트래킹 키워드 (keyword_ranks JSON에 저장된 키워드들 혹은 제목의 앞단)."""
+    if post.keyword_ranks and isinstance(post.keyword_ranks, dict):
+        keywords = [kw for kw in post.keyword_ranks.keys() if kw]
+        if keywords:
+            return keywords
+    # 제목에서 앞 20자 정도를 검색어로 사용 (임시)
+    title = (post.title or "")[:20].strip()
+    return [title] if title else []
+
+
 class TrackingService:
     """
     발행된 포스팅의 검색 순위 및 상태를 추적하는 서비스 (PeakContent)
     """
 
-    async def get_naver_search_rank(self, keyword: str, target_url: str) -> Dict[str, Any]:
+    async def fetch_naver_links(self, keyword: str) -> Dict[str, Any]:
         """
-        네이버 통합검색에서 특정 키워드로 검색했을 때 target_url의 순위를 확인합니다.
+        네이버 통합검색 결과의 링크 목록(노출 순서)을 가져옵니다.
+        같은 키워드를 노리는 여러 포스트가 한 번의 검색 결과를 공유할 수 있도록 순위 계산과 분리.
+        성공한 결과는 serp_cache에 TTL 동안 보관되어 다른 포스트/사용자의 같은 키워드 조회는 재요청하지 않음.
+        반환값: {"status": "success", "links": [...]} 또는 {"status": "blocked"/"error", ...}
         """
-        if not keyword or not target_url:
-            return {"rank": -1, "status": "invalid_input"}
-
-        search_url = f"https://search.naver.com/search.naver?query={keyword}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+        return await serp_cache.get_or_fetch(
+            make_serp_key("naver", keyword), lambda: self._fetch_naver_links(keyword)
+        )
 
+    async def _fetch_naver_links(self, keyword: str) -> Dict[str, Any]:
+        search_url = f"{NAVER_SEARCH_URL}?query={quote_plus(keyword)}"
         try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-                response = await client.get(search_url, headers=headers)
-                if response.status_code != 200:
-                    return {"rank": -1, "status": "blocked", "http_code": response.status_code}
-
-                soup = BeautifulSoup(response.text, "html.parser")
-                
-                # 네이버 통합검색 결과 내 링크들을 수집 (VIEW, 블로그, 스마트블록 등)
-                # 네이버의 HTML 구조는 자주 변경되므로 여러 패턴을 확인합니다.
-                found_rank = -1
-                
-                # 1. api_link_all (주로 스마트블록/VIEW)
-                links = soup.select("a.api_link_all, a.link_tit, a.total_tit")
-                
-                for idx, link in enumerate(links):
-                    href = link.get("href", "")
-                    if target_url in href:
-                        found_rank = idx + 1
-                        break
-                
-                if found_rank > 0:
-                    return {"rank": found_rank, "status": "success"}
-                else:
-                    return {"rank": 100, "status": "not_found_top_100"}
+            await host_bucket(search_url).acquire()
+            client = get_client("naver_search")
+            response = await client.get(search_url, headers=NAVER_SEARCH_HEADERS)
+            if response.status_code != 200:
+                return {"status": "blocked", "http_code": response.status_code}
+
+            # 결과 링크만 추출 (C 파서 우선, 이벤트 루프 밖에서 실행)
+            links = await extract_result_links_async(response.text)
+            return {"status": "success", "links": links}
 
         except Exception as e:
             logger.error(f"Naver rank tracking error: {str(e)}")
-            return {"rank": -1, "status": "error", "message": str(e)}
+            return {"status": "error", "message": str(e)}
 
-    async def update_post_tracking(self, db: Session, post_id: int):
+    @staticmethod
+    def rank_in_links(fetched: Dict[str, Any], target_url: str) -> Dict[str, Any]:
+        """fetch_naver_links 결과에서 target_url의 순위를 계산합니다."""
+        if fetched.get("status") != "success":
+            return {"rank": -1, **fetched}
+        for idx, href in enumerate(fetched["links"]):
+            if target_url in href:
+                return {"rank": idx + 1, "status": "success"}
+        return {"rank": 100, "status": "not_found_top_100"}
+
+    async def get_naver_search_rank(self, keyword: str, target_url: str) -> Dict[str, Any]:
         """
-        특정 포스트의 순위 정보를 갱신합니다.
+        네이버 통합검색에서 특정 키워드로 검색했을 때 target_url의 순위를 확인합니다.
         """
-        post = db.query(Post).filter(Post.id == post_id).first()
-        if not post or not post.published_url:
-            return
-
-        # 키워드 추출 (keyword_ranks JSON 필드에 저장된 키워드들 혹은 제목의 앞단)
-        keywords_to_track = []
-        if post.keyword_ranks and isinstance(post.keyword_ranks, dict):
-            keywords_to_track = list(post.keyword_ranks.keys())
-        
-        if not keywords_to_track:
-            # 제목에서 앞 20자 정도를 검색어로 사용 (임시)
-            keywords_to_track = [post.title[:20].strip()]
-
-        updated_ranks = {}
-        for kw in keywords_to_track:
-            result = await self.get_naver_search_rank(kw, post.published_url)
-            updated_ranks[kw] = result
-            # 루프 사이 딜레이 (IP 차단 방지)
-            await asyncio.sleep(1)
-
-        post.keyword_ranks = updated_ranks
-        db.commit()
+        if not keyword or not target_url:
+            return {"rank": -1, "status": "invalid_input"}
+        return self.rank_in_links(await self.fetch_naver_links(keyword), target_url)
 
-tracking_service = TrackingService()
 
+tracking_service = TrackingService()
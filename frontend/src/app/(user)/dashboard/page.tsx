@@ -22,7 +22,9 @@ import {
   PreviewResponse,
   publishPostManual,
   trackPost,
+  fetchPostDetail,
   registerBulkKeywords,
+  subscribePostImageEvents,
 } from "../../../lib/api";
 // NOTE: 기존에는 유저 공통 설정(`/config/blog-settings`)에 저장했지만,
 // 현재 UX 요구사항은 "블로그별"로 category/prompt/persona/wordRange/imageCount가 저장되어야 합니다.
@@ -611,7 +613,7 @@ export default function Dashboard() {
   useEffect(() => {
     const fetchPosts = async () => {
       try {
-        const res = await fetch(`${API_BASE_URL}/api/v1/posts/status`, {
+        const res = await fetch(`${API_BASE_URL}/api/v1/posts/status?include_content=false`, {
           headers: buildHeaders(),
         });
         if (res.ok) {
@@ -709,9 +711,29 @@ export default function Dashboard() {
         // 모달을 미리 열지 않고, 이미지 완료 시점까지 기다림
         // setModalOpen(true); <- 주석 처리 확인
 
-        // 이미지 파일이 실제 생성되었는지 폴링
+        const urls = preview.images || [];
+        const finishImages = () => {
+          setImageStatus("completed");
+          setDimLoadingLogs((prev) => [...prev, "모든 이미지가 성공적으로 생성되었습니다!"]);
+          setDimLoadingStatus("success");
+          // 모든 과정이 완료된 후에 모달 오픈 및 로딩 팝업 성공 처리
+          setTimeout(() => setModalOpen(true), 500);
+          
+          // 크레딧 정보 갱신 추가 (생성 후 즉시 반영)
+          fetchCreditStatus().then(setCreditInfo);
+        };
+        const showProgress = (done: number) => {
+          setCompletedImages(done);
+          if (done > 0) {
+            setDimLoadingLogs((prev) => {
+              const baseLogs = prev.filter(log => !log.startsWith("이미지 생성 중"));
+              return [...baseLogs, `이미지 생성 중 (${done}/${urls.length})...` ];
+            });
+          }
+        };
+
+        // 이미지 파일이 실제 생성되었는지 폴링 (SSE를 쓸 수 없을 때의 fallback)
         const poll = async () => {
-          const urls = preview.images || [];
           const checks = await Promise.all(
             urls.map(async (u) => {
               try {
@@ -725,34 +747,57 @@ export default function Dashboard() {
           );
           
           const done = checks.filter(Boolean).length;
-          setCompletedImages(done);
           setImageCards(urls.map((u, idx) => ({ 
             id: idx + 1, 
             src: checks[idx] ? `${u}?t=${Date.now()}` : null 
           })));
-          
-          if (done > 0) {
-            setDimLoadingLogs((prev) => {
-              const baseLogs = prev.filter(log => !log.startsWith("이미지 생성 중"));
-              return [...baseLogs, `이미지 생성 중 (${done}/${urls.length})...` ];
-            });
-          }
+          showProgress(done);
 
           if (done >= urls.length) {
-            setImageStatus("completed");
-            setDimLoadingLogs((prev) => [...prev, "모든 이미지가 성공적으로 생성되었습니다!"]);
-            setDimLoadingStatus("success");
-            // 모든 과정이 완료된 후에 모달 오픈 및 로딩 팝업 성공 처리
-            setTimeout(() => setModalOpen(true), 500);
-            
-            // 크레딧 정보 갱신 추가 (생성 후 즉시 반영)
-            fetchCreditStatus().then(setCreditInfo);
-            
+            finishImages();
             return;
           }
           setTimeout(poll, 2000); // 2초 간격으로 폴링
         };
-        setTimeout(poll, 1000);
+
+        // 서버 이벤트(SSE)로 이미지별 완료/실패를 즉시 받음
+        if (preview.post_id && typeof EventSource !== "undefined") {
+          const ready = new Map<number, string>();
+          subscribePostImageEvents(preview.post_id, {
+            onImage: (event) => {
+              if (event.index == null) return;
+              if (event.status === "COMPLETED" && event.url) {
+                ready.set(event.index, event.url);
+              } else if (event.status === "FAILED") {
+                setDimLoadingLogs((prev) => [
+                  ...prev,
+                  event.timeout
+                    ? `이미지 ${event.index} 생성 시간이 초과되었습니다.`
+                    : `이미지 ${event.index} 생성에 실패했습니다.`,
+                ]);
+              }
+              setImageCards(urls.map((u, idx) => ({
+                id: idx + 1,
+                src: ready.has(idx + 1) ? `${ready.get(idx + 1)}?t=${Date.now()}` : null,
+              })));
+              showProgress(ready.size);
+            },
+            onDone: (event) => {
+              if (event.img_gen_status === "COMPLETED") {
+                finishImages();
+              } else {
+                setImageStatus("completed");
+                setDimLoadingLogs((prev) => [...prev, "이미지는 잠시 후 [포스팅 현황] 메뉴에서 다운로드하실 수 있습니다."]);
+                setDimLoadingStatus("success");
+                setTimeout(() => setModalOpen(true), 500);
+                fetchCreditStatus().then(setCreditInfo);
+              }
+            },
+            onError: () => setTimeout(poll, 1000),
+          });
+        } else {
+          setTimeout(poll, 1000);
+        }
       } else {
         // 이미지가 없거나 이미 완료된 경우
         setDimLoadingStatus("success");
@@ -1033,7 +1078,7 @@ export default function Dashboard() {
         }
 
         // 포스팅 현황 새로고침
-        const res = await fetch(`${API_BASE_URL}/api/v1/posts/status`, {
+        const res = await fetch(`${API_BASE_URL}/api/v1/posts/status?include_content=false`, {
           headers: buildHeaders(),
         });
         if (res.ok) {
@@ -1058,9 +1103,16 @@ export default function Dashboard() {
     setStatusMessages((prev) => [...prev, `포스트 #${postId} 순위 추적을 시작합니다...`]);
     try {
       const result = await trackPost(postId);
-      setStatusMessages((prev) => [...prev, `순위 추적 완료: ${JSON.stringify(result.keyword_ranks)}`]);
+      setStatusMessages((prev) => [
+        ...prev,
+        result.status === "queued"
+          ? `포스트 #${postId} 순위 추적을 요청했습니다. 잠시 후 포스팅 현황에서 확인하세요.`
+          : result.status === "already_tracking"
+            ? `포스트 #${postId}는 이미 순위 추적 중입니다. 잠시 후 포스팅 현황에서 확인하세요.`
+            : `순위 추적 완료: ${JSON.stringify(result.keyword_ranks)}`,
+      ]);
       // 데이터 갱신
-      const res = await fetch(`${API_BASE_URL}/api/v1/posts/status`, {
+      const res = await fetch(`${API_BASE_URL}/api/v1/posts/status?include_content=false`, {
         headers: buildHeaders(),
       });
       if (res.ok) {
@@ -1074,8 +1126,20 @@ export default function Dashboard() {
     }
   };
 
-  const handleDownloadHtml = (post: any) => {
-    const blob = new Blob([post.content], { type: "text/html" });
+  const handleDownloadHtml = async (post: any) => {
+    let content = post.content;
+    if (content == null) {
+      try {
+        content = (await fetchPostDetail(post.id)).content;
+      } catch (error) {
+        console.warn("본문 로딩 실패", error);
+      }
+    }
+    if (!content) {
+      alert("본문이 없습니다.");
+      return;
+    }
+    const blob = new Blob([content], { type: "text/html" });
     const url = window.URL.createObjectURL(blob);
     const a = document.createElement("a");
     a.href = url;
@@ -14,7 +14,7 @@ export default function StatusPage() {
 
   const fetchStatus = async () => {
     try {
-      const res = await axios.get(`${API_BASE_URL}/api/v1/posts/status`, {
+      const res = await axios.get(`${API_BASE_URL}/api/v1/posts/status?include_content=false`, {
         headers: buildHeaders()
       });
       setStatusData(res.data);
@@ -29,6 +29,9 @@ export type SchedulePayload = {
 };
 
 export type KeywordTrackerRow = {
+  post_id?: number;
+  post_title?: string;
+  published_url?: string | null;
   keyword: string;
   platform: string;
   rank: number;
@@ -36,6 +39,12 @@ export type KeywordTrackerRow = {
   updated_at: string;
 };
 
+export type KeywordTrackerPage = {
+  items: KeywordTrackerRow[];
+  total: number;
+  next_offset: number | null;
+};
+
 export type PreviewRequest = {
   topic: string;
   persona: string;
@@ -113,16 +122,29 @@ export async function registerBulkKeywords(keywords: string[]): Promise<any> {
   return await response.json();
 }
 
+export async function fetchKeywordTrackingPage(offset = 0, limit = 500): Promise<KeywordTrackerPage> {
+  const params = new URLSearchParams({ offset: String(offset), limit: String(limit) });
+  const response = await fetch(`${API_BASE_URL}/api/v1/posts/keywords?${params}`, {
+    method: "GET",
+    headers: buildHeaders(),
+  });
+  if (!response.ok) {
+    throw new Error("Keyword tracker API error");
+  }
+  return await response.json();
+}
+
+// 서버는 페이지 단위(next_offset)로 응답하므로 마지막 페이지까지 이어서 받아 전체 목록을 만든다.
 export async function fetchKeywordTracking(): Promise<KeywordTrackerRow[]> {
   try {
-    const response = await fetch(`${API_BASE_URL}/api/v1/posts/keywords`, {
-      method: "GET",
-      headers: buildHeaders(),
-    });
-    if (!response.ok) {
-      throw new Error("Keyword tracker API error");
+    const rows: KeywordTrackerRow[] = [];
+    let offset: number | null = 0;
+    while (offset !== null) {
+      const page = await fetchKeywordTrackingPage(offset);
+      rows.push(...page.items);
+      offset = page.next_offset;
     }
-    return await response.json();
+    return rows;
   } catch (error) {
     console.warn("fetchKeywordTracking fallback triggered", error);
     return [
@@ -170,6 +192,73 @@ export async function generatePreviewHtml(body: PreviewRequest): Promise<Preview
   return await response.json();
 }
 
+export type PostImageEvent = {
+  index: number | null;
+  status: string; // COMPLETED | FAILED | RETRYING | PENDING | PROCESSING
+  url: string | null;
+  error: string | null;
+  timeout: boolean;
+};
+
+export type PostImagesDoneEvent = {
+  post_id: number;
+  img_gen_status: string | null;
+  images: string[];
+};
+
+// SSE 연결용 단기 토큰 발급 (post_id 지정 시 해당 포스트 스트림 전용)
+export async function fetchStreamToken(postId?: number): Promise<string> {
+  const query = postId != null ? `?post_id=${postId}` : "";
+  const response = await fetch(`${API_BASE_URL}/api/v1/posts/stream-token${query}`, {
+    method: "POST",
+    headers: buildHeaders(),
+  });
+  if (!response.ok) {
+    throw new Error("Stream token API error");
+  }
+  const data = await response.json();
+  return data.token;
+}
+
+// 포스트 이미지 진행 이벤트(SSE) 구독. /posts/status 폴링 대체용. 반환값: 구독 해제 함수
+export function subscribePostImageEvents(
+  postId: number,
+  handlers: {
+    onImage: (event: PostImageEvent) => void;
+    onDone: (event: PostImagesDoneEvent) => void;
+    onError: () => void;
+  }
+): () => void {
+  let source: EventSource | null = null;
+  let closed = false;
+  // EventSource는 Authorization 헤더를 보낼 수 없어 토큰을 쿼리로 전달
+  // (로그인 토큰 대신 이 포스트 전용 단기 토큰을 발급받아 사용)
+  fetchStreamToken(postId)
+    .then((token) => {
+      if (closed) return;
+      const es = new EventSource(
+        `${API_BASE_URL}/api/v1/posts/${postId}/events?token=${encodeURIComponent(token)}`
+      );
+      source = es;
+      es.addEventListener("image", (ev) => handlers.onImage(JSON.parse((ev as MessageEvent).data)));
+      es.addEventListener("done", (ev) => {
+        es.close();
+        handlers.onDone(JSON.parse((ev as MessageEvent).data));
+      });
+      es.onerror = () => {
+        es.close();
+        handlers.onError();
+      };
+    })
+    .catch(() => {
+      if (!closed) handlers.onError();
+    });
+  return () => {
+    closed = true;
+    source?.close();
+  };
+}
+
 export type BlogAnalysisResponse = {
   category: string;
   prompt: string;
@@ -285,6 +374,17 @@ export async function trackPost(postId: number): Promise<any> {
   return await response.json();
 }
 
+// 포스트 본문(content) 단건 조회. /posts/status 목록은 include_content=false로 본문 없이 받습니다.
+export async function fetchPostDetail(postId: number): Promise<any> {
+  const response = await fetch(`${API_BASE_URL}/api/v1/posts/${postId}`, {
+    headers: buildHeaders(),
+  });
+  if (!response.ok) {
+    throw new Error("Post detail request failed");
+  }
+  return await response.json();
+}
+
 // Plan Management
 export async function fetchAllPlansAdmin(): Promise<any[]> {
   try {
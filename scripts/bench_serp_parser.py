@@ -0,0 +1,93 @@
+import sys
+import os
+import argparse
+import asyncio
+import glob
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from app.services.serp_parser import NAVER_RESULT_LINK_SELECTOR, available_backends, extract_result_links
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "serp")
+
+
+def legacy_extract(html: str) -> list[str]:
+    # 기존 get_naver_search_rank 방식 (페이지 전체 트리 생성 후 select)
+    soup = BeautifulSoup(html, "html.parser")
+    return [link.get("href", "") for link in soup.select(NAVER_RESULT_LINK_SELECTOR)]
+
+
+def bench(extract, html: str, iterations: int) -> float:
+    """1회 파싱 시간 (ms, 최솟값 기준)."""
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        extract(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+async def loop_lag(backend: str, html: str, pages: int, offload: bool) -> float:
+    """pages개 페이지를 파싱하는 동안 이벤트 루프 tick의 최대 지연 (ms)."""
+    max_lag = 0.0
+    stop = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, (time.perf_counter() - started - 0.001) * 1000)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    for _ in range(pages):
+        if offload:
+            await asyncio.to_thread(extract_result_links, html, backend)
+        else:
+            extract_result_links(html, backend)
+            await asyncio.sleep(0)
+    stop.set()
+    await task
+    return max_lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SERP 링크 추출 백엔드 벤치마크")
+    parser.add_argument("fixtures", nargs="*", help=f"HTML 파일 (기본: {FIXTURE_DIR}/*.html)")
+    parser.add_argument("-n", "--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    if not paths:
+        print(f"No fixtures found in {FIXTURE_DIR}")
+        return
+    backends = available_backends()
+    print(f"backends: {', '.join(backends)}")
+
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        print(f"\n{os.path.basename(path)} ({len(html.encode('utf-8')) / 1024:.0f} KB)")
+
+        # 기존 방식(전체 트리 + select)과 같은 링크 목록(순서 포함)을 돌려주는지 함께 확인
+        expected = legacy_extract(html)
+        baseline_ms = bench(legacy_extract, html, args.iterations)
+        print(f"  {'legacy':<10} {baseline_ms:8.2f} ms/page  x  1.0  links={len(expected):<3}")
+        for backend in reversed(backends):
+            links = extract_result_links(html, backend)
+            status = "ok" if links == expected else f"MISMATCH ({len(links)} vs {len(expected)})"
+            ms = bench(lambda page: extract_result_links(page, backend), html, args.iterations)
+            inline_lag = asyncio.run(loop_lag(backend, html, 5, offload=False))
+            offload_lag = asyncio.run(loop_lag(backend, html, 5, offload=True))
+            print(
+                f"  {backend:<10} {ms:8.2f} ms/page  x{baseline_ms / ms:5.1f}  links={len(links):<3} {status:<8}"
+                f"  loop lag inline={inline_lag:6.1f} ms  to_thread={offload_lag:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
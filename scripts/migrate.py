@@ -0,0 +1,26 @@
+import sys
+import os
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine
+from app.core.migrations import MIGRATIONS, applied_versions, create_tables, run_migrations
+import app.models.sql_models  # noqa: F401  (모델 메타데이터 등록)
+
+
+def main():
+    # 배포 파이프라인에서 서버 기동 전에 스키마를 맞출 때 사용 (--status: 적용 현황만 출력)
+    logging.basicConfig(level=logging.INFO)
+    if "--status" not in sys.argv:
+        create_tables(engine)
+        applied = run_migrations(engine)
+        print(f"Applied: {applied or 'nothing to do'}")
+    done = applied_versions(engine)
+    for migration in MIGRATIONS:
+        mark = "x" if migration.version in done else " "
+        print(f"[{mark}] {migration.version} {migration.description}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,8 @@ from app.services.scheduler_service import process_scheduled_tasks
 def main():
     db = SessionLocal()
     try:
-        process_scheduled_tasks(db)
+        report = process_scheduled_tasks(db)
+        print(f"[Scheduler] {report.slot}: {report.counts or 'no due schedules'}")
     finally:
         db.close()
 
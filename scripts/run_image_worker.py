@@ -0,0 +1,32 @@
+import sys
+import os
+import asyncio
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.http_client import http_clients
+from app.services.image_queue_service import image_queue_worker
+
+
+async def run():
+    # API 서버와 분리된 GPU 박스/별도 프로세스에서 이미지 큐만 처리할 때 사용
+    # (API 서버 쪽은 IMAGE_QUEUE_WORKER_ENABLED=false 로 워커를 끌 수 있음)
+    image_queue_worker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await image_queue_worker.stop()
+        await http_clients.aclose()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import sys
+import os
+import asyncio
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.http_client import http_clients
+from app.services.image_queue_service import image_queue_worker
+from app.services.post_pipeline import post_pipeline
+from app.services.schedule_runner import schedule_runner
+
+
+async def run():
+    # API 서버와 분리해 스케줄러만 상주시킬 때 사용 (API 서버 쪽은 SCHEDULER_ENABLED=false)
+    # 이 프로세스에는 스케줄 저장 알림이 오지 않으므로 변경은 SCHEDULER_RESYNC_SECONDS 주기로 반영됨
+    image_queue_worker.ensure_running()
+    schedule_runner.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await schedule_runner.stop()
+        await post_pipeline.stop()
+        await image_queue_worker.stop()
+        await http_clients.aclose()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import sys
+import os
+import argparse
+import asyncio
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.http_client import http_clients
+from app.services.tracking_engine import tracking_engine
+
+
+async def run(all_posts: bool, post_ids: list[int] | None):
+    # cron 등에서 한 번만 갱신할 때 사용 (API 서버 쪽 상주 루프는 TRACKING_ENABLED로 제어)
+    try:
+        return await tracking_engine.refresh(post_ids, all_posts=all_posts)
+    finally:
+        await http_clients.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="발행 포스트 검색 순위 일괄 갱신")
+    parser.add_argument("--all", action="store_true", help="last_tracked_at과 무관하게 전체 발행 포스트 갱신")
+    parser.add_argument("--post-id", type=int, action="append", help="특정 포스트만 갱신 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = asyncio.run(run(args.all, args.post_id))
+    print(
+        f"[Tracking] posts={report.posts} searches={report.searches} "
+        f"failed={report.failed_searches} written={report.written} ({report.duration_seconds:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()